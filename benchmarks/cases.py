@@ -0,0 +1,156 @@
+"""Synthetic dataframes and the benchmark cases run over them."""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+
+def make_frame(rows, cols, nan=0.0, cardinality=10, mix="numeric", seed=0):
+    """Generates a reproducible synthetic dataframe.
+
+    Parameters
+    ----------
+    rows, cols : int
+        shape of the frame
+    nan : float
+        proportion of missing values in every column
+    cardinality : int
+        number of distinct values of the categorical columns
+    mix : str
+        "numeric" (float64 only), "mixed" (float64, int64 and object text)
+        or "compact" (float32, int16, category and Arrow-backed text)
+    seed : int
+        random seed
+
+    Returns
+    -------
+    df : pandas.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    if mix == "numeric":
+        kinds = ["float"] * cols
+    else:
+        kinds = ["float", "float", "float", "float", "float", "float", "float", "float", "int", "text"]
+        kinds = [kinds[j % len(kinds)] for j in range(cols)]
+
+    # a shared factor makes the numeric columns correlated
+    factor = rng.normal(size=rows)
+    labels = np.array([f"value {i}" for i in range(cardinality)], dtype=object)
+    data = {}
+    for j, kind in enumerate(kinds):
+        if kind == "float":
+            column = factor * rng.uniform(-1, 1) + rng.normal(size=rows)
+            if nan:
+                column[rng.random(rows) < nan] = np.nan
+            data[f"x{j}"] = column.astype(np.float32) if mix == "compact" else column
+        elif kind == "int":
+            column = pd.Series(rng.integers(0, 1000, rows))
+            if nan:
+                column = column.where(rng.random(rows) >= nan)
+            data[f"n{j}"] = column.astype("Int16" if nan else np.int16) if mix == "compact" else column
+        else:
+            column = pd.Series(labels[rng.integers(0, cardinality, rows)])
+            if nan:
+                column = column.where(rng.random(rows) >= nan)
+            if mix == "compact":
+                column = column.astype("category" if cardinality <= rows // 2 else "string[pyarrow]")
+            data[f"s{j}"] = column
+    return pd.DataFrame(data)
+
+
+def _quiet(function):
+    """Runs function with its printed output discarded."""
+    def run(df):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function(df)
+    return run
+
+
+def _close_all(function):
+    """Runs a pyplot function and closes its figures."""
+    def run(df):
+        import matplotlib.pyplot as plt
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return function(df)
+        finally:
+            plt.close("all")
+    return run
+
+
+def functions():
+    """Benchmarked callables of one dataframe, by name.
+
+    Imported lazily so the runner's parent process stays light.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from pyeasyeda.birds_eye_view import birds_eye_view, render_birds_eye_view
+    from pyeasyeda.clean_up import clean_up
+    from pyeasyeda.close_up import close_up
+    from pyeasyeda.correlation import correlation_matrix
+    from pyeasyeda.distributions import distributions
+    from pyeasyeda.summary_suggestions import summary_suggestions
+
+    return {
+        "clean_up": _quiet(clean_up),
+        "summary_suggestions": summary_suggestions,
+        "correlation_matrix": correlation_matrix,
+        "distributions": distributions,
+        "close_up": lambda df: close_up(df, n=2).to_dict(),
+        "birds_eye_view": _close_all(birds_eye_view),
+        "render_birds_eye_view": render_birds_eye_view,
+    }
+
+
+# functions that draw one plot per variable are only run on narrow frames
+RENDERING = {"close_up", "birds_eye_view", "render_birds_eye_view"}
+MAX_RENDERED_COLUMNS = 50
+
+
+def scenarios(suite):
+    """Frame parameters of a suite.
+
+    "ci" is a handful of small frames that run in well under a minute.
+    "full" sweeps each dimension around a base frame: rows from 10^3 to
+    10^8, columns from 10 to 10^4, NaN density, categorical cardinality and
+    dtype mix. The largest frames need tens of GB of memory; use the
+    runner's --max-cells to skip them.
+    """
+    if suite == "ci":
+        return [
+            dict(rows=2_000, cols=10, nan=0.0, cardinality=5, mix="mixed"),
+            dict(rows=20_000, cols=20, nan=0.05, cardinality=50, mix="mixed"),
+            dict(rows=20_000, cols=20, nan=0.05, cardinality=50, mix="compact"),
+            dict(rows=5_000, cols=200, nan=0.0, cardinality=5, mix="numeric"),
+        ]
+    if suite != "full":
+        raise ValueError("suite must be 'ci' or 'full'.")
+
+    base = dict(rows=100_000, cols=20, nan=0.01, cardinality=20, mix="mixed")
+    sweeps = [
+        ("rows", [10 ** k for k in range(3, 9)]),
+        ("cols", [10, 100, 1_000, 10_000]),
+        ("nan", [0.0, 0.01, 0.2]),
+        ("cardinality", [5, 1_000, 100_000]),
+        ("mix", ["numeric", "mixed", "compact"]),
+    ]
+    seen, result = set(), []
+    for name, values in sweeps:
+        for value in values:
+            params = dict(base, **{name: value})
+            key = tuple(sorted(params.items()))
+            if key not in seen:
+                seen.add(key)
+                result.append(params)
+    return result
+
+
+def case_id(function, params):
+    """Stable name of a benchmark case."""
+    return f"{function}[rows={params['rows']},cols={params['cols']},nan={params['nan']}," \
+           f"cardinality={params['cardinality']},mix={params['mix']}]"
@@ -0,0 +1,217 @@
+"""Benchmark runner for pyeasyeda.
+
+Every case runs in a fresh Python process, so the peak RSS of one case is
+not inflated by the ones before it. For each case the runner records:
+
+- wall: best wall-clock time over the repeats, in seconds
+- rss: growth of the process's peak resident memory during the first
+  call, in MB
+- alloc: peak memory traced by tracemalloc during one extra call, in MB
+  (numpy and pandas report their buffers to tracemalloc, so this is
+  deterministic and a good signal in CI)
+
+Usage
+-----
+Run the small suite and compare it with the stored baseline, failing on
+regressions of more than 25% (the default threshold)::
+
+    python benchmarks/run.py --suite ci --compare benchmarks/baselines/ci.json --threshold 0.25
+
+Wall time and RSS depend on the machine, so a baseline recorded elsewhere
+is best compared on allocations only (``--metric alloc``), as CI does.
+Allocations still depend on the Python and library versions, which are
+stored with the results: CI installs the baseline's versions from
+benchmarks/requirements-ci.txt. Cases that fail to run are reported
+separately and are not counted as regressions.
+
+Record a new baseline::
+
+    python benchmarks/run.py --suite ci --save benchmarks/baselines/ci.json
+
+Run the full sweep, skipping frames with more than 10^9 cells::
+
+    python benchmarks/run.py --suite full --max-cells 1e9 --output results.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cases import MAX_RENDERED_COLUMNS, RENDERING, case_id, functions, make_frame, scenarios  # noqa: E402
+
+METRICS = ("wall", "rss", "alloc")
+# libraries whose versions change the measurements
+PACKAGES = ("numpy", "pandas", "pyarrow", "matplotlib", "seaborn", "altair", "scipy")
+
+
+def measure(function, params, repeat):
+    """Runs one case in this process and returns its metrics."""
+    run = functions()[function]
+    df = make_frame(**params)
+    gc.collect()
+
+    before = _peak_rss_mb()
+    start = time.perf_counter()
+    run(df)
+    times = [time.perf_counter() - start]
+    rss = max(_peak_rss_mb() - before, 0.0)
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        run(df)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall": min(times), "rss": rss, "alloc": peak / 2 ** 20}
+
+
+def run_suite(suite, names=None, max_cells=None, repeat=3):
+    """Runs every case of a suite, each in its own process."""
+    results = {}
+    for params in scenarios(suite):
+        if max_cells is not None and params["rows"] * params["cols"] > max_cells:
+            continue
+        for function in names or functions_names():
+            if function in RENDERING and params["cols"] > MAX_RENDERED_COLUMNS:
+                continue
+            name = case_id(function, params)
+            command = [sys.executable, os.path.abspath(__file__), "--worker",
+                       json.dumps({"function": function, "params": params, "repeat": repeat})]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                results[name] = {"error": completed.stderr.strip().splitlines()[-1]}
+            else:
+                results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(_format(name, results[name]), flush=True)
+    return results
+
+
+def compare(results, baseline, threshold, metrics=METRICS):
+    """Returns the cases whose metrics grew by more than `threshold`
+    (a proportion) over the baseline.
+
+    Metrics of a fraction of a millisecond or a megabyte are too noisy to
+    compare and are ignored, and so are the cases that failed to run on
+    either side (see errors).
+    """
+    floors = {"wall": 1e-3, "rss": 1.0, "alloc": 1.0}
+    regressions = []
+    for name, measured in results.items():
+        reference = baseline.get(name)
+        if reference is None or "error" in reference or "error" in measured:
+            continue
+        for metric in metrics:
+            old, new = reference[metric], measured[metric]
+            if max(old, new) < floors[metric]:
+                continue
+            if new > max(old, floors[metric]) * (1 + threshold):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def errors(results):
+    """Returns the (case, error message) of the cases that failed to run."""
+    return [(name, measured["error"]) for name, measured in results.items() if "error" in measured]
+
+
+def package_versions():
+    """Installed version of each library in PACKAGES, None if missing."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = version(name)
+        except PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def functions_names():
+    return ["clean_up", "summary_suggestions", "correlation_matrix", "distributions",
+            "close_up", "birds_eye_view", "render_birds_eye_view"]
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def _format(name, metrics):
+    if "error" in metrics:
+        return f"{name}: ERROR {metrics['error']}"
+    return f"{name}: {metrics['wall'] * 1000:.1f} ms, rss +{metrics['rss']:.1f} MB, " \
+           f"alloc {metrics['alloc']:.1f} MB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks pyeasyeda on synthetic frames.")
+    parser.add_argument("--suite", choices=["ci", "full"], default="ci")
+    parser.add_argument("--function", action="append", choices=functions_names(),
+                        help="benchmark only this function (repeatable)")
+    parser.add_argument("--max-cells", type=float, help="skip frames with more rows x cols")
+    parser.add_argument("--repeat", type=int, default=3, help="timed calls per case")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--save", help="write the results as a baseline to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed growth over the baseline, as a proportion (default 0.25)")
+    parser.add_argument("--metric", action="append", choices=METRICS,
+                        help="compare only this metric (repeatable), defaults to all")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        task = json.loads(args.worker)
+        print(json.dumps(measure(task["function"], task["params"], task["repeat"])))
+        return 0
+
+    results = run_suite(args.suite, args.function, args.max_cells, args.repeat)
+    document = {
+        "suite": args.suite,
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count(), "packages": package_versions()},
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save]):
+        with open(path, "w") as file:
+            json.dump(document, file, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as file:
+            stored = json.load(file)
+        baseline = stored["results"]
+        recorded = stored["machine"]
+        current = document["machine"]
+        for key, old, new in [("python", recorded.get("python"), current["python"])] + [
+            (name, recorded.get("packages", {}).get(name), version)
+            for name, version in current["packages"].items()
+        ]:
+            if old != new:
+                print(f"NOTE {key} {new} differs from the baseline's {old}")
+        for name, message in errors(results):
+            print(f"ERROR {name}: {message}")
+        regressions = compare(results, baseline, args.threshold, args.metric or METRICS)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old} -> {new}")
+        if regressions:
+            return 1
+        print(f"No regression beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
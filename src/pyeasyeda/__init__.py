@@ -1,3 +1,9 @@
 # read version from installed package
 from importlib.metadata import version
-__version__ = version("pyeasyeda")
\ No newline at end of file
+__version__ = version("pyeasyeda")
+
+import logging
+
+# the functions report through the "pyeasyeda" logger instead of printing;
+# logging.basicConfig(level=logging.INFO) shows the messages
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,394 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pyeasyeda.clean_up import _log_dropped, complete_rows
+from pyeasyeda.correlation import _pairwise_corr, _pairwise_sums
+from pyeasyeda.dtypes import numeric_columns
+from pyeasyeda.missingness import missingness_profile
+from pyeasyeda.moments import RunningMoments
+from pyeasyeda.outliers import OutlierReport, _column_values
+from pyeasyeda.sources import load_frame
+from pyeasyeda.summary_suggestions import SummaryAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+class SerialBackend:
+    """Runs the partitions one after the other in this process."""
+
+    def map(self, function, items):
+        return [function(item) for item in items]
+
+
+class ProcessBackend:
+    """Runs the partitions on a pool of local worker processes.
+
+    Needs no cluster. Each worker loads its own partition (a file shard is
+    read in the worker, not in the parent) and sends back only its small
+    partial result, so throughput grows with the number of cores as long
+    as there are at least as many partitions as workers.
+
+    Parameters
+    ----------
+    n_jobs : int, optional
+        number of worker processes, defaults to the number of CPUs
+    """
+
+    def __init__(self, n_jobs=None):
+        if n_jobs is not None and (type(n_jobs) != int or n_jobs < 1):
+            raise TypeError("n_jobs must be a positive integer.")
+        self.n_jobs = n_jobs
+
+    def map(self, function, items):
+        items = list(items)
+        workers = min(self.n_jobs or os.cpu_count() or 1, len(items))
+        if workers <= 1:
+            return [function(item) for item in items]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+
+
+class DaskBackend:
+    """Runs the partitions as Dask tasks, on whatever scheduler is active
+    (a distributed cluster or Dask's local threads/processes).
+
+    Requires dask.
+    """
+
+    def map(self, function, items):
+        import dask
+
+        return list(dask.compute(*[dask.delayed(function)(item) for item in items]))
+
+
+BACKENDS = {"serial": SerialBackend, "processes": ProcessBackend, "dask": DaskBackend}
+
+
+def tree_reduce(merge, partials):
+    """Combines partial results pairwise, level by level, like a binary tree.
+
+    Parameters
+    ----------
+    merge : callable
+        function of two partial results returning their combination
+    partials : iterable
+        partial results, one per partition
+
+    Returns
+    -------
+    result
+        the combination of every partial result
+    """
+    partials = list(partials)
+    if not partials:
+        raise ValueError("there are no partitions to reduce.")
+    while len(partials) > 1:
+        partials = [
+            merge(partials[i], partials[i + 1]) if i + 1 < len(partials) else partials[i]
+            for i in range(0, len(partials), 2)
+        ]
+    return partials[0]
+
+
+def clean_up_partitioned(source, backend=None, n_jobs=None, output=None, fmt="parquet"):
+    """clean_up over a partitioned dataset.
+
+    The first map computes the moments of the numeric variables over the
+    rows without NaN's in each partition, reduced with Chan's pairwise
+    update; the second flags the values more than 3 standard deviations
+    from the mean and drops the rows with NaN's. The logged report and the
+    clean rows are the ones clean_up gives for the concatenated partitions.
+
+    Without `output` the clean partitions are sent back and concatenated,
+    so the clean dataset must fit in memory. With `output` each worker
+    writes its own clean partition and sends back only its outlier flags
+    and counts.
+
+    Parameters
+    ----------
+    source : see partitions
+        partitioned dataset
+    backend : str or backend object, optional
+        "serial", "processes" or "dask" (or an object with a
+        map(function, items) method), defaults to "dask" for a Dask
+        DataFrame and "processes" otherwise
+    n_jobs : int, optional
+        number of worker processes of the "processes" backend
+    output : str or os.PathLike, optional
+        directory the workers write the clean partitions to, as
+        part-00000.parquet, part-00001.parquet, ... in the order of the
+        partitions; defaults to None (return the clean dataframe)
+    fmt : str
+        format of the written partitions, "parquet" (requires pyarrow) or
+        "csv", defaults to "parquet"
+
+    Returns
+    -------
+    df_clean : pandas.DataFrame or dict
+        rows without NaN's of every partition, in order; with `output`, a
+        dict of the written "files", the number of "rows" read and of
+        "clean_rows" written, and the "outliers" OutlierReport, whose row
+        positions count the clean rows across the files
+
+    Examples
+    --------
+    >>> df_clean = clean_up_partitioned("listings/", n_jobs=8)
+    >>> clean_up_partitioned("listings/", n_jobs=8, output="listings_clean/")["clean_rows"]
+    """
+    if fmt not in ("parquet", "csv"):
+        raise ValueError("fmt must be 'parquet' or 'csv'.")
+    parts, runner = _prepare(source, backend, n_jobs)
+    moments = tree_reduce(_merge_moments, runner.map(_clean_moments, parts))
+    std = moments.std()
+    lower, upper = moments.mean - 3 * std, moments.mean + 3 * std
+
+    files = [None] * len(parts)
+    if output is not None:
+        os.makedirs(output, exist_ok=True)
+        files = [os.path.join(output, f"part-{i:05d}.{fmt}") for i in range(len(parts))]
+    tasks = [(part, moments.columns, lower, upper, path) for part, path in zip(parts, files)]
+    results = runner.map(_clean_partition, tasks)
+
+    columns = moments.columns
+    values, rows, offset = {col: [] for col in columns}, {col: [] for col in columns}, 0
+    n_rows, nulls = 0, None
+    for _, kept, flagged, size, part_nulls in results:
+        n_rows += size
+        nulls = part_nulls if nulls is None else nulls.add(part_nulls, fill_value=0)
+        for col in columns:
+            values[col].append(flagged[col][0])
+            rows[col].append(flagged[col][1] + offset)
+        offset += kept
+    rows = {col: np.concatenate(rows[col]) for col in columns}
+    report = OutlierReport(
+        "zscore", 3, columns,
+        {col: np.unique(np.concatenate(values[col])) for col in columns},
+        {col: len(rows[col]) for col in columns},
+        rows,
+        {col: (lower[j], upper[j]) for j, col in enumerate(columns)},
+    )
+    if nulls is not None:
+        _log_dropped(n_rows, offset, nulls)
+    logger.info("%s", report)
+    if output is not None:
+        return {"files": files, "rows": n_rows, "clean_rows": offset, "outliers": report}
+    return pd.concat([clean for clean, *_ in results], ignore_index=True)
+
+
+def summary_suggestions_partitioned(source, threshold=0.8, backend=None, n_jobs=None,
+                                    k=2048, approximate=False, error=0.02):
+    """summary_suggestions over a partitioned dataset.
+
+    Each partition is summarized by a SummaryAccumulator and the
+    accumulators are merged in a tree reduction. Counts, means, standard
+    deviations, extremes and categorical summaries match summary_suggestions
+    on the concatenated data; the quartiles are exact until a variable has
+    more than about `k` values and come from quantile sketches beyond that.
+
+    Parameters
+    ----------
+    source : see partitions
+        partitioned dataset
+    threshold : float
+        threshold for considering dropping variables with high unique values
+    backend : str or backend object, optional
+        as in clean_up_partitioned
+    n_jobs : int, optional
+        number of worker processes of the "processes" backend
+    k, approximate, error
+        passed on to SummaryAccumulator
+
+    Returns
+    -------
+    results : list
+        the four-part list summary_suggestions returns
+
+    Examples
+    --------
+    >>> summary_suggestions_partitioned(ddf, backend="dask")
+    """
+    parts, runner = _prepare(source, backend, n_jobs)
+    tasks = [(part, k, approximate, error) for part in parts]
+    accumulator = tree_reduce(_merge_accumulators, runner.map(_summary_partition, tasks))
+    return accumulator.result(threshold)
+
+
+def correlation_matrix_partitioned(source, columns=None, backend=None, n_jobs=None, chunk_rows=16384):
+    """Pearson correlation matrix of a partitioned dataset.
+
+    The first map computes the mean of every numeric variable; the second
+    accumulates each partition's pairwise complete counts and co-moments
+    around those means, which add up across partitions in a tree
+    reduction. The result matches DataFrame.corr() on the concatenated data
+    up to floating point rounding.
+
+    Parameters
+    ----------
+    source : see partitions
+        partitioned dataset
+    columns : list, optional
+        variables to correlate, defaults to the numeric variables
+    backend : str or backend object, optional
+        as in clean_up_partitioned
+    n_jobs : int, optional
+        number of worker processes of the "processes" backend
+    chunk_rows : int
+        number of rows multiplied at a time within a partition, defaults
+        to 16384
+
+    Returns
+    -------
+    corr_matrix : pandas.DataFrame
+        correlation matrix indexed by the variable names
+
+    Examples
+    --------
+    >>> correlation_matrix_partitioned(["part-0.parquet", "part-1.parquet"])
+    """
+    if type(chunk_rows) != int or chunk_rows < 1:
+        raise TypeError("chunk_rows must be a positive integer.")
+    parts, runner = _prepare(source, backend, n_jobs)
+    columns = None if columns is None else list(columns)
+    moments = tree_reduce(_merge_moments, runner.map(_column_moments, [(part, columns) for part in parts]))
+    names = moments.columns
+
+    tasks = [(part, names, moments.mean, chunk_rows) for part in parts]
+    sums = tree_reduce(_add_sums, runner.map(_comoments_partition, tasks))
+    corr = _pairwise_corr(*sums)
+
+    std = moments.std()
+    diagonal = (moments.count >= 2) & (std > 0)
+    corr[np.diag_indices(len(names))] = np.where(diagonal, 1.0, np.nan)
+    np.clip(corr, -1, 1, out=corr)
+    return pd.DataFrame(corr, index=names, columns=names)
+
+
+def partitions(source):
+    """Splits a partitioned dataset into the items the backends map over.
+
+    Parameters
+    ----------
+    source : str, os.PathLike, list or dask.dataframe.DataFrame
+        directory of Parquet or CSV shards, a single shard, a list of shard
+        paths and/or pandas dataframes, or a Dask DataFrame
+
+    Returns
+    -------
+    parts : list
+        one item per partition
+    """
+    if hasattr(source, "to_delayed") and hasattr(source, "npartitions"):
+        return list(source.to_delayed())
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if os.path.isdir(path):
+            parts = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".parquet", ".csv"))
+            )
+            if not parts:
+                raise FileNotFoundError(f"no Parquet or CSV files in {path}")
+            return parts
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        return [path]
+    if isinstance(source, (list, tuple)):
+        for part in source:
+            if not isinstance(part, (pd.DataFrame, str, os.PathLike)):
+                raise TypeError("every partition must be a pd.DataFrame or a file path.")
+        return list(source)
+    raise TypeError("source must be a directory, a file, a list of partitions or a Dask DataFrame.")
+
+
+def _prepare(source, backend, n_jobs):
+    """Partitions of source and the backend to run them on."""
+    parts = partitions(source)
+    dask_source = hasattr(source, "to_delayed")
+    if backend is None:
+        backend = "dask" if dask_source else "processes"
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError("backend must be one of " + ", ".join(BACKENDS) + ".")
+        backend = ProcessBackend(n_jobs) if backend == "processes" else BACKENDS[backend]()
+    elif not hasattr(backend, "map"):
+        raise TypeError("backend must be a name or an object with a map method.")
+    # the partitions of a Dask DataFrame are Dask tasks, which only Dask
+    # can compute
+    if dask_source and not isinstance(backend, DaskBackend):
+        raise ValueError("A Dask DataFrame can only be run on the 'dask' backend.")
+    return parts, backend
+
+
+def _load_partition(part, columns=None):
+    """Loads one partition as a pandas dataframe (in the worker)."""
+    if isinstance(part, pd.DataFrame):
+        return part if columns is None else part[columns]
+    path = os.fspath(part)
+    if path.endswith(".csv"):
+        return pd.read_csv(path, usecols=columns)
+    return load_frame(path, columns=columns)
+
+
+def _clean_moments(part):
+    df = _load_partition(part)
+    columns = numeric_columns(df)
+    keep = complete_rows(df)
+    return RunningMoments(columns).update(
+        df[columns].to_numpy(dtype=float, na_value=np.nan)[keep])
+
+
+def _clean_partition(task):
+    part, columns, lower, upper, path = task
+    df = _load_partition(part)
+    missingness = missingness_profile(df)
+    clean = df[missingness.complete_rows()]
+    flagged = {}
+    for j, col in enumerate(columns):
+        # the values keep the column's dtype, as in detect_outliers
+        column = _column_values(clean[col])
+        rows = np.flatnonzero((column < lower[j]) | (column > upper[j]))
+        flagged[col] = (column[rows], rows)
+    if path is not None:
+        # written here so the clean rows never travel back to the parent
+        if path.endswith(".csv"):
+            clean.to_csv(path, index=False)
+        else:
+            clean.to_parquet(path, index=False)
+        return None, len(clean), flagged, len(df), missingness.null_counts()
+    return clean, len(clean), flagged, len(df), missingness.null_counts()
+
+
+def _column_moments(task):
+    part, columns = task
+    df = _load_partition(part, columns)
+    columns = numeric_columns(df) if columns is None else columns
+    return RunningMoments(columns).update(df[columns].to_numpy(dtype=float, na_value=np.nan))
+
+
+def _comoments_partition(task):
+    part, columns, mean, chunk_rows = task
+    values = _load_partition(part, columns)[columns].to_numpy(dtype=float, na_value=np.nan)
+    block = np.arange(len(columns))
+    return _pairwise_sums(values, block, block, block, mean, chunk_rows)
+
+
+def _summary_partition(task):
+    part, k, approximate, error = task
+    accumulator = SummaryAccumulator(k=k, approximate=approximate, error=error)
+    return accumulator.update(_load_partition(part))
+
+
+def _merge_moments(a, b):
+    return a.merge(b)
+
+
+def _merge_accumulators(a, b):
+    return a.merge(b)
+
+
+def _add_sums(a, b):
+    return tuple(x + y for x, y in zip(a, b))
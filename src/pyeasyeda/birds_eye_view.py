@@ -1,10 +1,26 @@
+import io
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-import seaborn as sns
 import warnings
-import matplotlib.pyplot as plt
 
-def birds_eye_view(df, n=20, var_list=None):
+from pyeasyeda.context import resolve_context
+from pyeasyeda.correlation import METHODS
+from pyeasyeda.distributions import distributions
+from pyeasyeda.profiling import profiled, span
+from pyeasyeda.sources import load_frame
+
+# categorical variables with more distinct values are not plotted
+MAX_BAR_CHART_VALUES = 11
+
+logger = logging.getLogger(__name__)
+
+@profiled("birds_eye_view")
+def birds_eye_view(df, n=20, var_list=None, context=None, method="pearson"):
     """Takes in a pandas.DataFrame object, an optional integer for the histogram bin size, an optional custom variable list, and displays 3 different visualization sets.
 
     1. Histograms for each numeric variable
@@ -13,24 +29,40 @@ def birds_eye_view(df, n=20, var_list=None):
 
     Parameters
     ----------
-    df : pandas.DataFrame
-        dataframe to create the visualizations
+    df : pandas.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+        dataframe to create the visualizations; only the columns in
+        var_list (or the numeric and string columns) of an Arrow source
+        are read
     n : int
         bin size for histograms
     var_list : list
         a specific list of variables to examine, defaults to None
+    context : AnalysisContext, optional
+        cache shared with the other pyeasyeda functions, the variable types,
+        value counts and the correlation matrix of df are reused from it
+    method : str
+        correlation coefficient of the heatmap, "pearson", "spearman" or
+        "kendall", defaults to "pearson"
 
     Returns
     -------
     charts: dict
-        A dictionary containing the plot objects created by this function
+        A dictionary containing the plot objects created by this function,
+        and under "distributions" the histogram counts and density curves
+        they were drawn from (see pyeasyeda.distributions)
 
     Examples
     --------
     >>> birds_eye_view(df, n=30)
 
     """
+    # plotting libraries are only imported once a plot is drawn
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
+    with span("birds_eye_view.load"):
+        df = load_frame(df, columns=var_list if type(var_list) == list else None,
+                        kinds=("numeric", "categorical"))
     if not (type(df) == pd.DataFrame):
         raise TypeError("df must be input as a DataFrame.")
 
@@ -40,6 +72,11 @@ def birds_eye_view(df, n=20, var_list=None):
     if type(n) != int:
         raise TypeError("n must be an integer.")
 
+    if method not in METHODS:
+        raise ValueError("method must be 'pearson', 'spearman' or 'kendall'.")
+
+    cache = resolve_context(context).view(df)
+
     # Generate the visualizations
 
     viz = {}
@@ -49,87 +86,308 @@ def birds_eye_view(df, n=20, var_list=None):
     bar_charts = []
 
     # Defining the numeric and categorical variables
-    numeric = df.select_dtypes(include=np.number).columns.tolist()
-    categorical = df.select_dtypes(include=("object" or "string")).columns.to_list()
+    with span("birds_eye_view.dtypes", *df.shape):
+        numeric = cache.numeric_columns()
+        categorical = cache.categorical_columns()
+
+    # Histogram counts and density curves of every plotted numeric variable,
+    # computed together in one pass
+    hist_cols = numeric if var_list is None else [col for col in var_list if col in numeric]
+    with span("birds_eye_view.distributions", len(df), len(hist_cols)):
+        dists = cache.get(("distributions", n, tuple(hist_cols)),
+                          lambda: distributions(df, hist_cols, bins=n), columns=hist_cols)
+
+    # Value counts of the categorical variables, giving up on a variable as
+    # soon as it has too many values for a bar chart
+    with span("birds_eye_view.categorical", len(df), len(categorical)):
+        profiles = cache.categorical_profile(max_unique=MAX_BAR_CHART_VALUES)
 
     # Plot all the variables
     if var_list is None:
 
         # Histograms
-        for num_col in numeric:
-            chart = sns.histplot(df, x=(num_col), bins=n, kde=True)
-            plt.title("Histogram for " + num_col)
-            plt.figure()
-            histograms.append(chart)
+        with span("birds_eye_view.histograms", len(df), len(numeric)):
+            for num_col in numeric:
+                chart = _draw_histogram(plt.gca(), num_col, dists[num_col])
+                plt.title("Histogram for " + num_col)
+                plt.figure()
+                histograms.append(chart)
 
         # Bar Charts
-        for cat_col in categorical:
-            if len(pd.unique(df[cat_col])) > 11:
-                print(cat_col, " has too many unique values")
-            else:
-                chart = sns.countplot(data=df, x=(cat_col))
-                plt.title("Bar Chart for " + cat_col)
-                plt.figure()
-                bar_charts.append(chart)
+        with span("birds_eye_view.bar_charts", len(df), len(categorical)):
+            for cat_col in categorical:
+                if profiles[cat_col].n_unique > MAX_BAR_CHART_VALUES:
+                    logger.info("%s has too many unique values", cat_col)
+                else:
+                    chart = _draw_bar_chart(plt.gca(), cat_col, profiles[cat_col].counts)
+                    plt.title("Bar Chart for " + cat_col)
+                    plt.figure()
+                    bar_charts.append(chart)
 
         # Heatmap
-        corr_matrix = df[numeric].corr()
-        mask = np.triu(np.ones_like(corr_matrix, dtype=np.bool_))
-        chart = sns.heatmap(data=corr_matrix,
-                            vmin=-1,
-                            vmax=1,
-                            annot=True,
-                            cmap="BrBG",
-                            mask=mask
-        )
-        plt.title("Heatmap of correlation between numeric features")
-        plt.figure(figsize=(12, 6))
-        print(chart)
+        with span("birds_eye_view.correlation", len(df), len(numeric)):
+            corr_matrix = cache.corr(numeric, method=method)
+        with span("birds_eye_view.heatmap", *corr_matrix.shape):
+            mask = np.triu(np.ones_like(corr_matrix, dtype=np.bool_))
+            chart = sns.heatmap(data=corr_matrix,
+                                vmin=-1,
+                                vmax=1,
+                                annot=True,
+                                cmap="BrBG",
+                                mask=mask
+            )
+            plt.title("Heatmap of correlation between numeric features")
+            plt.figure(figsize=(12, 6))
         viz["heatmap"] = chart
 
     # Plot just the custom variables from var_list (if applicable)
     else:
         
-        for custom_col in var_list:
-            all_cols = df.columns.to_list()
-            if custom_col not in all_cols:
-                raise TypeError("Variable name " +
-                                custom_col +
-                                " not found in data frame, please check inputs in var_list.")
-
-            # Histograms
-            if custom_col in numeric:
-                heatmap_list.append(custom_col)
-                chart = sns.histplot(df, x=(custom_col), bins=n, kde=True)
-                plt.title("Histogram for " + custom_col)
-                plt.figure()
-                histograms.append(chart)
+        with span("birds_eye_view.charts", len(df), len(var_list)):
+            for custom_col in var_list:
+                all_cols = df.columns.to_list()
+                if custom_col not in all_cols:
+                    raise TypeError("Variable name " +
+                                    custom_col +
+                                    " not found in data frame, please check inputs in var_list.")
 
-            # Bar Charts
-            elif custom_col in categorical:
-                if len(pd.unique(df[custom_col])) > 11:
-                    print(custom_col, " has too many unique values")
-                else:
-                    chart = sns.countplot(data=df, x=(custom_col))
-                    plt.title("Bar Chart for " + custom_col)
+                # Histograms
+                if custom_col in numeric:
+                    heatmap_list.append(custom_col)
+                    chart = _draw_histogram(plt.gca(), custom_col, dists[custom_col])
+                    plt.title("Histogram for " + custom_col)
                     plt.figure()
-                    bar_charts.append(chart)
+                    histograms.append(chart)
+
+                # Bar Charts
+                elif custom_col in categorical:
+                    if profiles[custom_col].n_unique > MAX_BAR_CHART_VALUES:
+                        logger.info("%s has too many unique values", custom_col)
+                    else:
+                        chart = _draw_bar_chart(plt.gca(), custom_col, profiles[custom_col].counts)
+                        plt.title("Bar Chart for " + custom_col)
+                        plt.figure()
+                        bar_charts.append(chart)
 
         # Heatmap
-        corr_matrix = df[heatmap_list].corr()
-        mask = np.triu(np.ones_like(corr_matrix, dtype=np.bool_))
-        chart = sns.heatmap(data=corr_matrix,
-                            vmin=-1,
-                            vmax=1,
-                            annot=True,
-                            cmap="BrBG",
-                            mask=mask
-        )
-        plt.title("Heatmap of correlation between numeric features")
-        plt.figure(figsize=(12, 6))
+        with span("birds_eye_view.correlation", len(df), len(heatmap_list)):
+            corr_matrix = cache.corr(heatmap_list, method=method)
+        with span("birds_eye_view.heatmap", *corr_matrix.shape):
+            mask = np.triu(np.ones_like(corr_matrix, dtype=np.bool_))
+            chart = sns.heatmap(data=corr_matrix,
+                                vmin=-1,
+                                vmax=1,
+                                annot=True,
+                                cmap="BrBG",
+                                mask=mask
+            )
+            plt.title("Heatmap of correlation between numeric features")
+            plt.figure(figsize=(12, 6))
         viz["heatmap"] = chart
 
     viz["histograms"] = histograms
     viz["bar_charts"] = bar_charts
+    viz["distributions"] = dists
     
-    return viz
\ No newline at end of file
+    return viz
+
+@profiled("render_birds_eye_view")
+def render_birds_eye_view(df, n=20, var_list=None, output_dir=None, fmt="png", n_jobs=1, context=None,
+                          method="pearson"):
+    """Renders the birds_eye_view plots straight to image files or bytes.
+
+    A batch version of birds_eye_view for report jobs. Every plot is drawn
+    on its own Figure with the object-oriented Matplotlib API and the Agg
+    canvas, so no pyplot state is touched, nothing needs a display, and
+    the plots can be rendered in parallel across a pool of worker
+    processes. Each figure is discarded as soon as it has been written.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+        dataframe to create the visualizations; only the columns in
+        var_list (or the numeric and string columns) of an Arrow source
+        are read
+    n : int
+        bin size for histograms
+    var_list : list
+        a specific list of variables to examine, defaults to None
+    output_dir : str or os.PathLike, optional
+        directory to write the images to, defaults to None (return bytes).
+        The files are named after the variables, with an index suffix when
+        two names give the same file name
+    fmt : str
+        image format, "png" or "svg", defaults to "png"
+    n_jobs : int
+        number of worker processes, defaults to 1 (render in this process)
+    context : AnalysisContext, optional
+        cache shared with the other pyeasyeda functions
+    method : str
+        correlation coefficient of the heatmap, "pearson", "spearman" or
+        "kendall", defaults to "pearson"
+
+    Returns
+    -------
+    images: dict
+        "histograms" and "bar_charts" map each variable to the path of its
+        image (or its bytes if output_dir is None), "heatmap" holds the
+        heatmap image and "skipped" lists the categorical variables with
+        too many unique values for a bar chart
+
+    Examples
+    --------
+    >>> render_birds_eye_view(df, output_dir="report", n_jobs=8)
+    """
+
+    with span("render_birds_eye_view.load"):
+        df = load_frame(df, columns=var_list if type(var_list) == list else None,
+                        kinds=("numeric", "categorical"))
+    if not (type(df) == pd.DataFrame):
+        raise TypeError("df must be input as a DataFrame.")
+
+    if type(var_list) != list and var_list is not None:
+        raise TypeError("var_list must be a list.")
+
+    if type(n) != int:
+        raise TypeError("n must be an integer.")
+
+    if method not in METHODS:
+        raise ValueError("method must be 'pearson', 'spearman' or 'kendall'.")
+
+    if fmt not in ("png", "svg"):
+        raise ValueError("fmt must be 'png' or 'svg'.")
+
+    if type(n_jobs) != int or n_jobs < 1:
+        raise TypeError("n_jobs must be a positive integer.")
+
+    cache = resolve_context(context).view(df)
+    numeric = cache.numeric_columns()
+    categorical = cache.categorical_columns()
+
+    if var_list is None:
+        var_list = numeric + categorical
+    for custom_col in var_list:
+        if custom_col not in df.columns:
+            raise TypeError("Variable name " +
+                            custom_col +
+                            " not found in data frame, please check inputs in var_list.")
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    used = set()
+
+    def target(name):
+        if output_dir is None:
+            return None
+        # variables whose names sanitize to the same file name get an index
+        # suffix; compared case-insensitively for case-insensitive file systems
+        unique, index = name, 1
+        while unique.lower() in used:
+            index += 1
+            unique = f"{name}_{index}"
+        used.add(unique.lower())
+        return os.path.join(output_dir, f"{unique}.{fmt}")
+
+    # One task per plot, each carrying only the data that plot needs;
+    # histograms are shipped to the workers as their precomputed arrays
+    tasks = []
+    skipped = []
+    heatmap_list = [col for col in var_list if col in numeric]
+    with span("render_birds_eye_view.distributions", len(df), len(heatmap_list)):
+        dists = cache.get(("distributions", n, tuple(heatmap_list)),
+                          lambda: distributions(df, heatmap_list, bins=n), columns=heatmap_list)
+    with span("render_birds_eye_view.categorical", len(df), len(categorical)):
+        profiles = cache.categorical_profile(max_unique=MAX_BAR_CHART_VALUES)
+    for col in var_list:
+        if col in numeric:
+            tasks.append(("histogram", col, dists[col], n, fmt, target("histogram_" + _file_name(col))))
+        elif col in categorical:
+            if profiles[col].n_unique > MAX_BAR_CHART_VALUES:
+                skipped.append(col)
+            else:
+                tasks.append(("bar_chart", col, profiles[col].counts, None, fmt, target("bar_chart_" + _file_name(col))))
+    with span("render_birds_eye_view.correlation", len(df), len(heatmap_list)):
+        tasks.append(("heatmap", None, cache.corr(heatmap_list, method=method), None, fmt, target("heatmap")))
+
+    with span("render_birds_eye_view.render", len(df), len(tasks)):
+        if n_jobs == 1:
+            rendered = [_render_plot(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                rendered = list(executor.map(_render_plot, tasks))
+
+    images = {"histograms": {}, "bar_charts": {}, "heatmap": None, "skipped": skipped}
+    for (kind, col, *_), image in zip(tasks, rendered):
+        if kind == "heatmap":
+            images["heatmap"] = image
+        else:
+            images[kind + "s"][col] = image
+    return images
+
+
+def _render_plot(task):
+    """Draws one plot on its own Agg figure and writes it to a file or bytes."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    kind, col, data, bins, fmt, path = task
+    fig = Figure(figsize=(12, 6) if kind == "heatmap" else (6.4, 4.8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    if kind == "histogram":
+        _draw_histogram(ax, col, data)
+        ax.set_title("Histogram for " + col)
+    elif kind == "bar_chart":
+        _draw_bar_chart(ax, col, data)
+        ax.set_title("Bar Chart for " + col)
+    else:
+        mask = np.triu(np.ones_like(data, dtype=np.bool_))
+        sns.heatmap(data=data, vmin=-1, vmax=1, annot=True, cmap="BrBG", mask=mask, ax=ax)
+        ax.set_title("Heatmap of correlation between numeric features")
+
+    if path is None:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt)
+        image = buffer.getvalue()
+    else:
+        fig.savefig(path, format=fmt)
+        image = path
+    fig.clear()
+    return image
+
+
+def _draw_histogram(ax, col, dist):
+    """Draws a histogram and its density curve from precomputed arrays."""
+    import seaborn as sns
+
+    color = sns.color_palette()[0]
+    edges = dist["edges"]
+    ax.bar(edges[:-1], dist["counts"], width=np.diff(edges), align="edge",
+           color=color, alpha=0.75, edgecolor="white", linewidth=0.5)
+    if len(dist["kde_x"]):
+        ax.plot(dist["kde_x"], dist["kde_y"], color=color)
+    ax.set_xlabel(col)
+    ax.set_ylabel("Count")
+    return ax
+
+
+def _draw_bar_chart(ax, col, counts):
+    """Draws a bar chart of precomputed value counts, one color per value
+    as seaborn's countplot does."""
+    import seaborn as sns
+
+    positions = np.arange(len(counts))
+    ax.bar(positions, counts.to_numpy(), color=sns.color_palette(n_colors=max(len(counts), 1)))
+    ax.set_xticks(positions)
+    ax.set_xticklabels([str(value) for value in counts.index])
+    ax.set_xlabel(col)
+    ax.set_ylabel("count")
+    return ax
+
+
+def _file_name(col):
+    """Turns a variable name into a safe file name."""
+    return re.sub(r"[^0-9A-Za-z_.-]+", "_", str(col))
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+from pyeasyeda.dtypes import categorical_columns
+
+
+class CategoricalProfile:
+    """Value counts of one categorical variable.
+
+    Attributes
+    ----------
+    count : int
+        number of non-null values
+    counts : pandas.Series or None
+        number of rows per value, in order of first appearance; None when
+        the variable was found to exceed the cardinality cap
+    n_unique : int
+        number of distinct values; a lower bound (cap + 1 or more) when
+        truncated
+    truncated : bool
+        True when counting stopped because the cap was exceeded
+    """
+
+    def __init__(self, count, counts, n_unique, truncated):
+        self.count = count
+        self.counts = counts
+        self.n_unique = n_unique
+        self.truncated = truncated
+
+    def __repr__(self):
+        unique = f"{self.n_unique}+" if self.truncated else str(self.n_unique)
+        return f"CategoricalProfile(count={self.count}, unique={unique})"
+
+    def describe(self):
+        """Returns [count, unique, top, freq] as DataFrame.describe computes
+        them for an object column."""
+        if self.truncated:
+            raise ValueError("A truncated profile has no exact summary.")
+        # same ordering as Series.value_counts(), so ties pick the same top
+        ordered = self.counts.sort_values(ascending=False)
+        if len(ordered) == 0:
+            return [self.count, 0, np.nan, np.nan]
+        return [self.count, len(ordered), ordered.index[0], ordered.iloc[0]]
+
+
+def profile_categoricals(df, columns=None, max_unique=None, chunk_rows=65536):
+    """Counts the values of categorical variables, stopping early on
+    high-cardinality ones.
+
+    Without a cap every variable is hashed exactly once. With `max_unique`,
+    the rows are scanned `chunk_rows` at a time and a variable is dropped
+    from the scan as soon as it has more than `max_unique` distinct values,
+    so an ID column is not fully hashed just to find out it has too many
+    values to plot.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        dataframe to examine
+    columns : list, optional
+        variables to profile, defaults to the categorical variables
+    max_unique : int, optional
+        cardinality cap, defaults to None (count every value)
+    chunk_rows : int
+        number of rows scanned at a time when max_unique is set, defaults
+        to 65536
+
+    Returns
+    -------
+    profiles : dict
+        CategoricalProfile of each variable
+
+    Examples
+    --------
+    >>> profiles = profile_categoricals(df, max_unique=11)
+    >>> profiles["island"].counts
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be input as a DataFrame.")
+    if max_unique is not None and (type(max_unique) != int or max_unique < 0):
+        raise TypeError("max_unique must be a non-negative integer.")
+    if type(chunk_rows) != int or chunk_rows < 1:
+        raise TypeError("chunk_rows must be a positive integer.")
+
+    columns = categorical_columns(df) if columns is None else list(columns)
+
+    if max_unique is None:
+        profiles = {}
+        for col in columns:
+            counts = df[col].value_counts(sort=False)
+            counts = counts[counts > 0].astype(np.int64)
+            profiles[col] = CategoricalProfile(int(counts.sum()), counts, len(counts), False)
+        return profiles
+
+    totals = {col: {} for col in columns}
+    truncated = {}
+    for start in range(0, len(df), chunk_rows):
+        active = [col for col in columns if col not in truncated]
+        if not active:
+            break
+        chunk = df.iloc[start:start + chunk_rows]
+        for col in active:
+            counts = chunk[col].value_counts(sort=False)
+            counts = counts[counts > 0]
+            total = totals[col]
+            if len(counts) > max_unique:
+                truncated[col] = len(counts)
+                continue
+            for value, count in counts.items():
+                total[value] = total.get(value, 0) + count
+            if len(total) > max_unique:
+                truncated[col] = len(total)
+
+    profiles = {}
+    for col in columns:
+        if col in truncated:
+            profiles[col] = CategoricalProfile(int(df[col].count()), None, truncated[col], True)
+        else:
+            counts = pd.Series(totals[col], dtype=np.int64)
+            profiles[col] = CategoricalProfile(int(counts.sum()), counts, len(counts), False)
+    return profiles
+
+
+def summarize_profiles(profiles):
+    """Builds the DataFrame.describe() table of categorical variables from
+    their profiles.
+
+    Parameters
+    ----------
+    profiles : dict
+        CategoricalProfile of each variable, without a cardinality cap
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        "count", "unique", "top" and "freq" of each variable
+    """
+    return pd.DataFrame(
+        {col: profile.describe() for col, profile in profiles.items()},
+        index=["count", "unique", "top", "freq"],
+        dtype=object,
+    )
@@ -1,25 +1,73 @@
+import logging
+import os
+import shutil
+import tempfile
+
 import numpy as np
 import pandas as pd
-from scipy import stats
 
-def clean_up(df):
+from pyeasyeda.context import resolve_context
+from pyeasyeda.dtypes import compact_dtypes, numeric_columns
+from pyeasyeda.missingness import missingness_profile
+from pyeasyeda.moments import RunningMoments
+from pyeasyeda.outliers import OutlierReport, detect_outliers
+from pyeasyeda.profiling import profiled, span
+from pyeasyeda.sources import load_frame, null_counts
+
+logger = logging.getLogger(__name__)
+
+@profiled("clean_up")
+def clean_up(df, context=None, compact=False, mode="copy"):
     """Takes a dataframe object and returns a cleaned version 
      with rows containing any NaN values dropped. 
-     Inspects the clean dataframe and prints a list of potential outliers for each explanatory variable, 
-     based on the threshold distance of 3 standard deviations.
+     Inspects the clean dataframe and logs a list of potential outliers for each explanatory variable, 
+     based on the threshold distance of 3 standard deviations, at the INFO
+     level of the "pyeasyeda.clean_up" logger.
+
+     The rows without NaN's are found from the bit-packed null bitmaps of
+     the columns (see pyeasyeda.missingness), which also give the number of
+     rows dropped and the columns with the most NaN's, logged before the
+     outliers. The outliers are flagged through the resulting mask, so no
+     clean copy is needed to inspect the data. `mode` decides what happens
+     to the rows afterwards:
+
+     - "copy" returns a new dataframe with the clean rows (the input is
+       left untouched; peak memory is the input plus the clean rows)
+     - "mask" returns the boolean mask itself, one byte per row, to be
+       applied later or lazily (e.g. ``df[mask]``)
+     - "inplace" drops the rows from df itself and returns it, without the
+       extra copy reset_index used to make; the retained rows are copied
+       once while the old blocks are released
+
         Parameters
         ----------
-        df : dataframe
-            dataframe to be cleaned
+        df : dataframe, Parquet path, pyarrow.Table or pyarrow Dataset
+            dataframe to be cleaned. Arrow sources are loaded without
+            converting strings to Python objects, and the NaN scan is
+            skipped when the Parquet statistics record no nulls and no
+            column is floating point (Arrow does not count NaN as null).
+        context : AnalysisContext, optional
+            cache shared with the other pyeasyeda functions, the outlier
+            report of df is reused from it on repeated calls
+        compact : bool
+            store the clean dataframe in narrower dtypes (categories,
+            Arrow-backed strings, downcast numbers; see
+            pyeasyeda.dtypes.compact_dtypes) and log its memory usage
+            before and after, defaults to False
+        mode : str
+            "copy", "mask" or "inplace", defaults to "copy"
     
         Returns
         -------
         df_clean
-            same dataframe with all the NaN's removed
+            same dataframe with all the NaN's removed, or the boolean mask
+            of the rows without NaN's when mode is "mask"
         Examples
         --------
+        >>> logging.basicConfig(level=logging.INFO)
         >>> df_clean = clean_up(df)
                 
+        'Dropped 2 of 13 rows with missing values; most missing: X (2)'
         '**The following potenital outliers were detected:**
         Variable X: 
         [ 300, 301, 500, 1000 ]
@@ -27,25 +75,278 @@ def clean_up(df):
         [ 6.42, 6.44, 58.52, 60.22 ]'
     
     """
+    source = df
+    with span("clean_up.load"):
+        df = load_frame(source)
     if not isinstance(df, pd.DataFrame):
         raise TypeError("the input df must be pd.DataFrame type")
+    if type(compact) != bool:
+        raise TypeError("compact must be True or False")
+    if mode not in ("copy", "mask", "inplace"):
+        raise ValueError("mode must be 'copy', 'mask' or 'inplace'")
+    if compact and mode == "mask":
+        raise ValueError("compact needs the clean dataframe, use mode 'copy' or 'inplace'")
+    rows, cols = df.shape
+    with span("clean_up.context", rows, cols):
+        cache = resolve_context(context).view(df)
     
-    # Drop any row that contains missing value and reset the index
-    df_clean = df.dropna(axis=0, how='any').reset_index(drop=True)
+    # Mark the rows without any missing value from the null bitmaps of the
+    # columns, unless the metadata of an Arrow source shows there are none.
+    # Arrow does not count NaN as null, so a floating column is always read
+    with span("clean_up.missing", rows, cols):
+        nulls = null_counts(source, list(df.columns)) if df is not source else {}
+        floating = any(dtype.kind == "f" for dtype in df.dtypes)
+        if nulls and not floating and all(count == 0 for count in nulls.values()):
+            keep = np.ones(len(df), dtype=np.bool_)
+        else:
+            missingness = missingness_profile(df)
+            keep = missingness.complete_rows()
+            _log_dropped(rows, int(keep.sum()), missingness.null_counts())
 
-    # Keep only numerical variables relevant for outlier detection
-    num_df = df_clean.select_dtypes(['number'])
-    
-    # Create a dataframe that contains only the outliers
-    outlier_df = num_df[(np.abs(stats.zscore(num_df)) > 3)] 
+    # Logs the unique outlier values for each numerical variable,
+    # flagged 3 standard deviations away from the mean
+    with span("clean_up.outliers", int(keep.sum()), cols):
+        # the rows examined depend on the NaN's of every column
+        report = cache.get(("outliers", "zscore", 3),
+                           lambda: detect_outliers(df, method="zscore", threshold=3, mask=keep),
+                           columns=list(df.columns))
+    logger.info("%s", report)
+
+    if mode == "mask":
+        return keep
+
+    # Drop the rows with missing values and reset the index; a frame that
+    # was just loaded from an Arrow source is nobody else's, so it is
+    # modified in place as well
+    with span("clean_up.drop", rows, cols):
+        if mode == "inplace" or df is not source:
+            df_clean = df
+            if not keep.all():
+                df_clean.reset_index(drop=True, inplace=True)
+                df_clean.drop(index=np.flatnonzero(~keep), inplace=True)
+            df_clean.reset_index(drop=True, inplace=True)
+        else:
+            df_clean = df[keep]
+            df_clean.index = pd.RangeIndex(len(df_clean))
 
-    # Prints out unique outlier values for each variable
-    print("**The following potenital outliers were detected:**")
-    for col in outlier_df:
-        outliers = outlier_df[col].dropna()
-        if len(outliers) != 0:
-            print(f"Variable {col}: ")
-            print(np.unique(outliers.values))
+    # Stores the clean dataframe in the narrowest lossless dtypes; the
+    # outliers above were flagged on the original values
+    if compact:
+        with span("clean_up.compact", *df_clean.shape):
+            before = df_clean.memory_usage(deep=True).sum()
+            df_clean = compact_dtypes(df_clean, inplace=mode == "inplace")
+            after = df_clean.memory_usage(deep=True).sum()
+        logger.info("Compacted the clean dataframe from %s to %s bytes", f"{before:,}", f"{after:,}")
 
     # returns the clean dataframe with NaN values dropped
-    return df_clean
\ No newline at end of file
+    return df_clean
+
+
+def complete_rows(df, columns=None):
+    """Returns a boolean mask of the rows of df without missing values.
+
+    Same rows as df.dropna(how="any"), read from the bit-packed null
+    bitmaps of pyeasyeda.missingness, so clean_up, the partitioned
+    backends, the service and build_profile all agree on what is missing
+    (NaN's of an Arrow floating column included). The extra memory is one
+    bit per value and the mask (one byte per row), instead of a full copy
+    of the frame.
+
+    Parameters
+    ----------
+    df : dataframe, Parquet path, pyarrow.Table or pyarrow Dataset
+        dataframe to examine
+    columns : list, optional
+        columns to examine, defaults to all of them
+
+    Returns
+    -------
+    keep : numpy.ndarray
+        True for every row without NaN's
+    """
+    return missingness_profile(df, columns).complete_rows()
+
+
+def _log_dropped(rows, kept, null_counts, top=5):
+    """Logs how many rows have missing values and the columns with the
+    most of them."""
+    if kept == rows:
+        return
+    worst = null_counts[null_counts > 0].sort_values(ascending=False, kind="stable")
+    logger.info(
+        "Dropped %s of %s rows with missing values; most missing: %s",
+        f"{rows - kept:,}", f"{rows:,}",
+        ", ".join(f"{col} ({count:,})" for col, count in worst.iloc[:top].items()),
+    )
+
+
+def clean_up_stream(source, output=None, chunksize=100_000):
+    """Out-of-core version of clean_up for data that does not fit in memory.
+
+    Reads the data in chunks twice. The first pass accumulates the mean and
+    standard deviation of every numeric variable over the rows without NaN's,
+    merging the chunks with Chan's pairwise update. The second pass flags
+    values more than 3 standard deviations away from the mean and, if
+    `output` is given, writes the rows without NaN's to that file. Peak memory
+    depends on `chunksize` rather than on the size of the data. As clean_up,
+    it logs how many rows had NaN's and the columns with the most of them.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or iterable of pandas.DataFrame
+        path to a CSV file, a Parquet file or a directory of Parquet files,
+        or an iterable of dataframe chunks sharing the same columns. A
+        one-shot iterator is spooled to a temporary directory during the
+        first pass so it can be read a second time.
+    output : str or os.PathLike, optional
+        file to write the cleaned rows to. Written as Parquet if the name ends
+        in ".parquet", as CSV otherwise. Defaults to None (no rows written).
+    chunksize : int
+        number of rows read at a time from a file, defaults to 100,000
+
+    Returns
+    -------
+    report : OutlierReport
+        unique outlier values, counts and row positions (within the cleaned
+        rows) for each numeric variable, the same outliers clean_up logs
+        for the equivalent in-memory dataframe
+
+    Examples
+    --------
+    >>> outliers = clean_up_stream("listings.csv", output="listings_clean.csv")
+
+    '**The following potenital outliers were detected:**
+    Variable price:
+    [ 150000.]'
+    """
+    if type(chunksize) != int or chunksize < 1:
+        raise TypeError("chunksize must be a positive integer.")
+
+    spool_dir = None
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        read_chunks = lambda: _read_file_chunks(path, chunksize)
+    elif hasattr(source, "__iter__") and not isinstance(source, pd.DataFrame):
+        if iter(source) is source:
+            spool_dir = tempfile.mkdtemp(prefix="pyeasyeda-")
+        read_chunks = lambda: iter(source)
+    else:
+        raise TypeError("source must be a file path or an iterable of pd.DataFrame chunks")
+
+    try:
+        # First pass: moments of the numeric variables over complete rows
+        moments = None
+        n_spooled = 0
+        n_rows = n_kept = 0
+        nulls = None
+        for chunk in read_chunks():
+            if not isinstance(chunk, pd.DataFrame):
+                raise TypeError("every chunk must be pd.DataFrame type")
+            if spool_dir is not None:
+                chunk.to_pickle(os.path.join(spool_dir, f"{n_spooled}.pkl"))
+                n_spooled += 1
+            missingness = missingness_profile(chunk)
+            chunk_clean = chunk[missingness.complete_rows()]
+            n_rows += len(chunk)
+            n_kept += len(chunk_clean)
+            nulls = missingness.null_counts() if nulls is None else nulls + missingness.null_counts()
+            if moments is None:
+                moments = RunningMoments(numeric_columns(chunk_clean))
+            moments.update(chunk_clean[moments.columns].to_numpy(dtype=float, na_value=np.nan))
+
+        if nulls is not None:
+            _log_dropped(n_rows, n_kept, nulls)
+
+        if spool_dir is not None:
+            read_chunks = lambda: (
+                pd.read_pickle(os.path.join(spool_dir, f"{i}.pkl"))
+                for i in range(n_spooled)
+            )
+
+        # Same bounds as the in-memory z-score detector
+        columns = moments.columns if moments is not None else []
+        if moments is not None:
+            lower = moments.mean - 3 * moments.std()
+            upper = moments.mean + 3 * moments.std()
+
+        # Second pass: flag the outliers and write out the clean rows
+        found = {col: [] for col in columns}
+        found_rows = {col: [] for col in columns}
+        offset = 0
+        writer = _ChunkWriter(output)
+        try:
+            for chunk in read_chunks():
+                chunk_clean = chunk[complete_rows(chunk)]
+                writer.write(chunk_clean)
+                for j, col in enumerate(columns):
+                    values = chunk_clean[col].to_numpy()
+                    with np.errstate(invalid="ignore"):
+                        rows = np.flatnonzero((values < lower[j]) | (values > upper[j]))
+                    if len(rows) != 0:
+                        found[col].append(np.unique(values[rows]))
+                        found_rows[col].append(rows + offset)
+                offset += len(chunk_clean)
+        finally:
+            writer.close()
+    finally:
+        if spool_dir is not None:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+    values = {
+        col: np.unique(np.concatenate(parts)) if parts else np.array([])
+        for col, parts in found.items()
+    }
+    rows = {
+        col: np.concatenate(parts) if parts else np.array([], dtype=np.intp)
+        for col, parts in found_rows.items()
+    }
+    report = OutlierReport(
+        "zscore", 3, columns, values,
+        {col: len(rows[col]) for col in columns}, rows,
+        {col: (lower[j], upper[j]) for j, col in enumerate(columns)},
+    )
+    logger.info("%s", report)
+    return report
+
+
+def _read_file_chunks(path, chunksize):
+    """Yields dataframe chunks from a CSV or Parquet file."""
+    if path.endswith(".parquet") or os.path.isdir(path):
+        import pyarrow.dataset as ds
+
+        for batch in ds.dataset(path, format="parquet").to_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        with pd.read_csv(path, chunksize=chunksize) as reader:
+            yield from reader
+
+
+class _ChunkWriter:
+    """Appends dataframe chunks to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path) if path is not None else None
+        self._parquet = None
+        self._header = True
+
+    def write(self, chunk):
+        if self.path is None:
+            return
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                self._parquet = pq.ParquetWriter(self.path, schema)
+            table = pa.Table.from_pandas(chunk, schema=self._parquet.schema, preserve_index=False)
+            self._parquet.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
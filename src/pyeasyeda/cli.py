@@ -0,0 +1,131 @@
+"""Command line entry point of pyeasyeda.
+
+Profiles a CSV or Parquet file, a directory of Parquet files or a glob
+pattern in one streaming pass and writes a JSON profile and a
+self-contained HTML report::
+
+    $ pyeasyeda "listings/*.csv" --output-dir report
+
+Results are cached under the fingerprint of the input files (their paths,
+sizes and modification times) and of the options, so running the command
+again on unchanged files only copies the cached report.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+
+from pyeasyeda.report import build_profile, input_fingerprint, render_report, write_profile
+
+PROFILE_NAME = "profile.json"
+REPORT_NAME = "report.html"
+
+
+def default_cache_dir():
+    """Cache directory of the command: $XDG_CACHE_HOME/pyeasyeda, or
+    ~/.cache/pyeasyeda."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pyeasyeda")
+
+
+def run(source, output_dir=".", cache_dir=None, images=True, **options):
+    """Writes the profile and report of source to output_dir, reusing the
+    cached ones when the input files and options are unchanged.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or list
+        files, directories or glob patterns, as in build_profile
+    output_dir : str or os.PathLike
+        directory to write profile.json and report.html to, defaults to
+        the current directory
+    cache_dir : str or os.PathLike, optional
+        directory of cached results, defaults to None (no caching)
+    images : bool
+        embed the plots in the report, defaults to True
+    **options
+        passed on to build_profile
+
+    Returns
+    -------
+    cached : bool
+        True if the results came from the cache
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = [os.path.join(output_dir, PROFILE_NAME), os.path.join(output_dir, REPORT_NAME)]
+
+    entry = None
+    if cache_dir is not None:
+        key = input_fingerprint(source, images=images, **options)
+        entry = os.path.join(cache_dir, key)
+        cached = [os.path.join(entry, PROFILE_NAME), os.path.join(entry, REPORT_NAME)]
+        if all(os.path.exists(path) for path in cached):
+            for path, output in zip(cached, outputs):
+                shutil.copyfile(path, output)
+            return True
+
+    profile = build_profile(source, **options)
+    write_profile(profile, outputs[0])
+    with open(outputs[1], "w", encoding="utf-8") as file:
+        file.write(render_report(profile, images=images))
+
+    if entry is not None:
+        # written to a temporary directory first so an interrupted run never
+        # leaves a partial entry behind
+        partial = entry + ".partial"
+        os.makedirs(partial, exist_ok=True)
+        for output in outputs:
+            shutil.copyfile(output, os.path.join(partial, os.path.basename(output)))
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(partial, entry)
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="pyeasyeda",
+        description="Profiles a CSV or Parquet dataset into a JSON profile and an HTML report.",
+    )
+    parser.add_argument("source", nargs="+",
+                        help="CSV or Parquet file, directory of Parquet files or glob pattern")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help=f"directory to write {PROFILE_NAME} and {REPORT_NAME} to")
+    parser.add_argument("--bins", type=int, default=20, help="number of histogram bins")
+    parser.add_argument("--pairs", type=int, default=5, help="number of most correlated pairs")
+    parser.add_argument("--threshold", type=float, default=0.8,
+                        help="proportion of unique values above which a variable is flagged")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows read at a time")
+    parser.add_argument("--approximate", action="store_true",
+                        help="estimate the unique values of categorical variables with sketches")
+    parser.add_argument("--max-values", type=int, default=100_000,
+                        help="distinct values of a categorical variable counted exactly before "
+                             "it is estimated with a sketch")
+    parser.add_argument("--no-images", action="store_true", help="leave the plots out of the report")
+    parser.add_argument("--cache-dir", default=default_cache_dir(),
+                        help="directory of cached results (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="always profile the data again")
+    args = parser.parse_args(argv)
+
+    source = args.source[0] if len(args.source) == 1 else args.source
+    try:
+        cached = run(
+            source, args.output_dir,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            images=not args.no_images,
+            bins=args.bins, pairs=args.pairs, threshold=args.threshold,
+            chunksize=args.chunksize, approximate=args.approximate,
+            max_values=args.max_values,
+        )
+    except (FileNotFoundError, TypeError, ValueError) as error:
+        print(f"pyeasyeda: error: {error}", file=sys.stderr)
+        return 1
+
+    state = " (cached)" if cached else ""
+    print(f"Wrote {os.path.join(args.output_dir, PROFILE_NAME)} and "
+          f"{os.path.join(args.output_dir, REPORT_NAME)}{state}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
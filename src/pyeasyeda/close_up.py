@@ -1,19 +1,53 @@
 import pandas as pd
 import numpy as np
-import altair as alt
 
+from pyeasyeda.context import resolve_context
+from pyeasyeda.profiling import profiled, span
+from pyeasyeda.sources import load_frame
 
-def close_up(df, n=1):
+
+@profiled("close_up")
+def close_up(df, n=1, context=None, max_points=5000, density_threshold=100_000, random_state=0,
+             method="pearson", sample=None):
     """Accepts a dataframe and the number of pairs of variables with strongest correlations, and
     returns vertically combined scatterplots with a correlation trend for each pair. 
 
+    Each chart only embeds the two variables it plots. Pairs with more than
+    `max_points` complete rows are drawn from a reproducible random sample,
+    and pairs with more than `density_threshold` rows as a 2D-binned density
+    instead of points, so the size of the Vega-Lite spec stays bounded. The
+    trend line is a least squares fit over all rows, computed with numpy and
+    embedded as its two end points.
+
+    Spearman's rho or Kendall's tau rank the pairs by monotonic rather than
+    linear association, which heavy tails and outliers distort less. On
+    long data, `sample` estimates the coefficients from a sample of the
+    rows and adds their 95% confidence intervals to the chart titles.
+
         Parameters
         ----------
-        df : pd.core.frame.DataFrame
-             dataframe to create the visualization(s)
+        df : pd.core.frame.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+             dataframe to create the visualization(s); only the numeric
+             columns of an Arrow source are read
         n : int
             number of pairs of variables with strongest correlations to be displayed,
             defaults to 1
+        context : AnalysisContext, optional
+            cache shared with the other pyeasyeda functions, the correlation
+            matrix of df is reused from it on repeated calls
+        max_points : int
+            maximum number of points drawn per scatterplot, defaults to 5000
+        density_threshold : int
+            number of rows above which a pair is drawn as a binned density,
+            defaults to 100,000
+        random_state : int
+            seed of the row samples, defaults to 0
+        method : str
+            correlation coefficient, "pearson", "spearman" or "kendall",
+            defaults to "pearson"
+        sample : int, optional
+            number of rows the coefficients are estimated from, defaults to
+            None (all rows)
             
         Returns
         -------
@@ -24,53 +58,296 @@ def close_up(df, n=1):
         Examples
         --------
         >>> close_up(df, n = 4)
+        >>> close_up(df, n = 2, method = "spearman", sample = 100_000)
     """
 
+    # altair is only imported once a chart is built
+    import altair as alt
+
     # check if input is a DataFrame
+    with span("close_up.load"):
+        df = load_frame(df, kinds=("numeric",))
     if not isinstance(df, pd.core.frame.DataFrame):
         raise TypeError("df should be of type 'pandas.core.frame.DataFrame'")
 
     if not isinstance(n, int):
         raise TypeError("n should be of type 'int'.")
 
+    for name, value in [("max_points", max_points), ("density_threshold", density_threshold)]:
+        if not isinstance(value, int) or value < 1:
+            raise TypeError(f"{name} should be a positive 'int'.")
+
+    if sample is not None and (not isinstance(sample, int) or sample < 1):
+        raise TypeError("sample should be a positive 'int'.")
+
     # calculate max allowable integer
-    numeric = df.select_dtypes(include=np.number).columns.tolist()
-    corr_matrix = df[numeric].corr()
+    cache = resolve_context(context).view(df)
+    with span("close_up.correlation", len(df), len(cache.numeric_columns())):
+        if sample is None:
+            corr_matrix = cache.corr(method=method)
+        else:
+            corr_matrix, lower, upper = cache.corr_sample(method=method, sample=sample)
     N_max = len(corr_matrix) * (len(corr_matrix) - 1) / 2
 
     # check if input exceeds max allowable integer
     if n > N_max:
         raise ValueError("n exceeds total number of coefficients.")
 
-    # initialization
-    corr = corr_matrix.to_numpy()
-    corr = abs(corr)
-    corr = np.triu(corr)  # take only upper triangle
-    np.fill_diagonal(corr, 0)  # zero diagonal
-    max_row = np.argmax(np.max(corr, axis=1))
-    max_col = np.argmax(np.max(corr, axis=0))
     viz = {}  # viz dict to be returned
 
+    with span("close_up.top_pairs", len(corr_matrix), len(corr_matrix)):
+        pairs = _top_pairs(corr_matrix, n)
+
     # plot
-    for i in range(n):
-        max_row = np.argmax(np.max(corr, axis=1))
-        max_col = np.argmax(np.max(corr, axis=0))
-        coef = corr_matrix.iloc[max_row, max_col]
-        points = (
-            alt.Chart(df, title=f'coeff: {coef:.3f}')
-            .mark_point(opacity=0.3)
-            .encode(
-                alt.X(corr_matrix.columns[max_row]), alt.Y(
-                    corr_matrix.columns[max_col])
-            )
-        )
-        viz[i+1] = points + points.transform_regression(
-            corr_matrix.columns[max_row], corr_matrix.columns[max_col]).mark_line(size=3)
-        corr[max_row, max_col] = 0
+    for i, (col_a, col_b, coef) in enumerate(pairs):
+        with span("close_up.chart", len(df), 2):
+            pair = df[[col_a, col_b]].dropna()
+            title = f'coeff: {coef:.3f}'
+            if sample is not None:
+                title += f' (95% CI {lower.loc[col_a, col_b]:.3f} to {upper.loc[col_a, col_b]:.3f})'
+            if len(pair) > density_threshold:
+                points = _density_chart(pair, col_a, col_b, title)
+            else:
+                if len(pair) > max_points:
+                    rng = np.random.default_rng(random_state)
+                    pair_sample = pair.iloc[np.sort(rng.choice(len(pair), max_points, replace=False))]
+                else:
+                    pair_sample = pair
+                points = (
+                    alt.Chart(pair_sample, title=title)
+                    .mark_point(opacity=0.3)
+                    .encode(
+                        alt.X(col_a), alt.Y(col_b)
+                    )
+                )
+            viz[i+1] = points + _trend_chart(pair, col_a, col_b)
+
+    if not viz:
+        raise ValueError("No pair of variables has a correlation coefficient.")
 
     # generate one big chart
     chart = viz[1]
-    for i in range(n-1):
-        chart &= viz[i+2]
+    for i in range(2, len(viz) + 1):
+        chart &= viz[i]
 
     return chart
+
+
+def _trend_chart(pair, col_a, col_b):
+    """Least squares trend line of a pair, embedded as its two end points."""
+    import altair as alt
+
+    x = pair[col_a].to_numpy(dtype=float)
+    y = pair[col_b].to_numpy(dtype=float)
+    ends = pd.DataFrame({col_a: [x.min(), x.max()]}) if len(x) else pd.DataFrame({col_a: []})
+    if len(x) >= 2 and x.min() < x.max():
+        slope, intercept = np.polyfit(x, y, 1)
+        ends[col_b] = intercept + slope * ends[col_a]
+    else:
+        ends[col_b] = np.nan
+    return alt.Chart(ends).mark_line(size=3).encode(alt.X(col_a), alt.Y(col_b))
+
+
+def _density_chart(pair, col_a, col_b, title, bins=60):
+    """2D-binned density of a pair, embedding only the non-empty bins."""
+    import altair as alt
+
+    counts, x_edges, y_edges = np.histogram2d(
+        pair[col_a].to_numpy(dtype=float), pair[col_b].to_numpy(dtype=float), bins=bins
+    )
+    ix, iy = np.nonzero(counts)
+    cells = pd.DataFrame({
+        "x_start": x_edges[ix], "x_end": x_edges[ix + 1],
+        "y_start": y_edges[iy], "y_end": y_edges[iy + 1],
+        "count": counts[ix, iy],
+    })
+    return (
+        alt.Chart(cells, title=title)
+        .mark_rect()
+        .encode(
+            alt.X("x_start:Q", bin="binned", title=col_a), x2="x_end",
+            y=alt.Y("y_start:Q", bin="binned", title=col_b), y2="y_end",
+            color=alt.Color("count:Q", scale=alt.Scale(type="log")),
+        )
+    )
+
+
+def top_correlated_pairs(df, n=1, context=None, method="pearson"):
+    """Returns the n pairs of numeric variables with the strongest correlations,
+    without building any charts.
+
+        Parameters
+        ----------
+        df : pd.core.frame.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+             dataframe to examine; only the numeric columns of an Arrow
+             source are read
+        n : int
+            number of pairs to return, defaults to 1
+        context : AnalysisContext, optional
+            cache shared with the other pyeasyeda functions
+        method : str
+            correlation coefficient, "pearson", "spearman" or "kendall",
+            defaults to "pearson"
+
+        Returns
+        -------
+        pairs : list
+            (variable a, variable b, correlation coefficient) tuples ordered by
+            decreasing absolute correlation; ties are broken by the position of
+            the variables in the dataframe. Pairs without a coefficient (e.g.
+            with a constant variable) are left out, so fewer than n pairs are
+            returned when there are not enough coefficients
+
+        Examples
+        --------
+        >>> top_correlated_pairs(df, n = 2)
+        [('income', 'price', 0.991), ('income', 'house_size', 0.951)]
+    """
+    df = load_frame(df, kinds=("numeric",))
+    if not isinstance(df, pd.core.frame.DataFrame):
+        raise TypeError("df should be of type 'pandas.core.frame.DataFrame'")
+
+    if not isinstance(n, int):
+        raise TypeError("n should be of type 'int'.")
+
+    corr_matrix = resolve_context(context).view(df).corr(method=method)
+    if n > len(corr_matrix) * (len(corr_matrix) - 1) / 2:
+        raise ValueError("n exceeds total number of coefficients.")
+
+    return _top_pairs(corr_matrix, n)
+
+
+def _top_pairs(corr_matrix, n, block_size=256):
+    """Selects the n largest absolute coefficients of the strict upper triangle.
+
+    The rows are scanned once in blocks; each block keeps exactly its n
+    largest values, ties going to the first pairs in row order, so the work
+    is O(p^2 + n log n) and the extra memory is one block of rows. NaN
+    coefficients are left out, so fewer than n pairs may be returned.
+    """
+    if n < 1:
+        raise ValueError("n should be at least 1.")
+
+    corr = corr_matrix.to_numpy()
+    p = corr.shape[0]
+    values, rows, cols = [], [], []
+    for start in range(0, p - 1, block_size):
+        block = np.abs(corr[start:start + block_size])
+        # keep only the finite values of the strict upper triangle
+        upper = np.arange(block.shape[1]) > np.arange(start, start + block.shape[0])[:, None]
+        idx = np.flatnonzero(upper & ~np.isnan(block))
+        flat = block.ravel()[idx]
+        if len(flat) > n:
+            kth = np.partition(flat, len(flat) - n)[len(flat) - n]
+            above = flat > kth
+            # idx is increasing, so the first ties are the first pairs
+            tied = np.flatnonzero(flat == kth)[:n - above.sum()]
+            keep = np.sort(np.concatenate([np.flatnonzero(above), tied]))
+            idx, flat = idx[keep], flat[keep]
+        values.append(flat)
+        rows.append(idx // p + start)
+        cols.append(idx % p)
+
+    if not values:
+        return []
+    values, rows, cols = np.concatenate(values), np.concatenate(rows), np.concatenate(cols)
+    order = np.lexsort((cols, rows, -values))[:n]
+    return [
+        (corr_matrix.index[i], corr_matrix.columns[j], float(corr[i, j]))
+        for i, j in zip(rows[order], cols[order])
+    ]
+
+
+@profiled("prune_correlated")
+def prune_correlated(df, threshold=0.9, context=None, method="pearson", block_size=256):
+    """Drops near-duplicate numeric variables, keeping one per cluster of
+    strongly correlated variables.
+
+    Two variables are linked when the absolute value of their correlation
+    reaches `threshold`, and the clusters are the connected groups of
+    linked variables, so a chain of strong correlations can join two
+    variables that are not directly correlated. The correlation matrix is
+    computed once (and shared with close_up through the context); its
+    upper triangle is then scanned in blocks of rows, and only the links
+    above the threshold are ever extracted, into a union-find. Each cluster
+    keeps the variable with the fewest NaN's, the first one in the
+    dataframe among ties.
+
+        Parameters
+        ----------
+        df : pd.core.frame.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+             dataframe to examine; only the numeric columns of an Arrow
+             source are read
+        threshold : float
+            absolute correlation from which two variables are redundant,
+            between 0 and 1, defaults to 0.9
+        context : AnalysisContext, optional
+            cache shared with the other pyeasyeda functions
+        method : str
+            correlation coefficient, "pearson", "spearman" or "kendall",
+            defaults to "pearson"
+        block_size : int
+            number of rows of the correlation matrix scanned at a time,
+            defaults to 256
+
+        Returns
+        -------
+        columns : list
+            columns of df without the dropped variables, in their order
+        dropped : dict
+            each dropped variable mapped to the variable kept in its place
+
+        Examples
+        --------
+        >>> columns, dropped = prune_correlated(df, threshold=0.95)
+        >>> model.fit(df[columns])
+    """
+    df = load_frame(df, kinds=("numeric",))
+    if not isinstance(df, pd.core.frame.DataFrame):
+        raise TypeError("df should be of type 'pandas.core.frame.DataFrame'")
+
+    if not isinstance(threshold, (int, float)) or isinstance(threshold, bool) or not 0 < threshold <= 1:
+        raise TypeError("threshold should be a number between 0 and 1.")
+
+    if not isinstance(block_size, int) or block_size < 1:
+        raise TypeError("block_size should be a positive 'int'.")
+
+    cache = resolve_context(context).view(df)
+    with span("prune_correlated.correlation", len(df), len(cache.numeric_columns())):
+        corr_matrix = cache.corr(method=method)
+    corr = corr_matrix.to_numpy()
+    p = corr.shape[0]
+
+    # union-find over the variables, each root being its cluster's
+    # representative
+    parent = np.arange(p)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # variables with more non-missing values come first
+    priority = np.empty(p, dtype=np.intp)
+    priority[np.lexsort((np.arange(p), -df[corr_matrix.columns].count().to_numpy()))] = np.arange(p)
+
+    with span("prune_correlated.clusters", p, p):
+        for start in range(0, p - 1, block_size):
+            block = corr[start:start + block_size]
+            rows, cols = np.nonzero(np.abs(block) >= threshold)
+            rows += start
+            # only the strict upper triangle; NaN's compare False
+            upper = cols > rows
+            for i, j in zip(rows[upper], cols[upper]):
+                a, b = find(i), find(j)
+                if a != b:
+                    if priority[b] < priority[a]:
+                        a, b = b, a
+                    parent[b] = a
+
+    dropped = {
+        corr_matrix.columns[i]: corr_matrix.columns[find(i)]
+        for i in range(p) if find(i) != i
+    }
+    return [col for col in df.columns if col not in dropped], dropped
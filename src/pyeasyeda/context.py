@@ -0,0 +1,382 @@
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import pyeasyeda
+from pyeasyeda.categorical import profile_categoricals
+from pyeasyeda.correlation import METHODS, correlation_matrix, rank_correlation_matrix, sampled_correlation
+from pyeasyeda.disk_cache import DiskCache
+from pyeasyeda.dtypes import categorical_columns, numeric_columns
+
+
+class AnalysisContext:
+    """Cache of the intermediate results shared by the pyeasyeda functions.
+
+    When the same dataframe goes through clean_up, summary_suggestions,
+    close_up and birds_eye_view, each function otherwise splits the
+    variables by type and computes the correlation matrix from scratch.
+    Passing one context to all of them computes each result once.
+
+    Results are cached per dataframe, keyed on the object's identity plus
+    a fingerprint of its content, so a frame modified in place is not
+    served stale results. The least recently used frames are evicted once
+    more than `maxsize` frames are cached.
+
+    With a disk cache, the correlation matrices, summaries, value counts,
+    outlier reports and distributions are also persisted, so other
+    processes working on the same data reuse them. A persisted result is
+    keyed by the function parameters and the content fingerprints of the
+    columns it was computed from, so changing one column only invalidates
+    the results that depend on it.
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of dataframes with cached results, defaults to 8.
+        0 disables caching.
+    verify : bool
+        fingerprint the content of the frame on every lookup so in-place
+        modifications are detected, defaults to True. With False the frame's
+        identity alone is trusted, which makes lookups free but requires
+        calling invalidate after modifying a frame.
+    disk_cache : DiskCache, str or os.PathLike, optional
+        persistent cache shared across processes, or the directory of one,
+        defaults to None. Without a context the functions use the directory
+        in the PYEASYEDA_CACHE_DIR environment variable, if it is set.
+
+    Attributes
+    ----------
+    hits, misses : int
+        lookups served from and not found in memory; the disk cache counts
+        its own
+
+    Examples
+    --------
+    >>> context = AnalysisContext()
+    >>> summary_suggestions(df, context=context)
+    >>> birds_eye_view(df, context=context)
+    >>> close_up(df, n=4, context=context)
+    >>> context.hits, context.misses
+
+    >>> context = AnalysisContext(disk_cache="/data/cache/pyeasyeda")
+    >>> summary_suggestions(df, context=context)
+    >>> context.disk_cache.stats()
+    """
+
+    def __init__(self, maxsize=8, verify=True, disk_cache=None):
+        if type(maxsize) != int or maxsize < 0:
+            raise TypeError("maxsize must be a non-negative integer.")
+        if type(verify) != bool:
+            raise TypeError("verify must be True or False.")
+        if disk_cache is not None and not isinstance(disk_cache, DiskCache):
+            if not isinstance(disk_cache, (str, os.PathLike)):
+                raise TypeError("disk_cache must be a DiskCache object or a directory.")
+            disk_cache = DiskCache(disk_cache)
+        self.maxsize = maxsize
+        self.verify = verify
+        self.disk_cache = disk_cache
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # the functions may share a context across threads
+        self._lock = threading.Lock()
+        self._computing = {}
+
+    def view(self, df):
+        """Returns the cache of a single dataframe.
+
+        The frame is looked up (and fingerprinted) once; the returned view
+        then serves every result of that frame without hashing it again,
+        so a function asks for a view at its start and uses it throughout.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            dataframe the results belong to
+
+        Returns
+        -------
+        view : FrameCache
+        """
+        if self.maxsize == 0:
+            return FrameCache(self, df, None)
+        return FrameCache(self, df, *self._results(df))
+
+    def get(self, df, key, compute):
+        """Returns the cached result `key` for df, computing it on a miss.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            dataframe the result belongs to
+        key : hashable
+            name of the result, including any parameters it depends on
+        compute : callable
+            function of no arguments returning the result
+
+        Returns
+        -------
+        result
+            cached or freshly computed result
+        """
+        return self.view(df).get(key, compute)
+
+    def _results(self, df):
+        ident = id(df)
+        columns = column_fingerprints(df) if self.verify else None
+        signature = _combine(columns, df) if self.verify else None
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is not None and entry["ref"]() is df and entry["signature"] == signature:
+                self._entries.move_to_end(ident)
+                return entry["results"], columns
+
+            entry = self._entries[ident] = {
+                "ref": weakref.ref(df),
+                "signature": signature,
+                "results": {},
+            }
+            self._entries.move_to_end(ident)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return entry["results"], columns
+
+    def invalidate(self, df=None):
+        """Drops the cached results of df, or of every frame if df is None."""
+        with self._lock:
+            if df is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(id(df), None)
+
+
+class FrameCache:
+    """Cached results of one dataframe, returned by AnalysisContext.view."""
+
+    def __init__(self, context, df, results, fingerprints=None):
+        self.context = context
+        self.df = df
+        self._results = results
+        self._fingerprints = dict(fingerprints or {})
+
+    def get(self, key, compute, columns=None):
+        """Returns the cached result `key`, computing it on a miss.
+
+        Parameters
+        ----------
+        key : hashable
+            name of the result, including any parameters it depends on
+        compute : callable
+            function of no arguments returning the result
+        columns : list, optional
+            variables the result is computed from. When given, the result is
+            also looked up in and written to the context's disk cache.
+        """
+        results = self._results
+        if results is None:
+            return self._load(key, compute, columns)
+
+        # a result being computed by another thread is waited for rather
+        # than computed twice
+        context = self.context
+        while True:
+            with context._lock:
+                if key in results:
+                    context.hits += 1
+                    return results[key]
+                computing = context._computing.get((id(results), key))
+                if computing is None:
+                    computing = context._computing[(id(results), key)] = threading.Event()
+                    context.misses += 1
+                    break
+            computing.wait()
+
+        try:
+            results[key] = value = self._load(key, compute, columns)
+        finally:
+            with context._lock:
+                del context._computing[(id(results), key)]
+            computing.set()
+        return value
+
+    def _load(self, key, compute, columns):
+        """Reads a result from the disk cache, or computes (and stores) it."""
+        disk = self.context.disk_cache if columns is not None else None
+        if disk is None:
+            return compute()
+        disk_key = self.disk_key(key, columns)
+        value = disk.get(disk_key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            disk.set(disk_key, value)
+        return value
+
+    def disk_key(self, key, columns):
+        """Key of a result in the disk cache: a hash of the package version,
+        the result's name and parameters and the fingerprints of the
+        columns it depends on."""
+        missing = [col for col in columns if col not in self._fingerprints]
+        if missing:
+            self._fingerprints.update(column_fingerprints(self.df, missing))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((pyeasyeda.__version__, key)).encode())
+        for col in columns:
+            digest.update(self._fingerprints[col].encode())
+        return digest.hexdigest()
+
+    def numeric_columns(self):
+        """Names of the numeric variables."""
+        return self.get("numeric_columns", lambda: numeric_columns(self.df))
+
+    def categorical_columns(self):
+        """Names of the categorical variables."""
+        return self.get("categorical_columns", lambda: categorical_columns(self.df))
+
+    def corr(self, columns=None, method="pearson"):
+        """Correlation matrix of the given (default: numeric) variables.
+
+        Pearson correlations come from the blocked engine in
+        pyeasyeda.correlation, rank correlations from
+        rank_correlation_matrix, which ranks each variable once.
+
+        Parameters
+        ----------
+        columns : list, optional
+            variables to correlate, defaults to the numeric variables
+        method : str
+            "pearson", "spearman" or "kendall", defaults to "pearson"
+
+        Returns
+        -------
+        corr_matrix : pandas.DataFrame
+        """
+        if method not in METHODS:
+            raise ValueError("method must be 'pearson', 'spearman' or 'kendall'.")
+        if columns is None:
+            columns = self.numeric_columns()
+        columns = list(columns)
+
+        def compute():
+            if method == "pearson":
+                return correlation_matrix(self.df, columns)
+            return rank_correlation_matrix(self.df, columns, method=method)
+
+        return self.get(("corr", method, tuple(columns)), compute, columns=columns)
+
+    def corr_sample(self, columns=None, method="pearson", sample=100_000, confidence=0.95):
+        """Correlation matrix estimated from a sample of the rows, with the
+        bounds of its confidence intervals (see
+        pyeasyeda.correlation.sampled_correlation).
+
+        Returns
+        -------
+        corr_matrix, lower, upper : pandas.DataFrame
+        """
+        if columns is None:
+            columns = self.numeric_columns()
+        columns = list(columns)
+        return self.get(
+            ("corr_sample", method, sample, confidence, tuple(columns)),
+            lambda: sampled_correlation(self.df, columns, method=method, sample=sample,
+                                        confidence=confidence),
+            columns=columns,
+        )
+
+    def describe(self, kind="numeric"):
+        """Summary statistics (DataFrame.describe) of the numeric or
+        categorical variables."""
+        if kind == "numeric":
+            columns = self.numeric_columns()
+        elif kind == "categorical":
+            columns = self.categorical_columns()
+        else:
+            raise ValueError("kind must be 'numeric' or 'categorical'.")
+        return self.get(("describe", kind), lambda: self.df[columns].describe(), columns=columns)
+
+    def categorical_profile(self, max_unique=None):
+        """Value counts of the categorical variables (see
+        pyeasyeda.categorical.profile_categoricals).
+
+        A profile without a cap also answers capped requests, so once
+        summary_suggestions has counted every value, birds_eye_view draws its
+        bar charts without scanning the frame again.
+        """
+        results = self._results
+        if max_unique is not None and results is not None and ("categorical_profile", None) in results:
+            max_unique = None
+        columns = self.categorical_columns()
+        return self.get(
+            ("categorical_profile", max_unique),
+            lambda: profile_categoricals(self.df, columns, max_unique=max_unique),
+            columns=columns,
+        )
+
+
+def resolve_context(context):
+    """Returns context or, if it is None, a context that caches nothing,
+    except on disk when the PYEASYEDA_CACHE_DIR environment variable names
+    a directory."""
+    if context is None:
+        directory = os.environ.get("PYEASYEDA_CACHE_DIR")
+        if not directory:
+            return _NO_CACHE
+        if directory not in _DISK_ONLY:
+            _DISK_ONLY[directory] = AnalysisContext(maxsize=0, disk_cache=directory)
+        return _DISK_ONLY[directory]
+    if not isinstance(context, AnalysisContext):
+        raise TypeError("context must be an AnalysisContext object.")
+    return context
+
+
+def column_fingerprints(df, columns=None):
+    """Returns a content hash for each column of a dataframe.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        dataframe to fingerprint
+    columns : list, optional
+        columns to hash, defaults to every column
+
+    Returns
+    -------
+    fingerprints : dict
+        hex digest for each column, covering its name, dtype and values
+    """
+    fingerprints = {}
+    for col in df.columns if columns is None else columns:
+        column = df[col]
+        digest = hashlib.sha1(repr((col, str(column.dtype), len(column))).encode())
+        if isinstance(column.dtype, np.dtype) and column.dtype != np.object_:
+            # the raw buffer of a numpy column is hashed as is, without the
+            # per-value pass of hash_pandas_object
+            digest.update(np.ascontiguousarray(column.to_numpy()).view(np.uint8))
+        else:
+            digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+        fingerprints[col] = digest.hexdigest()
+    return fingerprints
+
+
+def fingerprint(df):
+    """Returns a content hash of a whole dataframe, index included."""
+    return _combine(column_fingerprints(df), df)
+
+
+def _combine(fingerprints, df):
+    """Hash of a frame from the fingerprints of its columns and its index."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in fingerprints.values():
+        digest.update(value.encode())
+    digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+_MISSING = object()
+_NO_CACHE = AnalysisContext(maxsize=0)
+# disk-only contexts of the PYEASYEDA_CACHE_DIR directories
+_DISK_ONLY = {}
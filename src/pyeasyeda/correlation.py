@@ -0,0 +1,490 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from pyeasyeda.dtypes import numeric_columns
+from pyeasyeda.moments import RunningMoments
+
+METHODS = ("pearson", "spearman", "kendall")
+
+# standard errors of Fisher's z-transform of each coefficient over c rows:
+# 1 / sqrt(c - 3) for Pearson, Fieller et al.'s approximations for the
+# rank correlations
+_FISHER_SE = {
+    "pearson": (1.0, 3),
+    "spearman": (1.06, 3),
+    "kendall": (0.437, 4),
+}
+
+
+def correlation_matrix(data, columns=None, block_size=256, chunk_rows=16384, n_jobs=1):
+    """Computes the Pearson correlation matrix as blocked matrix products.
+
+    Gives the same result as DataFrame.corr() (pairwise complete
+    observations, NaN for constant variables) up to floating point
+    rounding. The variables are split into blocks of `block_size` columns
+    and every pair of blocks is one task: its rows are read `chunk_rows` at
+    a time, standardized with means and standard deviations computed once
+    up front and multiplied together with BLAS. Blocks without NaN's take
+    this fast path; blocks with NaN's accumulate pairwise-complete sums
+    through masked products instead.
+
+    The input keeps its own dtype: float32 or memory-mapped arrays are
+    only converted to float64 one chunk of one block at a time.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or numpy.ndarray
+        dataframe, or 2D array (including numpy.memmap) with one column per
+        variable
+    columns : list, optional
+        variables to correlate, defaults to the numeric variables of a
+        dataframe or all columns of an array
+    block_size : int
+        number of variables per block, defaults to 256
+    chunk_rows : int
+        number of rows standardized at a time, defaults to 16384
+    n_jobs : int
+        number of threads the block pairs are spread over, defaults to 1.
+        Numpy releases the GIL in the products, so more threads help when
+        the BLAS library is single-threaded; otherwise BLAS already uses
+        every core.
+
+    Returns
+    -------
+    corr_matrix : pandas.DataFrame
+        correlation matrix indexed by the variable names
+
+    Examples
+    --------
+    >>> correlation_matrix(df, n_jobs=4)
+    """
+    for name, value in [("block_size", block_size), ("chunk_rows", chunk_rows), ("n_jobs", n_jobs)]:
+        if type(value) != int or value < 1:
+            raise TypeError(f"{name} must be a positive integer.")
+
+    values, positions, names = _as_array(data, columns)
+    n, p = values.shape[0], len(positions)
+
+    # Means, standard deviations and NaN counts of every variable
+    count, mean, std = np.zeros(p), np.zeros(p), np.zeros(p)
+    for start in range(0, p, block_size):
+        block = np.arange(start, min(start + block_size, p))
+        moments = RunningMoments(block)
+        for row in range(0, n, chunk_rows):
+            moments.update(values[row:row + chunk_rows][:, positions[block]])
+        count[block], mean[block], std[block] = moments.count, moments.mean, moments.std()
+    complete = count == n
+
+    # Blocks of output positions; grouping the variables without NaN's
+    # together keeps as many blocks as possible on the fast path
+    order = np.argsort(~complete, kind="stable")
+    blocks = [order[start:start + block_size] for start in range(0, p, block_size)]
+    tasks = [(a, b) for i, a in enumerate(blocks) for b in blocks[i:]]
+
+    def tile(task):
+        a, b = task
+        if complete[a].all() and complete[b].all():
+            return _tile_complete(values, positions, a, b, mean, std, chunk_rows)
+        return _tile_pairwise(values, positions, a, b, mean, chunk_rows)
+
+    if n_jobs == 1 or len(tasks) == 1:
+        tiles = map(tile, tasks)
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(n_jobs, len(tasks), os.cpu_count() or 1))
+        with executor:
+            tiles = list(executor.map(tile, tasks))
+
+    corr = np.empty((p, p))
+    for (a, b), result in zip(tasks, tiles):
+        corr[np.ix_(a, b)] = result
+        corr[np.ix_(b, a)] = result.T
+
+    # a variable correlates perfectly with itself unless it is constant
+    diagonal = (count >= 2) & (std > 0)
+    corr[np.diag_indices(p)] = np.where(diagonal, 1.0, np.nan)
+    np.clip(corr, -1, 1, out=corr)
+    return pd.DataFrame(corr, index=names, columns=names)
+
+
+def rank_correlation_matrix(data, columns=None, method="spearman", block_size=256,
+                            chunk_rows=16384, n_jobs=1):
+    """Computes the Spearman or Kendall rank correlation matrix.
+
+    Gives the same result as DataFrame.corr(method=...) (pairwise complete
+    observations, ties given their average rank, Kendall's tau-b) up to
+    floating point rounding, but each variable is sorted and ranked only
+    once instead of once per pair:
+
+    - Spearman's rho is the Pearson correlation of the ranks, computed for
+      every pair at once by correlation_matrix. Pairs whose NaN's differ
+      are ranked again over their complete rows, as a rank depends on the
+      rows it is taken over.
+    - Kendall's tau is counted with Knight's O(n log n) algorithm: the
+      rows are sorted by the ranks of the first variable and the discordant
+      pairs are the inversions a merge sort of the second variable's ranks
+      counts. A variable is paired with a block of others in one pass of
+      array operations. Ranks keep their order on any subset of rows, so
+      pairs with NaN's reuse them too.
+
+    Unlike DataFrame.corr, the Kendall diagonal is NaN for a constant
+    variable, as with the other methods.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or numpy.ndarray
+        dataframe, or 2D array (including numpy.memmap) with one column per
+        variable
+    columns : list, optional
+        variables to correlate, defaults to the numeric variables of a
+        dataframe or all columns of an array
+    method : str
+        "spearman" or "kendall", defaults to "spearman"
+    block_size : int
+        number of variables per block, defaults to 256
+    chunk_rows : int
+        number of rows standardized at a time, defaults to 16384
+    n_jobs : int
+        number of threads the blocks are spread over, defaults to 1
+
+    Returns
+    -------
+    corr_matrix : pandas.DataFrame
+        correlation matrix indexed by the variable names
+
+    Examples
+    --------
+    >>> rank_correlation_matrix(df, method="kendall", n_jobs=4)
+    """
+    if method not in ("spearman", "kendall"):
+        raise ValueError("method must be 'spearman' or 'kendall'.")
+    for name, value in [("block_size", block_size), ("chunk_rows", chunk_rows), ("n_jobs", n_jobs)]:
+        if type(value) != int or value < 1:
+            raise TypeError(f"{name} must be a positive integer.")
+
+    values, positions, names = _as_array(data, columns)
+    n, p = values.shape[0], len(positions)
+
+    # dense ranks (0, 1, ... in sorted order, equal values sharing one) and
+    # average ranks of every variable, over its non-NaN rows; one row per
+    # variable, so the ranks of a variable are contiguous
+    valid = np.empty((p, n), dtype=np.bool_)
+    dense = np.zeros((p, n), dtype=np.int64)
+    average = np.full((n, p), np.nan)
+    for j, position in enumerate(positions):
+        column = np.asarray(values[:, position], dtype=np.float64)
+        valid[j] = ~np.isnan(column)
+        dense[j, valid[j]], average[valid[j], j] = _ranks(column[valid[j]])
+    complete = valid.all(axis=1)
+
+    if method == "spearman":
+        corr = correlation_matrix(average, block_size=block_size, chunk_rows=chunk_rows,
+                                  n_jobs=n_jobs).to_numpy()
+        # pairs whose rows differ from the rows the variables were ranked over
+        tasks = [
+            (i, j) for i in range(p) for j in range(i + 1, p)
+            if not (complete[i] and complete[j]) and not np.array_equal(valid[i], valid[j])
+        ]
+
+        def pair(task):
+            i, j = task
+            rows = valid[i] & valid[j]
+            return _pearson(_ranks(dense[i, rows])[1], _ranks(dense[j, rows])[1])
+    else:
+        corr = np.empty((p, p))
+        # a complete variable is paired with blocks of the complete variables
+        # after it, as large as a block of the Spearman products
+        width = max(1, block_size * chunk_rows // max(n, 1))
+        tasks = []
+        for i in np.flatnonzero(complete):
+            others = np.flatnonzero(complete[i + 1:]) + i + 1
+            tasks += [(i, others[start:start + width]) for start in range(0, len(others), width)]
+        tasks += [
+            (i, np.array([j])) for i in range(p) for j in range(i + 1, p)
+            if not (complete[i] and complete[j])
+        ]
+
+        def pair(task):
+            i, others = task
+            if complete[i] and complete[others[0]]:
+                return _kendall_taus(dense[i], dense[others])
+            rows = valid[i] & valid[others[0]]
+            return _kendall_taus(dense[i, rows], dense[others][:, rows])
+
+    if n_jobs == 1 or len(tasks) <= 1:
+        coefficients = list(map(pair, tasks))
+    else:
+        with ThreadPoolExecutor(max_workers=min(n_jobs, len(tasks), os.cpu_count() or 1)) as executor:
+            coefficients = list(executor.map(pair, tasks))
+    for (i, j), coefficient in zip(tasks, coefficients):
+        corr[i, j] = corr[j, i] = coefficient
+
+    # a variable correlates perfectly with itself unless it is constant
+    counts = valid.sum(axis=1)
+    varies = dense.max(axis=1, initial=0) > 0
+    corr[np.diag_indices(p)] = np.where((counts >= 2) & varies, 1.0, np.nan)
+    np.clip(corr, -1, 1, out=corr)
+    return pd.DataFrame(corr, index=names, columns=names)
+
+
+def sampled_correlation(data, columns=None, method="pearson", sample=100_000, confidence=0.95,
+                        random_state=0):
+    """Estimates a correlation matrix from a sample of the rows, with
+    confidence intervals.
+
+    Above `sample` rows, the coefficients are computed on a reproducible
+    random sample of that many rows, which bounds the cost of the rank
+    correlations on very long data. The intervals come from Fisher's
+    z-transform of each coefficient, with the standard error of its method
+    over the pair's complete sampled rows.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or numpy.ndarray
+        dataframe, or 2D array (including numpy.memmap) with one column per
+        variable; only the sampled rows of an array are read
+    columns : list, optional
+        variables to correlate, defaults to the numeric variables of a
+        dataframe or all columns of an array
+    method : str
+        "pearson", "spearman" or "kendall", defaults to "pearson"
+    sample : int
+        maximum number of rows used, defaults to 100,000
+    confidence : float
+        confidence level of the intervals, defaults to 0.95
+    random_state : int
+        seed of the row sample, defaults to 0
+
+    Returns
+    -------
+    corr_matrix, lower, upper : pandas.DataFrame
+        estimated correlations and the bounds of their confidence
+        intervals (NaN where a pair has too few complete rows)
+
+    Examples
+    --------
+    >>> corr, lower, upper = sampled_correlation(df, method="spearman", sample=50_000)
+    """
+    if method not in METHODS:
+        raise ValueError("method must be 'pearson', 'spearman' or 'kendall'.")
+    if type(sample) != int or sample < 1:
+        raise TypeError("sample must be a positive integer.")
+    if not isinstance(confidence, float) or not 0 < confidence < 1:
+        raise TypeError("confidence must be a float between 0 and 1.")
+
+    values, positions, names = _as_array(data, columns)
+    n = values.shape[0]
+    if n > sample:
+        rows = np.sort(np.random.default_rng(random_state).choice(n, sample, replace=False))
+        values = values[rows]
+    values = np.asarray(values[:, positions], dtype=np.float64)
+
+    if method == "pearson":
+        corr = correlation_matrix(values)
+    else:
+        corr = rank_correlation_matrix(values, method=method)
+    corr.index, corr.columns = names, names
+
+    valid = (~np.isnan(values)).astype(np.float64)
+    count = valid.T @ valid
+    scale, offset = _FISHER_SE[method]
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        se = np.sqrt(scale / (count - offset))
+        se[count <= offset] = np.nan
+        center = np.arctanh(corr.to_numpy())
+        lower = np.tanh(center - z * se)
+        upper = np.tanh(center + z * se)
+    return (
+        corr,
+        pd.DataFrame(lower, index=names, columns=names),
+        pd.DataFrame(upper, index=names, columns=names),
+    )
+
+
+def _ranks(x):
+    """Dense ranks (0, 1, ...) and average ranks (from 1, ties sharing the
+    mean of their positions) of a 1D array without NaN's."""
+    order = np.argsort(x, kind="stable")
+    ordered = x[order]
+    first = np.empty(len(x), dtype=np.bool_)
+    first[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=first[1:])
+    group = np.cumsum(first) - 1
+    starts = np.flatnonzero(first)
+    ends = np.append(starts[1:], len(x))
+    dense = np.empty(len(x), dtype=np.int64)
+    dense[order] = group
+    return dense, ((starts + ends + 1) / 2)[dense]
+
+
+def _pearson(x, y):
+    """Pearson correlation of two complete 1D arrays."""
+    if len(x) < 2:
+        return np.nan
+    x = x - x.mean()
+    y = y - y.mean()
+    denominator = np.sqrt((x @ x) * (y @ y))
+    return float(x @ y / denominator) if denominator > 0 else np.nan
+
+
+def _tied_pairs(ordered):
+    """Number of pairs of equal values in each row of a sorted array."""
+    index = np.arange(ordered.shape[-1])
+    first = np.ones(ordered.shape, dtype=np.bool_)
+    np.not_equal(ordered[..., 1:], ordered[..., :-1], out=first[..., 1:])
+    # each value is tied with the values of its run before it
+    start = np.maximum.accumulate(np.where(first, index, 0), axis=-1)
+    return (index - start).sum(axis=-1)
+
+
+def _kendall_taus(x, ys):
+    """Kendall's tau-b of an array of dense ranks with each row of a 2D
+    array of dense ranks, in O(n log n) per row."""
+    n = len(x)
+    if n < 2:
+        return np.full(len(ys), np.nan)
+    order = np.argsort(x, kind="stable")
+    x = x[order]
+    span = int(ys.max()) + 1
+    # rows sorted by x, then by y among equal x's
+    # np.take keeps the rows contiguous, where ys[:, order] would not
+    keys = x * span + np.take(ys, order, axis=-1)
+    keys.sort(axis=-1)
+    ys = keys - x * span
+    pairs = n * (n - 1) // 2
+    tied_x = _tied_pairs(x)
+    tied_y = _tied_pairs(np.sort(ys, axis=-1))
+    tied_xy = _tied_pairs(keys)
+    discordant = _count_inversions(ys)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (pairs - tied_x - tied_y + tied_xy - 2 * discordant) / np.sqrt(
+            float(pairs - tied_x) * (pairs - tied_y).astype(np.float64)
+        )
+
+
+def _count_inversions(ys):
+    """Number of pairs i < j with y[i] > y[j] in each row, by a bottom-up
+    merge sort.
+
+    Each level merges runs of `width` sorted values pairwise, in every row
+    at once: the values are offset by their run's index and tagged with
+    the half they come from in the lowest bit, so one sort merges all the
+    runs. A right value at sorted position k, the r-th right value of the
+    row, follows k - r left values, and subtracting these from the left
+    values of all runs up to its own gives the left values greater than it.
+    """
+    n = ys.shape[-1]
+    inversions = np.zeros(len(ys), dtype=np.int64)
+    if n < 2:
+        return inversions
+    span = int(ys.max()) + 1
+    index = np.arange(n)
+    width = 1
+    while width < n:
+        run = index // (2 * width)
+        right = index // width % 2
+        # 32-bit keys halve the memory traffic once the runs are long enough
+        dtype = np.int32 if (int(run[-1]) + 1) * span * 2 < 2 ** 31 else np.int64
+        offset = (run * span).astype(dtype)
+        keys = ys.astype(dtype) + offset
+        keys <<= 1
+        keys |= right.astype(dtype)
+        # equal keys are equal values, so the sort need not be stable
+        keys.sort(axis=-1)
+        rights = int(right.sum())
+        preceding = int(((run + 1) * width * right).sum())
+        following = (keys & 1).astype(np.int64) @ index - rights * (rights - 1) // 2
+        inversions += preceding - following
+        keys >>= 1
+        keys -= offset
+        ys = keys
+        width *= 2
+    return inversions
+
+
+def _as_array(data, columns):
+    """Returns a 2D array of the data, the positions of the variables in
+    its columns and the variable names.
+
+    Arrays are used as they are (never copied); a dataframe is converted
+    once, keeping float32 as float32.
+    """
+    if isinstance(data, pd.DataFrame):
+        names = numeric_columns(data) if columns is None else list(columns)
+        frame = data[names]
+        # nullable extension dtypes (e.g. Int16) are read as float64
+        dtypes = [dtype if isinstance(dtype, np.dtype) else np.float64 for dtype in frame.dtypes]
+        dtype = np.result_type(*dtypes) if names else np.float64
+        if dtype.kind != "f":
+            dtype = np.float64
+        values = frame.to_numpy(dtype=dtype, na_value=np.nan)
+        return values, np.arange(len(names)), pd.Index(names)
+    if isinstance(data, np.ndarray):
+        if data.ndim != 2:
+            raise ValueError("data must be a 2D array.")
+        positions = np.arange(data.shape[1]) if columns is None else np.asarray(columns, dtype=np.intp)
+        return data, positions, pd.Index(positions)
+    raise TypeError("data must be a pandas.DataFrame or a 2D numpy.ndarray.")
+
+
+def _tile_complete(values, positions, a, b, mean, std, chunk_rows):
+    """Correlations between two blocks without NaN's."""
+    n = values.shape[0]
+    total = np.zeros((len(a), len(b)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start in range(0, n, chunk_rows):
+            chunk = values[start:start + chunk_rows]
+            za = (chunk[:, positions[a]].astype(np.float64) - mean[a]) / std[a]
+            zb = za if a is b else (chunk[:, positions[b]].astype(np.float64) - mean[b]) / std[b]
+            total += za.T @ zb
+        return total / n
+
+
+def _tile_pairwise(values, positions, a, b, mean, chunk_rows):
+    """Correlations between two blocks over pairwise complete rows."""
+    return _pairwise_corr(*_pairwise_sums(values, positions, a, b, mean, chunk_rows))
+
+
+def _pairwise_sums(values, positions, a, b, mean, chunk_rows):
+    """Pairwise complete counts and sums of two blocks.
+
+    Values are shifted by their variable's mean before the sums are
+    accumulated, which keeps the cancellation in the variance small. The
+    sums of different row ranges add up, so partitions of the rows can be
+    summed separately (with the same means) and combined.
+    """
+    n = values.shape[0]
+    shape = (len(a), len(b))
+    count, sum_a, sum_b, sum_ab, sum_aa, sum_bb = (np.zeros(shape) for _ in range(6))
+    for start in range(0, n, chunk_rows):
+        chunk = values[start:start + chunk_rows]
+        xa = chunk[:, positions[a]].astype(np.float64) - mean[a]
+        xb = chunk[:, positions[b]].astype(np.float64) - mean[b]
+        ma, mb = ~np.isnan(xa), ~np.isnan(xb)
+        xa[~ma] = 0
+        xb[~mb] = 0
+        ma, mb = ma.astype(np.float64), mb.astype(np.float64)
+        count += ma.T @ mb
+        sum_a += xa.T @ mb
+        sum_b += ma.T @ xb
+        sum_ab += xa.T @ xb
+        sum_aa += (xa * xa).T @ mb
+        sum_bb += ma.T @ (xb * xb)
+    return count, sum_a, sum_b, sum_ab, sum_aa, sum_bb
+
+
+def _pairwise_corr(count, sum_a, sum_b, sum_ab, sum_aa, sum_bb):
+    """Correlations from the sums of _pairwise_sums."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sum_ab - sum_a * sum_b / count
+        var_a = sum_aa - sum_a * sum_a / count
+        var_b = sum_bb - sum_b * sum_b / count
+        corr = cov / np.sqrt(var_a * var_b)
+    # pairs with fewer than 2 rows or a constant variable have no correlation
+    constant = (var_a <= 1e-13 * sum_aa) | (var_b <= 1e-13 * sum_bb)
+    corr[(count < 2) | constant] = np.nan
+    return corr
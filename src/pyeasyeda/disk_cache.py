@@ -0,0 +1,154 @@
+import os
+import pickle
+import tempfile
+
+
+class DiskCache:
+    """Persistent cache of analysis results in a local directory.
+
+    Each result is pickled to its own file, named by its key, so separate
+    processes (e.g. scheduled jobs over the same snapshot) share the
+    results: a value is written to a temporary file and renamed into place,
+    so readers never see a partial file. Once the files take more than
+    `max_bytes`, the least recently used ones (by modification time, which
+    a hit refreshes) are deleted.
+
+    Results are stored with pickle, which handles the dataframes, arrays
+    and report objects the functions cache alike; only point the cache at
+    a directory you trust.
+
+    Parameters
+    ----------
+    directory : str or os.PathLike
+        directory holding the cached files, created if missing
+    max_bytes : int
+        size cap of the cache, defaults to 1 GiB
+
+    Attributes
+    ----------
+    hits, misses, writes, evictions : int
+        lookups served from disk, lookups not found, results written and
+        files deleted to respect the size cap, in this process
+
+    Examples
+    --------
+    >>> context = AnalysisContext(disk_cache=DiskCache("~/.cache/pyeasyeda/results"))
+    >>> summary_suggestions(df, context=context)
+    >>> context.disk_cache.stats()
+    """
+
+    def __init__(self, directory, max_bytes=2 ** 30):
+        if type(max_bytes) != int or max_bytes < 0:
+            raise TypeError("max_bytes must be a non-negative integer.")
+        self.directory = os.path.expanduser(os.fspath(directory))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def get(self, key, default=None):
+        """Returns the result stored under key, or default if there is none.
+
+        Parameters
+        ----------
+        key : str
+            hex digest identifying the result
+        default : optional
+            value returned on a miss, defaults to None
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # written by an incompatible version, or damaged
+            self._remove(path)
+            self.misses += 1
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Stores a result under key, then evicts the least recently used
+        results beyond the size cap.
+
+        Parameters
+        ----------
+        key : str
+            hex digest identifying the result
+        value
+            picklable result
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, partial = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, path)
+        except BaseException:
+            self._remove(partial)
+            raise
+        self.writes += 1
+        self._evict()
+
+    def _entries(self):
+        """(modification time, size, path) of every cached file."""
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            self.evictions += 1
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Deletes every cached result."""
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def stats(self):
+        """Returns the hit/miss counts of this process and the current
+        number of cached results and their total size in bytes."""
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
@@ -0,0 +1,207 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from pyeasyeda.profiling import profiled
+from pyeasyeda.report import load_profile
+
+# floor on the share of a bin, so empty bins do not make the PSI infinite
+_PSI_EPSILON = 1e-4
+
+
+@profiled("compare_profiles")
+def compare_profiles(old, new, bins=10, threshold=0.2):
+    """Measures the drift between two snapshots from their stored profiles.
+
+    Only the profiles from build_profile are read, not the data: each
+    numeric variable's distribution is rebuilt from its percentiles (or
+    its histograms when a profile predates them) as a piecewise linear CDF.
+
+    - psi: population stability index, over `bins` bins at the quantiles
+      of the old snapshot for numeric variables and over the top values
+      for categorical ones; values above 0.2 are usually read as a
+      significant shift
+    - ks: approximate Kolmogorov-Smirnov statistic, the largest gap
+      between the two CDFs at their breakpoints
+    - mean_shift: change of the mean, and std_shift the same change in
+      old standard deviations
+    - null_rate_shift: change of the proportion of missing values
+    - new_categories and vanished_categories: values found in only one
+      snapshot, listed only when the other snapshot's top values are
+      complete (None otherwise)
+
+    Parameters
+    ----------
+    old : dict, str or os.PathLike
+        profile of the reference snapshot, or the path of its JSON file
+    new : dict, str or os.PathLike
+        profile of the snapshot to compare
+    bins : int
+        number of quantile bins of the numeric PSI, defaults to 10
+    threshold : float
+        PSI from which a variable is flagged as drifted, defaults to 0.2
+
+    Returns
+    -------
+    drift : pandas.DataFrame
+        one row per variable; "status" is "common", "added", "removed" or
+        "retyped" (numeric in one snapshot, categorical in the other), and
+        "drift" flags the variables whose PSI reaches the threshold or
+        whose status is not "common"
+
+    Examples
+    --------
+    >>> write_profile(build_profile("2023-01/*.parquet"), "january.json")
+    >>> drift = compare_profiles("january.json", build_profile("2023-02/*.parquet"))
+    >>> drift[drift["drift"]]
+    """
+    old, new = _as_profile(old, "old"), _as_profile(new, "new")
+    if type(bins) != int or bins < 2:
+        raise TypeError("bins must be an integer of at least 2.")
+    if not isinstance(threshold, (int, float)) or threshold <= 0:
+        raise TypeError("threshold must be a positive number.")
+
+    kinds_old = _kinds(old)
+    kinds_new = _kinds(new)
+    names = list(kinds_new) + [col for col in kinds_old if col not in kinds_new]
+    rows = []
+    for col in names:
+        row = {
+            "kind": kinds_new.get(col, kinds_old.get(col)),
+            "psi": np.nan, "ks": np.nan, "mean_shift": np.nan, "std_shift": np.nan,
+            "null_rate_shift": np.nan, "new_categories": None, "vanished_categories": None,
+        }
+        if col not in kinds_old:
+            row["status"] = "added"
+        elif col not in kinds_new:
+            row["status"] = "removed"
+        elif kinds_old[col] != kinds_new[col]:
+            row["status"] = "retyped"
+        else:
+            row["status"] = "common"
+            before = old[row["kind"]][col]
+            after = new[row["kind"]][col]
+            row["null_rate_shift"] = _null_rate(after, new["rows"]) - _null_rate(before, old["rows"])
+            if row["kind"] == "numeric":
+                row.update(_numeric_drift(before, after, bins))
+            else:
+                row.update(_categorical_drift(before, after))
+        row["drift"] = row["status"] != "common" or bool(row["psi"] >= threshold)
+        rows.append(row)
+
+    columns = ["kind", "status", "psi", "ks", "mean_shift", "std_shift", "null_rate_shift",
+               "new_categories", "vanished_categories", "drift"]
+    result = pd.DataFrame(rows, index=pd.Index(names, name="variable"), columns=columns)
+    return result.astype({key: float for key in columns[2:7]})
+
+
+def _as_profile(profile, name):
+    if isinstance(profile, (str, os.PathLike)):
+        profile = load_profile(profile)
+    if not isinstance(profile, dict) or not {"rows", "numeric", "categorical"} <= set(profile):
+        raise TypeError(f"{name} must be a profile from build_profile or the path of one.")
+    return profile
+
+
+def _kinds(profile):
+    kinds = {col: "numeric" for col in profile["numeric"]}
+    kinds.update({col: "categorical" for col in profile["categorical"]})
+    return kinds
+
+
+def _null_rate(stats, rows):
+    return 1 - stats["count"] / rows if rows else np.nan
+
+
+def _numeric_drift(before, after, bins):
+    mean_shift = _float(after["mean"]) - _float(before["mean"])
+    std = _float(before["std"])
+    result = {"mean_shift": mean_shift, "std_shift": mean_shift / std if std > 0 else np.nan}
+    # both CDFs are built the same way, as they interpolate differently
+    # between the values of a discrete variable
+    percentiles = "quantiles" in before and "quantiles" in after
+    cdf_old, cdf_new = _cdf_points(before, percentiles), _cdf_points(after, percentiles)
+    if cdf_old is None or cdf_new is None:
+        return result
+
+    # the CDFs are piecewise linear, so their largest gap is found at one
+    # of their breakpoints
+    points = np.union1d(cdf_old[0], cdf_new[0])
+    result["ks"] = float(np.max(np.abs(_cdf(cdf_old, points) - _cdf(cdf_new, points))))
+
+    # bins holding equal shares of the old snapshot, cut at its breakpoints
+    # so no bin edge falls inside a stretch the profile only interpolates;
+    # tied quantiles merge
+    edges = np.unique(_breakpoints(cdf_old, np.linspace(0, 1, bins + 1)[1:-1]))
+    shares_old = np.diff(np.concatenate([[0.0], _cdf(cdf_old, edges), [1.0]]))
+    shares_new = np.diff(np.concatenate([[0.0], _cdf(cdf_new, edges), [1.0]]))
+    result["psi"] = _psi(shares_old, shares_new)
+    return result
+
+
+def _categorical_drift(before, after):
+    if before["values"] is None or after["values"] is None:
+        # approximate profiles keep no values
+        return {}
+    values_old, values_new = before["values"], after["values"]
+    result = {
+        "new_categories": None if before["truncated"] else [v for v in values_new if v not in values_old],
+        "vanished_categories": None if after["truncated"] else [v for v in values_old if v not in values_new],
+    }
+    # a value missing from one side's top values has a known share of zero
+    # only when that side is complete; the others are pooled
+    known = [v for v in values_old if v in values_new or not after["truncated"]]
+    known += [v for v in values_new if v not in values_old and not before["truncated"]]
+    shares_old = np.array([values_old.get(v, 0) for v in known], dtype=float) / max(before["count"], 1)
+    shares_new = np.array([values_new.get(v, 0) for v in known], dtype=float) / max(after["count"], 1)
+    pooled_old, pooled_new = 1 - shares_old.sum(), 1 - shares_new.sum()
+    if pooled_old > 1e-12 or pooled_new > 1e-12:
+        shares_old = np.append(shares_old, max(pooled_old, 0.0))
+        shares_new = np.append(shares_new, max(pooled_new, 0.0))
+    result["psi"] = _psi(shares_old, shares_new)
+    return result
+
+
+def _cdf_points(stats, percentiles):
+    """Breakpoints (x, F(x)) of a variable's CDF, from its percentiles or
+    from its histogram; None without values."""
+    if percentiles:
+        if stats["quantiles"][0] is None:
+            return None
+        x = np.asarray(stats["quantiles"], dtype=float)
+        return x, np.linspace(0, 1, len(x))
+    counts = np.asarray(stats["histogram"]["counts"], dtype=float)
+    if counts.sum() == 0:
+        return None
+    edges = np.asarray(stats["histogram"]["edges"], dtype=float)
+    return edges, np.concatenate([[0.0], np.cumsum(counts)]) / counts.sum()
+
+
+def _cdf(points, t):
+    """Right-continuous piecewise linear CDF through the breakpoints, so a
+    value repeated across several percentiles is a jump."""
+    x, f = points
+    i = np.searchsorted(x, t, side="right")
+    inside = (i > 0) & (i < len(x))
+    j = np.clip(i, 1, len(x) - 1)
+    x0, x1 = x[j - 1], x[j]
+    step = np.where(x1 > x0, (t - x0) / np.where(x1 > x0, x1 - x0, 1), 1)
+    value = f[j - 1] + step * (f[j] - f[j - 1])
+    return np.where(inside, value, np.where(i == 0, 0.0, 1.0))
+
+
+def _breakpoints(points, q):
+    """Breakpoints whose CDF values are the closest to the levels q."""
+    x, f = points
+    return x[np.abs(f[:, None] - q).argmin(axis=0)]
+
+
+def _psi(shares_old, shares_new):
+    shares_old = np.maximum(shares_old, _PSI_EPSILON)
+    shares_new = np.maximum(shares_new, _PSI_EPSILON)
+    return float(np.sum((shares_new - shares_old) * np.log(shares_new / shares_old)))
+
+
+def _float(value):
+    return np.nan if value is None else float(value)
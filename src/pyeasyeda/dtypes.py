@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+
+def numeric_columns(df):
+    """Returns the names of the numeric variables of a dataframe.
+
+    Same columns as df.select_dtypes(include=np.number), without copying the
+    data the way select_dtypes does.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        dataframe to examine
+
+    Returns
+    -------
+    columns : list
+        names of the numeric variables
+    """
+    return [
+        col for col, dtype in df.dtypes.items()
+        if isinstance(dtype, np.dtype) and np.issubdtype(dtype, np.number)
+        or pd.api.types.is_extension_array_dtype(dtype)
+        and pd.api.types.is_numeric_dtype(dtype)
+        and not pd.api.types.is_bool_dtype(dtype)
+    ]
+
+
+def categorical_columns(df):
+    """Returns the names of the categorical variables of a dataframe: object
+    columns, pandas string columns (including Arrow-backed strings) and
+    category columns.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        dataframe to examine
+
+    Returns
+    -------
+    columns : list
+        names of the categorical variables
+    """
+    return [
+        col for col, dtype in df.dtypes.items()
+        if dtype == np.object_ or isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype))
+    ]
+
+
+def compact_dtypes(df, category_ratio=0.5, inplace=False):
+    """Returns a dataframe with narrower dtypes, converting only where no
+    information is lost.
+
+    - text columns with at most `category_ratio` distinct values per
+      non-null value become "category"
+    - other text columns become Arrow-backed strings ("string[pyarrow]",
+      when pyarrow is installed)
+    - float64 columns become float32 when every value survives the round
+      trip, and integer columns take the smallest integer type holding
+      their range
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        dataframe to compact
+    category_ratio : float
+        largest proportion of distinct values for a text column to become a
+        category, defaults to 0.5
+    inplace : bool
+        replace the columns of df itself instead of a copy, one column at a
+        time, defaults to False
+
+    Returns
+    -------
+    df_compact : pandas.DataFrame
+        dataframe with the same values in narrower dtypes
+
+    Examples
+    --------
+    >>> df_compact = compact_dtypes(df)
+    >>> df_compact.memory_usage(deep=True).sum()
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be input as a DataFrame.")
+    if not isinstance(category_ratio, (int, float)) or not 0 <= category_ratio <= 1:
+        raise TypeError("category_ratio must be a number between 0 and 1.")
+
+    text = set(categorical_columns(df))
+    result = df if inplace else df.copy(deep=False)
+    for col, dtype in df.dtypes.items():
+        series = df[col]
+        if col in text and not isinstance(dtype, pd.CategoricalDtype):
+            if dtype == np.object_ and pd.api.types.infer_dtype(series, skipna=True) != "string":
+                continue
+            if series.nunique() <= category_ratio * series.count():
+                result[col] = series.astype("category")
+            elif dtype == np.object_ and _has_pyarrow():
+                result[col] = series.astype(pd.StringDtype("pyarrow"))
+        elif isinstance(dtype, np.dtype) and dtype.kind in "iu":
+            result[col] = pd.to_numeric(series, downcast="integer" if dtype.kind == "i" else "unsigned")
+        elif isinstance(dtype, np.dtype) and dtype == np.float64:
+            values = series.to_numpy()
+            with np.errstate(over="ignore"):
+                narrow = values.astype(np.float32)
+                if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+                    result[col] = pd.Series(narrow, index=series.index)
+    return result
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,263 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from pyeasyeda.sources import _as_arrow
+
+
+
+class MissingnessProfile:
+    """Bit-packed null bitmaps of the columns of a dataframe.
+
+    Row r of a column is missing when bit r % 8 of byte r // 8 of its
+    bitmap is set (numpy's "little" bit order, as in Arrow validity
+    buffers), so a column takes one bit per row. Null counts, co-missing
+    counts and the rows a dropna would keep are then popcounts over ANDed
+    or ORed bitmaps, without touching the data again. The bitmaps are
+    padded with zeros to whole 64-bit words, which are popcounted at once.
+
+    Attributes
+    ----------
+    columns : pandas.Index
+        names of the columns
+    n_rows : int
+        number of rows
+    bitmaps : numpy.ndarray
+        uint8 array with one packed bitmap per column, a multiple of 8
+        bytes wide
+
+    Examples
+    --------
+    >>> profile = missingness_profile(df)
+    >>> profile.null_rates().sort_values()
+    >>> profile.rows_kept(["price", "rooms"])
+    """
+
+    def __init__(self, columns, bitmaps, n_rows):
+        self.columns = pd.Index(columns)
+        self.bitmaps = bitmaps
+        self.n_rows = n_rows
+
+    def __repr__(self):
+        return f"MissingnessProfile({self.n_rows} rows, {len(self.columns)} columns)"
+
+    def _positions(self, columns):
+        if columns is None:
+            return np.arange(len(self.columns))
+        missing = [col for col in columns if col not in self.columns]
+        if missing:
+            raise KeyError(f"Columns not in the profile: {missing}")
+        return self.columns.get_indexer(columns)
+
+    def null_counts(self):
+        """Number of missing values of each column."""
+        return pd.Series(_popcount(self.bitmaps), index=self.columns)
+
+    def null_rates(self):
+        """Proportion of missing values of each column."""
+        return self.null_counts() / max(self.n_rows, 1)
+
+    def co_missing(self, columns=None, block_bytes=2 ** 24):
+        """Number of rows missing in both columns of every pair.
+
+        Parameters
+        ----------
+        columns : list, optional
+            columns to pair, defaults to all of them
+        block_bytes : int
+            size of the ANDed bitmaps held at a time, defaults to 16 MiB
+
+        Returns
+        -------
+        counts : pandas.DataFrame
+            symmetric matrix of counts, with the null counts on the diagonal
+        """
+        positions = self._positions(columns)
+        bitmaps = self.bitmaps[positions]
+        p = len(positions)
+        width = max(1, block_bytes // max(bitmaps.shape[1], 1))
+        counts = np.zeros((p, p), dtype=np.int64)
+        for i in range(p):
+            for start in range(i, p, width):
+                block = bitmaps[start:start + width] & bitmaps[i]
+                counts[i, start:start + len(block)] = _popcount(block)
+            counts[i:, i] = counts[i, i:]
+        names = self.columns[positions]
+        return pd.DataFrame(counts, index=names, columns=names)
+
+    def rows_kept(self, columns=None):
+        """Number of rows df.dropna(subset=columns) would keep.
+
+        Parameters
+        ----------
+        columns : list, optional
+            columns that must be non-missing, defaults to all of them
+        """
+        return self.n_rows - int(_popcount(self._any_missing(columns)[None])[0])
+
+    def rows_kept_without(self):
+        """Number of rows dropna would keep if each column were left out,
+        from running ORs of the bitmaps before and after it.
+
+        Returns
+        -------
+        rows : pandas.Series
+            rows kept without each column, the best candidates for removal
+            having the highest counts
+        """
+        p, width = self.bitmaps.shape
+        # before[j] and after[j]: ORs of the first and of the last j columns
+        before = np.zeros((p + 1, width), dtype=np.uint8)
+        after = np.zeros((p + 1, width), dtype=np.uint8)
+        if p:
+            np.bitwise_or.accumulate(self.bitmaps, axis=0, out=before[1:])
+            np.bitwise_or.accumulate(self.bitmaps[::-1], axis=0, out=after[1:])
+        others = before[:-1] | after[::-1][1:]
+        return pd.Series(self.n_rows - _popcount(others), index=self.columns)
+
+    def complete_rows(self, columns=None):
+        """Boolean mask of the rows without missing values in the columns
+        (defaults to all of them); clean_up.complete_rows returns the one
+        of the whole profile."""
+        bits = np.unpackbits(self._any_missing(columns), count=self.n_rows, bitorder="little")
+        return bits == 0
+
+    def _any_missing(self, columns):
+        positions = self._positions(columns)
+        if len(positions) == 0:
+            return np.zeros(self.bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[positions], axis=0)
+
+    def patterns(self, top=10, chunk_rows=2 ** 16):
+        """Most frequent patterns of missing values across the rows.
+
+        The bitmaps are transposed a chunk of rows at a time into one
+        packed key per row, and the distinct keys are counted.
+
+        Parameters
+        ----------
+        top : int
+            number of patterns, defaults to 10
+        chunk_rows : int
+            number of rows transposed at a time, defaults to 65,536
+
+        Returns
+        -------
+        patterns : list
+            (missing columns, number of rows) tuples by decreasing number
+            of rows; the rows without missing values have the pattern ()
+        """
+        if type(top) != int or top < 1:
+            raise TypeError("top must be a positive integer.")
+        if type(chunk_rows) != int or chunk_rows < 8:
+            raise TypeError("chunk_rows must be an integer of at least 8.")
+        if len(self.columns) == 0:
+            return [((), self.n_rows)] if self.n_rows else []
+        step = chunk_rows // 8
+        counter = Counter()
+        for start in range(0, (self.n_rows + 7) // 8, step):
+            count = min(8 * step, self.n_rows - 8 * start)
+            bits = np.unpackbits(self.bitmaps[:, start:start + step], axis=1, count=count,
+                                 bitorder="little")
+            keys = np.ascontiguousarray(np.packbits(bits.T, axis=1, bitorder="little"))
+            keys = keys.view(np.dtype((np.void, keys.shape[1]))).ravel()
+            values, counts = np.unique(keys, return_counts=True)
+            counter.update(dict(zip(values.tolist(), counts.tolist())))
+
+        result = []
+        for key, rows in counter.most_common(top):
+            missing = np.unpackbits(np.frombuffer(key, dtype=np.uint8), count=len(self.columns),
+                                    bitorder="little")
+            result.append((tuple(self.columns[missing.astype(np.bool_)]), rows))
+        return result
+
+
+def missingness_profile(df, columns=None):
+    """Builds the bit-packed MissingnessProfile of a dataframe.
+
+    A pandas column is tested with isna and packed; an Arrow column reuses
+    its validity buffers through pyarrow.compute.is_null, whose result is
+    already bit-packed, and NaN's of floating columns count as missing as
+    they do in pandas.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+        dataframe to examine; only the given columns of an Arrow source are
+        read
+    columns : list, optional
+        columns to profile, defaults to all of them
+
+    Returns
+    -------
+    profile : MissingnessProfile
+
+    Examples
+    --------
+    >>> profile = missingness_profile("listings/")
+    >>> profile.patterns(top=5)
+    """
+    source = _as_arrow(df)
+    if source is not None:
+        names = list(source.schema.names) if columns is None else list(columns)
+        table = source.to_table(columns=names) if hasattr(source, "to_table") else source.select(names)
+        n_rows = table.num_rows
+        bitmaps = _empty_bitmaps(len(names), n_rows)
+        for j, name in enumerate(names):
+            _arrow_bitmap(table.column(name), bitmaps[j])
+        return MissingnessProfile(names, bitmaps, n_rows)
+
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("df must be input as a DataFrame.")
+    frame = df if columns is None else df[list(columns)]
+    bitmaps = _empty_bitmaps(frame.shape[1], len(frame))
+    size = (len(frame) + 7) // 8
+    for j in range(frame.shape[1]):
+        bitmaps[j, :size] = np.packbits(frame.iloc[:, j].isna().to_numpy(), bitorder="little")
+    return MissingnessProfile(frame.columns, bitmaps, len(frame))
+
+
+def _arrow_bitmap(column, out):
+    """Writes the packed null bitmap of an Arrow ChunkedArray into out."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    floating = pa.types.is_floating(column.type)
+    position = 0
+    for chunk in column.chunks:
+        length = len(chunk)
+        if length == 0 or (chunk.null_count == 0 and not floating):
+            position += length
+            continue
+        nulls = pc.is_null(chunk, nan_is_null=True)
+        # a boolean array stores its values as a packed bitmap
+        packed = np.frombuffer(nulls.buffers()[1], dtype=np.uint8)
+        start = position // 8
+        if nulls.offset == 0 and position % 8 == 0:
+            # byte-aligned: the buffer is copied as it is, with the bits
+            # past the end of the chunk cleared
+            piece = packed[:(length + 7) // 8].copy()
+            if length % 8:
+                piece[-1] &= (1 << length % 8) - 1
+        else:
+            bits = np.unpackbits(packed, count=nulls.offset + length, bitorder="little")[nulls.offset:]
+            piece = np.packbits(np.concatenate([np.zeros(position % 8, np.uint8), bits]),
+                                bitorder="little")
+        out[start:start + len(piece)] |= piece
+        position += length
+
+
+def _empty_bitmaps(n_columns, n_rows):
+    """Zeroed bitmaps for n_rows rows, padded to whole 64-bit words."""
+    return np.zeros((n_columns, (n_rows + 63) // 64 * 8), dtype=np.uint8)
+
+
+def _popcount(bitmaps):
+    """Number of set bits of each row of a 2D uint8 array whose rows are
+    whole 64-bit words, with the SWAR bit-counting steps."""
+    x = np.ascontiguousarray(bitmaps).view(np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).sum(axis=-1, dtype=np.int64)
@@ -0,0 +1,114 @@
+import numpy as np
+
+
+class RunningMoments:
+    """Mergeable per-column count, mean, variance, min and max.
+
+    Each batch is reduced with a two-pass mean/variance and combined with
+    the running totals using the pairwise update of Chan, Golub and LeVeque
+    (the batched form of Welford's algorithm). Two accumulators built over
+    different parts of the data can be merged, so the statistics do not
+    depend on how the data was split into chunks or partitions.
+
+    Parameters
+    ----------
+    columns : list
+        names of the columns being accumulated
+
+    Examples
+    --------
+    >>> moments = RunningMoments(["price", "weight"])
+    >>> for chunk in chunks:
+    ...     moments.update(chunk[["price", "weight"]].to_numpy(dtype=float))
+    >>> moments.std()
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    def update(self, values):
+        """Adds a 2D array of shape (rows, columns) to the accumulator.
+
+        NaN entries are ignored column by column.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            batch of values, one column per accumulated column
+
+        Returns
+        -------
+        self : RunningMoments
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        if values.shape[1] != len(self.columns):
+            raise ValueError("values must have one column per accumulated column.")
+        if values.shape[0] == 0:
+            return self
+
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        has_values = count > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(has_values, np.nansum(values, axis=0) / count, 0.0)
+            m2 = np.nansum((values - mean) ** 2, axis=0)
+        vmin = np.full(len(self.columns), np.inf)
+        vmax = np.full(len(self.columns), -np.inf)
+        if has_values.any():
+            vmin[has_values] = np.nanmin(values[:, has_values], axis=0)
+            vmax[has_values] = np.nanmax(values[:, has_values], axis=0)
+
+        self._combine(count, mean, m2, vmin, vmax)
+        return self
+
+    def merge(self, other):
+        """Merges another accumulator over the same columns into this one.
+
+        Parameters
+        ----------
+        other : RunningMoments
+            accumulator built over a different part of the data
+
+        Returns
+        -------
+        self : RunningMoments
+        """
+        if not isinstance(other, RunningMoments):
+            raise TypeError("other must be a RunningMoments object.")
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns.")
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _combine(self, count, mean, m2, vmin, vmax):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            new_mean = np.where(total > 0, self.mean + delta * (count / total), 0.0)
+            new_m2 = np.where(
+                total > 0,
+                self.m2 + m2 + delta ** 2 * (self.count * count / total),
+                0.0,
+            )
+        self.count = total
+        self.mean = new_mean
+        self.m2 = new_m2
+        self.min = np.minimum(self.min, vmin)
+        self.max = np.maximum(self.max, vmax)
+
+    def variance(self, ddof=0):
+        """Returns the per-column variance, NaN where count <= ddof."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def std(self, ddof=0):
+        """Returns the per-column standard deviation, NaN where count <= ddof."""
+        return np.sqrt(self.variance(ddof))
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+
+from pyeasyeda.dtypes import numeric_columns
+
+
+class OutlierReport:
+    """Outliers found by detect_outliers, one entry per numeric variable.
+
+    Attributes
+    ----------
+    method : str
+        name of the detector used
+    threshold : float
+        threshold passed to the detector
+    columns : list
+        numeric variables that were examined
+    values : dict
+        sorted unique outlier values for each variable
+    counts : dict
+        number of outlying rows for each variable
+    rows : dict
+        row positions (not index labels) of the outlying rows for each variable
+    bounds : dict
+        (lower, upper) bounds for each variable; values strictly outside
+        the bounds are outliers
+    """
+
+    def __init__(self, method, threshold, columns, values, counts, rows, bounds):
+        self.method = method
+        self.threshold = threshold
+        self.columns = list(columns)
+        self.values = values
+        self.counts = counts
+        self.rows = rows
+        self.bounds = bounds
+
+    def __getitem__(self, col):
+        return self.values[col]
+
+    def __str__(self):
+        lines = ["**The following potenital outliers were detected:**"]
+        for col in self.columns:
+            if self.counts[col] != 0:
+                lines.append(f"Variable {col}: ")
+                lines.append(_format_values(self.values[col]))
+        return "\n".join(lines)
+
+    def __repr__(self):
+        found = sum(1 for col in self.columns if self.counts[col] != 0)
+        return (f"OutlierReport(method={self.method!r}, threshold={self.threshold}, "
+                f"columns={len(self.columns)}, columns_with_outliers={found})")
+
+    def to_frame(self):
+        """Returns a dataframe with the bounds and outlier counts per variable."""
+        return pd.DataFrame(
+            {
+                "lower": [self.bounds[col][0] for col in self.columns],
+                "upper": [self.bounds[col][1] for col in self.columns],
+                "count": [self.counts[col] for col in self.columns],
+                "unique": [len(self.values[col]) for col in self.columns],
+            },
+            index=pd.Index(self.columns, name="variable"),
+        )
+
+
+def zscore_bounds(values, threshold):
+    """Bounds `threshold` population standard deviations around the mean."""
+    mean = values.mean(dtype=np.float64)
+    std = values.std(dtype=np.float64)
+    return mean - threshold * std, mean + threshold * std
+
+
+def mad_bounds(values, threshold):
+    """Bounds `threshold` scaled median absolute deviations around the median.
+
+    The MAD is scaled by 1.4826 so it estimates the standard deviation of
+    normally distributed data.
+    """
+    median = np.median(values)
+    mad = 1.4826 * np.median(np.abs(values - median))
+    return median - threshold * mad, median + threshold * mad
+
+
+def iqr_bounds(values, threshold):
+    """Tukey's fences, `threshold` interquartile ranges outside the quartiles."""
+    q1, q3 = np.percentile(values, [25, 75])
+    iqr = q3 - q1
+    return q1 - threshold * iqr, q3 + threshold * iqr
+
+
+DETECTORS = {
+    "zscore": (zscore_bounds, 3),
+    "mad": (mad_bounds, 3.5),
+    "iqr": (iqr_bounds, 1.5),
+}
+
+
+def detect_outliers(df, method="zscore", threshold=None, mask=None):
+    """Detects potential outliers in every numeric variable of a dataframe.
+
+    The bounds of each variable are computed by the detector and the
+    outlier mask is a single vectorized comparison against them. Variables
+    are processed one at a time directly on the dataframe's own arrays, so
+    no full-size float copy of the frame (such as a z-score matrix) is
+    ever built; the extra memory is one boolean mask the length of a column.
+    NaN's are ignored.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        dataframe to be inspected, only numeric variables are examined
+    method : str or callable
+        "zscore" (mean +/- threshold standard deviations), "mad" (median
+        +/- threshold scaled MADs) or "iqr" (Tukey's fences), or a function
+        taking a 1D array without NaN's and the threshold and returning
+        the (lower, upper) bounds. Defaults to "zscore".
+    threshold : float, optional
+        detector threshold, defaults to 3 for "zscore", 3.5 for "mad" and
+        1.5 for "iqr"
+    mask : numpy.ndarray, optional
+        boolean array selecting the rows to examine, e.g. the rows without
+        NaN's. Only one column at a time is filtered, and the row positions
+        in the report count the selected rows only. Defaults to None (every
+        row).
+
+    Returns
+    -------
+    report : OutlierReport
+        sorted unique outlier values, counts and row positions per variable
+
+    Examples
+    --------
+    >>> report = detect_outliers(df, method="iqr")
+    >>> report.values["price"]
+    array([150000.])
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("the input df must be pd.DataFrame type")
+
+    if callable(method):
+        detector, default = method, None
+        name = getattr(method, "__name__", "custom")
+    elif method in DETECTORS:
+        detector, default = DETECTORS[method]
+        name = method
+    else:
+        raise ValueError("method must be one of " + ", ".join(DETECTORS) + " or a callable.")
+
+    if threshold is None:
+        if default is None:
+            raise ValueError("threshold is required for a custom detector.")
+        threshold = default
+    if not isinstance(threshold, (int, float)) or isinstance(threshold, bool):
+        raise TypeError("threshold must be a number.")
+
+    if mask is not None:
+        mask = np.asarray(mask)
+        if mask.dtype != np.bool_ or mask.shape != (len(df),):
+            raise ValueError("mask must be a boolean array with one value per row.")
+
+    columns = numeric_columns(df)
+    values, counts, rows, bounds = {}, {}, {}, {}
+    for col in columns:
+        column = _column_values(df[col])
+        if mask is not None:
+            column = column[mask]
+        lower, upper = _column_bounds(column, detector, threshold)
+        with np.errstate(invalid="ignore"):
+            flagged = (column < lower) | (column > upper)
+        rows[col] = np.flatnonzero(flagged)
+        values[col] = np.unique(column[rows[col]])
+        counts[col] = len(rows[col])
+        bounds[col] = (lower, upper)
+
+    return OutlierReport(name, threshold, columns, values, counts, rows, bounds)
+
+
+def _column_values(series):
+    """Returns the values of a numeric column as a numpy array, without copying
+    when the column is backed by one."""
+    if pd.api.types.is_extension_array_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return series.to_numpy()
+
+
+def _column_bounds(column, detector, threshold):
+    """Applies the detector to the non-NaN values of a column."""
+    if column.dtype.kind == "f":
+        valid = ~np.isnan(column)
+        if not valid.all():
+            column = column[valid]
+    if len(column) == 0:
+        return np.nan, np.nan
+    return detector(column, threshold)
+
+
+def _format_values(values):
+    """Formats outlier values compactly, e.g. [150000, 2.7e+07]."""
+    return np.array2string(
+        np.asarray(values), separator=", ", formatter={"float_kind": "{:g}".format}
+    )
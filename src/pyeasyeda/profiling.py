@@ -0,0 +1,249 @@
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar
+
+# recorder of the current context; None when profiling is off
+_recorder = ContextVar("pyeasyeda_recorder", default=None)
+_global_recorder = None
+_NULL = contextlib.nullcontext()
+
+
+class Recorder:
+    """Collects the timing spans of the pyeasyeda functions.
+
+    Every internal stage of clean_up, summary_suggestions, close_up and
+    birds_eye_view (loading, dtype selection, NaN masks, outlier scans,
+    correlations, densities, chart construction...) runs inside a named
+    span. A span records its wall time, the CPU time of the process, the
+    peak traced memory above what was allocated when it started, and the
+    number of rows and columns it processed.
+
+    tracemalloc keeps a single peak for the whole process, so the memory
+    of a span is only measured while no other thread has a span open: the
+    spans that overlap a span of another thread (the stages of
+    service.AsyncProfiler, the blocks of a threaded correlation_matrix)
+    record None instead of a peak mixing both threads' allocations.
+
+    Use the profile context manager to create one, or set the
+    PYEASYEDA_PROFILE environment variable.
+
+    Parameters
+    ----------
+    memory : bool
+        trace memory allocations with tracemalloc, defaults to True. This
+        slows down allocation-heavy code; with False the memory of the
+        spans is None.
+
+    Attributes
+    ----------
+    spans : list
+        one dict per finished span, in the order they finished
+    """
+
+    def __init__(self, memory=True):
+        if type(memory) != bool:
+            raise TypeError("memory must be True or False.")
+        self.memory = memory
+        self.spans = []
+        self._origin = time.perf_counter()
+        # open spans of every thread, innermost last
+        self._stacks = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, rows=None, cols=None):
+        """Records the code run inside the block as the span `name`."""
+        thread = threading.get_ident()
+        frame = {"name": name, "peak": 0, "overlap": False}
+        with self._lock:
+            parents = self._stacks.get(thread, ())
+            others = [other for key, stack in self._stacks.items() if key != thread for other in stack]
+            if others:
+                # the peak is shared by every thread, so neither side can
+                # tell its own allocations apart
+                for other in others + [frame]:
+                    other["overlap"] = True
+            elif self.memory and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                if parents:
+                    parents[-1]["peak"] = max(parents[-1]["peak"], peak)
+                tracemalloc.reset_peak()
+                frame["start_memory"] = current
+            self._stacks[thread] = parents + (frame,)
+        start, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - start, time.process_time() - cpu
+            memory = None
+            with self._lock:
+                if "start_memory" in frame and not frame["overlap"]:
+                    peak = max(tracemalloc.get_traced_memory()[1], frame["peak"])
+                    memory = max(peak - frame["start_memory"], 0)
+                    if parents:
+                        parents[-1]["peak"] = max(parents[-1]["peak"], peak)
+                if parents:
+                    self._stacks[thread] = parents
+                else:
+                    del self._stacks[thread]
+            record = {
+                "name": name,
+                "parent": parents[-1]["name"] if parents else None,
+                "depth": len(parents),
+                "start": start - self._origin,
+                "wall": wall,
+                "cpu": cpu,
+                "memory": memory,
+                "rows": rows,
+                "cols": cols,
+                "thread": thread,
+            }
+            with self._lock:
+                self.spans.append(record)
+
+    def to_dict(self):
+        """Returns the spans and per-name totals as a JSON-serializable dict."""
+        totals = {}
+        for record in self.spans:
+            total = totals.setdefault(record["name"], {"calls": 0, "wall": 0.0, "cpu": 0.0})
+            total["calls"] += 1
+            total["wall"] += record["wall"]
+            total["cpu"] += record["cpu"]
+        return {"spans": sorted(self.spans, key=lambda record: record["start"]), "totals": totals}
+
+    def to_json(self, path=None):
+        """Returns the report as a JSON string, and writes it to path if given."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+    def to_chrome_trace(self, path=None):
+        """Returns the spans in the Chrome trace event format, readable by
+        chrome://tracing, Perfetto or speedscope, and writes them to path
+        if given."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": record["name"],
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["wall"] * 1e6,
+                "pid": pid,
+                "tid": record["thread"],
+                "args": {key: record[key] for key in ("cpu", "memory", "rows", "cols")},
+            }
+            for record in sorted(self.spans, key=lambda record: record["start"])
+        ]
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is not None:
+            with open(path, "w") as file:
+                json.dump(trace, file)
+        return trace
+
+
+@contextlib.contextmanager
+def profile(memory=True):
+    """Profiles the pyeasyeda calls made inside the block.
+
+    Parameters
+    ----------
+    memory : bool
+        trace memory allocations, defaults to True
+
+    Yields
+    ------
+    recorder : Recorder
+        the spans recorded in the block
+
+    Examples
+    --------
+    >>> with profile() as recorder:
+    ...     birds_eye_view(df)
+    >>> recorder.to_chrome_trace("birds_eye_view.trace.json")
+    """
+    recorder = Recorder(memory=memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+        if started:
+            tracemalloc.stop()
+
+
+def span(name, rows=None, cols=None):
+    """Context manager recording a span when profiling is on.
+
+    When profiling is off this is one context variable lookup returning a
+    shared no-op context manager.
+
+    Parameters
+    ----------
+    name : str
+        name of the stage, e.g. "clean_up.outliers"
+    rows, cols : int, optional
+        number of rows and columns the stage processes
+    """
+    recorder = _recorder.get() or _global_recorder
+    if recorder is None:
+        return _NULL
+    return recorder.span(name, rows, cols)
+
+
+def profiled(name):
+    """Decorator running a whole function inside the span `name`."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder.get() or _global_recorder
+            if recorder is None:
+                return function(*args, **kwargs)
+            with recorder.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def global_recorder():
+    """Returns the recorder enabled by the PYEASYEDA_PROFILE environment
+    variable, or None.
+
+    With PYEASYEDA_PROFILE set to a file name, every pyeasyeda call of the
+    process is recorded and, at exit, the JSON report is written to that
+    file and the Chrome trace next to it (".trace.json"). With "1" the
+    calls are recorded without writing any file. Memory tracing is turned
+    off with PYEASYEDA_PROFILE_MEMORY=0.
+    """
+    return _global_recorder
+
+
+def _enable_from_environment():
+    global _global_recorder
+    setting = os.environ.get("PYEASYEDA_PROFILE", "")
+    if setting in ("", "0"):
+        return
+    _global_recorder = Recorder(memory=os.environ.get("PYEASYEDA_PROFILE_MEMORY", "1") != "0")
+    if _global_recorder.memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if setting not in ("1", "true", "yes"):
+        base = setting[:-5] if setting.endswith(".json") else setting
+
+        def export():
+            _global_recorder.to_json(setting)
+            _global_recorder.to_chrome_trace(base + ".trace.json")
+
+        atexit.register(export)
+
+
+_enable_from_environment()
@@ -0,0 +1,490 @@
+import base64
+import glob
+import hashlib
+import html
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import pyeasyeda
+from pyeasyeda.birds_eye_view import MAX_BAR_CHART_VALUES, _render_plot
+from pyeasyeda.clean_up import _read_file_chunks, complete_rows
+from pyeasyeda.close_up import _top_pairs
+from pyeasyeda.context import fingerprint
+from pyeasyeda.correlation import _pairwise_corr, _pairwise_sums
+from pyeasyeda.dtypes import categorical_columns, numeric_columns
+from pyeasyeda.moments import RunningMoments
+from pyeasyeda.profiling import profiled, span
+from pyeasyeda.summary_suggestions import SummaryAccumulator
+
+
+@profiled("build_profile")
+def build_profile(source, bins=20, pairs=5, threshold=0.8, chunksize=100_000,
+                  approximate=False, max_outliers=1000, top_values=100, max_values=100_000):
+    """Profiles a dataset in a single streaming pass.
+
+    The cleaning, summary, correlation and distribution passes of
+    clean_up, summary_suggestions, close_up and birds_eye_view are fused
+    into one scan over the chunks of the data, so peak memory depends on
+    `chunksize` rather than on the size of the data. Each chunk updates:
+
+    - a SummaryAccumulator, giving the numeric and categorical summaries
+      and the variables with a high proportion of unique values
+    - the moments of the rows without NaN's and, for every numeric
+      variable, its `max_outliers` smallest and largest values, from which
+      the outliers clean_up reports are found at the end
+    - the pairwise complete co-moments of the numeric variables, giving
+      the correlation matrix and its strongest pairs
+
+    The histograms are built from the quantile sketches of the summary:
+    they match birds_eye_view while a variable has fewer values than the
+    sketch holds (2048) and are approximate beyond that. The percentiles of
+    each numeric variable are kept from the same sketches, so two profiles
+    can be compared with pyeasyeda.drift.compare_profiles.
+
+    Parameters
+    ----------
+    source : str, os.PathLike, list, pandas.DataFrame or iterable
+        CSV or Parquet file, directory of Parquet files, glob pattern such
+        as "data/*.csv", list of such paths, a dataframe or an iterable of
+        dataframe chunks sharing the same columns
+    bins : int
+        number of histogram bins, defaults to 20
+    pairs : int
+        number of most correlated pairs to report, defaults to 5
+    threshold : float
+        threshold for flagging variables with high unique values, defaults
+        to 0.8
+    chunksize : int
+        number of rows read at a time from a file, defaults to 100,000
+    approximate : bool
+        count the unique values of categorical variables with HyperLogLog
+        sketches instead of exact value counts, defaults to False. No top
+        values or bar charts are reported in this mode
+    max_outliers : int
+        number of extreme values kept per variable and side; beyond that
+        the outlier counts are lower bounds, defaults to 1000
+    top_values : int
+        number of most frequent values reported per categorical variable,
+        defaults to 100
+    max_values : int
+        number of distinct values of a categorical variable counted
+        exactly; beyond that the variable is counted with a HyperLogLog
+        sketch, as with approximate=True, so memory and the time per chunk
+        stay bounded on ID-like variables. Defaults to 100,000
+
+    Returns
+    -------
+    profile : dict
+        JSON-serializable profile (see write_profile)
+
+    Examples
+    --------
+    >>> profile = build_profile("listings/*.csv")
+    >>> profile["top_pairs"]
+    [['income', 'price', 0.991]]
+    """
+    for name, value in [("bins", bins), ("pairs", pairs), ("chunksize", chunksize),
+                        ("max_outliers", max_outliers), ("top_values", top_values),
+                        ("max_values", max_values)]:
+        if type(value) != int or value < 1:
+            raise TypeError(f"{name} must be a positive integer.")
+    if type(approximate) != bool:
+        raise TypeError("approximate must be True or False.")
+
+    paths = None if isinstance(source, pd.DataFrame) or not _is_path_source(source) \
+        else input_files(source)
+    scan = _Scan(approximate, max_outliers, max_values)
+    with span("build_profile.scan"):
+        if paths is not None:
+            for path in paths:
+                for chunk in _read_file_chunks(path, chunksize):
+                    scan.update(chunk)
+        elif isinstance(source, pd.DataFrame):
+            for start in range(0, max(len(source), 1), chunksize):
+                scan.update(source.iloc[start:start + chunksize])
+        else:
+            for chunk in source:
+                if not isinstance(chunk, pd.DataFrame):
+                    raise TypeError("every chunk must be pd.DataFrame type")
+                scan.update(chunk)
+    if scan.summary.numeric_columns is None:
+        raise ValueError("the source has no rows to profile.")
+
+    options = {"bins": bins, "pairs": pairs, "threshold": threshold,
+               "approximate": approximate, "max_outliers": max_outliers,
+               "top_values": top_values, "max_values": max_values}
+    profile = scan.result(bins, pairs, threshold, top_values)
+    profile.update({
+        "pyeasyeda": pyeasyeda.__version__,
+        "source": [os.fspath(path) for path in paths] if paths is not None else None,
+        "fingerprint": (
+            input_fingerprint(source, **options) if paths is not None
+            else fingerprint(source) if isinstance(source, pd.DataFrame) else None
+        ),
+        "options": options,
+    })
+    return profile
+
+
+def input_files(source):
+    """Expands a path, directory of Parquet files, glob pattern or list of
+    them into the files to read, in order.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or list
+
+    Returns
+    -------
+    paths : list
+        CSV or Parquet files, or Parquet directories
+    """
+    sources = list(source) if isinstance(source, (list, tuple)) else [source]
+    paths = []
+    for item in sources:
+        item = os.fspath(item)
+        if os.path.exists(item):
+            paths.append(item)
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item))
+            if not matches:
+                raise FileNotFoundError(f"no files match {item}")
+            paths.extend(matches)
+        else:
+            raise FileNotFoundError(item)
+    return paths
+
+
+def input_fingerprint(source, **options):
+    """Returns a key identifying the input files and the options they are
+    profiled with.
+
+    Only file metadata (absolute path, size and modification time) is
+    hashed, so the key is computed without reading the data and changes
+    whenever a file is rewritten.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or list
+        files, directories or glob patterns, as in build_profile
+    **options
+        profiling options the result depends on
+
+    Returns
+    -------
+    key : str
+        hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((pyeasyeda.__version__, sorted(options.items()))).encode())
+    for path in input_files(source):
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path) for name in names
+            )
+        for name in files:
+            stat = os.stat(name)
+            digest.update(repr((os.path.abspath(name), stat.st_size, stat.st_mtime_ns)).encode())
+    return digest.hexdigest()
+
+
+def write_profile(profile, path):
+    """Writes a profile from build_profile as JSON.
+
+    Missing values (NaN) are written as null.
+    """
+    with open(path, "w") as file:
+        json.dump(profile, file, indent=2)
+
+
+def load_profile(path):
+    """Reads a profile written by write_profile.
+
+    Missing values are read back as None.
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+@profiled("render_report")
+def render_report(profile, images=True):
+    """Renders a profile from build_profile as a self-contained HTML page.
+
+    Parameters
+    ----------
+    profile : dict
+        profile from build_profile
+    images : bool
+        embed histograms, bar charts and the correlation heatmap as PNG
+        images drawn from the profile's aggregates, defaults to True
+
+    Returns
+    -------
+    page : str
+        HTML document with no external resources
+    """
+    esc = lambda value: html.escape(str(value))
+    numeric = pd.DataFrame(
+        {col: {key: stats[key] for key in _NUMERIC_STATS} for col, stats in profile["numeric"].items()},
+        index=list(_NUMERIC_STATS), dtype=float,
+    )
+    categorical = pd.DataFrame(
+        {col: {key: stats[key] for key in _CATEGORICAL_STATS}
+         for col, stats in profile["categorical"].items()},
+        index=list(_CATEGORICAL_STATS), dtype=object,
+    )
+    outliers = pd.DataFrame(
+        [[col, stats["outliers"]["lower"], stats["outliers"]["upper"],
+          stats["outliers"]["count"] if stats["outliers"]["exact"] else f"{stats['outliers']['count']}+"]
+         for col, stats in profile["numeric"].items()],
+        columns=["variable", "lower", "upper", "count"],
+    )
+    top_pairs = pd.DataFrame(profile["top_pairs"], columns=["variable a", "variable b", "coefficient"])
+
+    sections = [
+        "<h1>pyeasyeda report</h1>",
+        f"<p>{esc(', '.join(profile['source'] or ['in-memory data']))}</p>",
+        f"<p>{profile['rows']:,} rows, {len(profile['columns'])} variables, "
+        f"{profile['rows'] - profile['complete_rows']:,} rows with missing values</p>",
+        "<h2>Numeric variables</h2>", numeric.to_html(na_rep="", float_format="{:.4g}".format),
+        "<h2>Categorical variables</h2>", categorical.to_html(na_rep=""),
+    ]
+    if profile["high_unique"]:
+        sections.append("<p>Variables with a proportion of unique values above "
+                        f"{profile['options']['threshold']}: "
+                        f"{esc(', '.join(profile['high_unique']))}</p>")
+    sections += [
+        "<h2>Potential outliers</h2>", outliers.to_html(index=False, na_rep="", float_format="{:.4g}".format),
+        "<h2>Most correlated pairs</h2>", top_pairs.to_html(index=False, float_format="{:.3f}".format),
+    ]
+
+    if images:
+        with span("render_report.images"):
+            sections.append("<h2>Distributions</h2>")
+            for col, stats in profile["numeric"].items():
+                dist = {
+                    "edges": np.asarray(stats["histogram"]["edges"], dtype=float),
+                    "counts": np.asarray(stats["histogram"]["counts"]),
+                    "kde_x": np.empty(0), "kde_y": np.empty(0),
+                }
+                sections.append(_image(("histogram", col, dist, None, "png", None), col))
+            for col, stats in profile["categorical"].items():
+                if stats["values"] is not None and stats["unique"] <= MAX_BAR_CHART_VALUES:
+                    counts = pd.Series(stats["values"], dtype=np.int64)
+                    sections.append(_image(("bar_chart", col, counts, None, "png", None), col))
+            names = profile["correlation"]["columns"]
+            if len(names) >= 2:
+                corr = pd.DataFrame(profile["correlation"]["matrix"], index=names,
+                                    columns=names, dtype=float)
+                sections += ["<h2>Correlations</h2>",
+                             _image(("heatmap", None, corr, None, "png", None), "correlation heatmap")]
+
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>pyeasyeda report</title>\n"
+        f"<style>{_STYLE}</style>\n</head>\n<body>\n" + "\n".join(sections) + "\n</body>\n</html>\n"
+    )
+
+
+_NUMERIC_STATS = ("count", "mean", "std", "min", "25%", "50%", "75%", "max")
+_CATEGORICAL_STATS = ("count", "unique", "top", "freq")
+# percentiles stored per numeric variable, from which pyeasyeda.drift
+# rebuilds its distribution
+_QUANTILE_LEVELS = np.linspace(0, 1, 101)
+_STYLE = (
+    "body{font-family:sans-serif;margin:2em;}"
+    "table{border-collapse:collapse;margin-bottom:1em;}"
+    "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right;}"
+    "img{max-width:48%;}"
+)
+
+
+class _Scan:
+    """Accumulators updated by every chunk of build_profile."""
+
+    def __init__(self, approximate, max_outliers, max_values):
+        self.summary = SummaryAccumulator(approximate=approximate, max_values=max_values)
+        self.max_outliers = max_outliers
+        self.columns = None
+        self.complete_rows = 0
+
+    def update(self, chunk):
+        if self.columns is None:
+            self._start(chunk)
+        chunk = self._align(chunk)
+        self.summary.update(chunk)
+
+        values = chunk[self.numeric].to_numpy(dtype=float, na_value=np.nan)
+        keep = complete_rows(chunk)
+        self.complete_rows += int(keep.sum())
+        complete = values[keep]
+        self.clean.update(complete)
+        k = self.max_outliers
+        for j in range(len(self.numeric)):
+            low = np.concatenate([self.lowest[j], complete[:, j]])
+            high = np.concatenate([self.highest[j], complete[:, j]])
+            self.lowest[j] = np.partition(low, k - 1)[:k] if len(low) > k else low
+            self.highest[j] = np.partition(high, len(high) - k)[-k:] if len(high) > k else high
+
+        if self.shift is None and len(values):
+            # the co-moments are summed around the means of the first chunk;
+            # any fixed shift gives the same correlations
+            count = (~np.isnan(values)).sum(axis=0)
+            self.shift = np.nansum(values, axis=0) / np.maximum(count, 1)
+        if self.shift is not None:
+            block = np.arange(len(self.numeric))
+            sums = _pairwise_sums(values, block, block, block, self.shift, 16384)
+            self.sums = sums if self.sums is None else tuple(a + b for a, b in zip(self.sums, sums))
+
+    def _start(self, chunk):
+        self.columns = {col: str(dtype) for col, dtype in chunk.dtypes.items()}
+        self.numeric = numeric_columns(chunk)
+        self.categorical = categorical_columns(chunk)
+        self.clean = RunningMoments(self.numeric)
+        self.lowest = [np.empty(0)] * len(self.numeric)
+        self.highest = [np.empty(0)] * len(self.numeric)
+        self.shift = None
+        self.sums = None
+
+    def _align(self, chunk):
+        """Gives a chunk the variable types of the first one: a chunk of a
+        CSV where a text column is empty reads it as float, and values that
+        do not parse as numbers are treated as missing."""
+        if list(chunk.columns) != list(self.columns):
+            raise ValueError("every chunk must have the same variables as the first one")
+        numeric, categorical = set(numeric_columns(chunk)), set(categorical_columns(chunk))
+        changes = {}
+        for col in self.numeric:
+            if col not in numeric:
+                changes[col] = pd.to_numeric(chunk[col], errors="coerce")
+        for col in self.categorical:
+            if col not in categorical:
+                changes[col] = chunk[col].astype(object)
+        return chunk.assign(**changes) if changes else chunk
+
+    def result(self, bins, pairs, threshold, top_values):
+        with span("build_profile.summary"):
+            numeric_summary, categorical_summary, unique_share, high_unique = \
+                self.summary.result(threshold)
+
+        with span("build_profile.outliers"):
+            std = self.clean.std()
+            lower, upper = self.clean.mean - 3 * std, self.clean.mean + 3 * std
+            outliers = {}
+            for j, col in enumerate(self.numeric):
+                low = self.lowest[j][self.lowest[j] < lower[j]]
+                high = self.highest[j][self.highest[j] > upper[j]]
+                full = self.max_outliers < self.clean.count[j]
+                outliers[col] = {
+                    "lower": _json_value(lower[j]),
+                    "upper": _json_value(upper[j]),
+                    "count": len(low) + len(high),
+                    "values": [_json_value(v) for v in np.unique(np.concatenate([low, high]))],
+                    "exact": not (full and (len(low) == self.max_outliers
+                                            or len(high) == self.max_outliers)),
+                }
+
+        with span("build_profile.correlation", self.summary.n_rows, len(self.numeric)):
+            p = len(self.numeric)
+            if self.sums is None:
+                corr = np.full((p, p), np.nan)
+            else:
+                corr = _pairwise_corr(*self.sums)
+                count = numeric_summary.loc["count"].to_numpy()
+                diagonal = (count >= 2) & (numeric_summary.loc["std"].to_numpy() > 0)
+                corr[np.diag_indices(p)] = np.where(diagonal, 1.0, np.nan)
+                np.clip(corr, -1, 1, out=corr)
+            corr = pd.DataFrame(corr, index=self.numeric, columns=self.numeric)
+            n_pairs = min(pairs, p * (p - 1) // 2)
+            top = _top_pairs(corr, n_pairs) if n_pairs else []
+
+        with span("build_profile.histograms", self.summary.n_rows, len(self.numeric)):
+            numeric = {}
+            for j, col in enumerate(self.numeric):
+                stats = {key: _json_value(numeric_summary.at[key, col]) for key in _NUMERIC_STATS}
+                edges, counts = _sketch_histogram(self.summary.sketches[col],
+                                                  self.summary.moments.min[j],
+                                                  self.summary.moments.max[j], bins)
+                stats["histogram"] = {"edges": [float(e) for e in edges],
+                                      "counts": [int(c) for c in counts]}
+                stats["quantiles"] = [_json_value(v) for v in
+                                      self.summary.sketches[col].quantile(_QUANTILE_LEVELS)]
+                stats["outliers"] = outliers[col]
+                numeric[col] = stats
+
+        categorical = {}
+        for col in self.categorical:
+            stats = {key: _json_value(categorical_summary.at[key, col]) for key in _CATEGORICAL_STATS}
+            counts = self.summary.top_values(col)
+            if counts is None:
+                stats["values"], stats["truncated"] = None, None
+            else:
+                stats["values"] = {str(value): int(count) for value, count in counts.iloc[:top_values].items()}
+                stats["truncated"] = len(counts) > top_values
+            stats["unique_share"] = _json_value(unique_share.at["unique", col])
+            categorical[col] = stats
+
+        return {
+            "rows": int(self.summary.n_rows),
+            "complete_rows": int(self.complete_rows),
+            "columns": self.columns,
+            "numeric": numeric,
+            "categorical": categorical,
+            "high_unique": list(high_unique),
+            "correlation": {
+                "columns": list(self.numeric),
+                "matrix": [[_json_value(v) for v in row] for row in corr.to_numpy()],
+            },
+            "top_pairs": [[a, b, _json_value(coef)] for a, b, coef in top],
+        }
+
+
+def _sketch_histogram(sketch, low, high, bins):
+    """Histogram with numpy.histogram's edges over [low, high], counted from
+    the items of a quantile sketch (exactly while the sketch is exact)."""
+    if sketch.count == 0:
+        low, high = 0.0, 1.0
+    elif low == high:
+        # numpy widens an empty range by 0.5 on each side
+        low, high = low - 0.5, high + 0.5
+    edges = np.linspace(low, high, bins + 1)
+    if sketch.exact:
+        counts, _ = np.histogram(sketch.levels[0], edges)
+    else:
+        items, weights = sketch._weighted_items()
+        counts, _ = np.histogram(items, edges, weights=weights)
+    return edges, counts.astype(np.int64)
+
+
+def _is_path_source(source):
+    return isinstance(source, (str, os.PathLike)) or (
+        isinstance(source, (list, tuple)) and all(isinstance(item, (str, os.PathLike)) for item in source)
+    )
+
+
+def _json_value(value):
+    """Converts a numpy or pandas scalar to a JSON value, NaN to None."""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, (np.integer, int)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return float(value) if np.isfinite(value) else None
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _image(task, alt):
+    """Renders a plot task as an inline PNG image."""
+    data = base64.b64encode(_render_plot(task)).decode("ascii")
+    return f'<img alt="{html.escape(str(alt))}" src="data:image/png;base64,{data}">'
@@ -0,0 +1,280 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from pyeasyeda.birds_eye_view import render_birds_eye_view
+from pyeasyeda.clean_up import complete_rows
+from pyeasyeda.close_up import close_up, top_correlated_pairs
+from pyeasyeda.context import AnalysisContext, resolve_context
+from pyeasyeda.outliers import detect_outliers
+from pyeasyeda.profiling import span
+from pyeasyeda.sources import load_frame
+from pyeasyeda.summary_suggestions import summary_suggestions
+
+STAGES = ("summary", "outliers", "correlation", "charts")
+
+
+class AsyncProfiler:
+    """Runs the pyeasyeda analyses from asyncio code, e.g. a web service.
+
+    Each call to profile splits the work into independent stages (the
+    summary, the outlier scan, the correlations and the charts), runs them
+    concurrently on a bounded pool of workers and returns their results;
+    nothing is printed and no pyplot state is touched, so any number of
+    calls can be in flight at once.
+
+    Backpressure: at most `max_concurrent` calls run at a time and the
+    others wait for a slot. With `max_waiting`, a call arriving when that
+    many are already waiting fails at once with asyncio.QueueFull, so a
+    service can reject work instead of queueing it without bound.
+
+    Cancellation: cancelling the awaiting task cancels the stages that have
+    not started. With thread workers, stages that are already running
+    finish, but their results are dropped.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        number of worker threads or processes, defaults to the number of
+        CPUs
+    max_concurrent : int, optional
+        number of profile calls running at a time, defaults to max_workers
+    max_waiting : int, optional
+        number of calls allowed to wait for a slot, defaults to None (no
+        limit)
+    processes : bool
+        run the stages in worker processes instead of threads, defaults to
+        False. Processes scale the pure-Python parts of the analyses across
+        cores, but each stage receives its own copy of the dataframe and
+        no AnalysisContext is shared between stages.
+
+    Examples
+    --------
+    >>> profiler = AsyncProfiler(max_workers=8, max_waiting=32)
+    >>> result = await profiler.profile(df, n=3)
+    >>> result["top_pairs"]
+    >>> await profiler.close()
+    """
+
+    def __init__(self, max_workers=None, max_concurrent=None, max_waiting=None, processes=False):
+        for name, value in [("max_workers", max_workers), ("max_concurrent", max_concurrent)]:
+            if value is not None and (type(value) != int or value < 1):
+                raise TypeError(f"{name} must be a positive integer.")
+        if max_waiting is not None and (type(max_waiting) != int or max_waiting < 0):
+            raise TypeError("max_waiting must be a non-negative integer.")
+        if type(processes) != bool:
+            raise TypeError("processes must be True or False.")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrent = max_concurrent or self.max_workers
+        self.max_waiting = max_waiting
+        self.processes = processes
+        self.running = 0
+        self.waiting = 0
+        if processes:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix="pyeasyeda")
+        # asyncio primitives belong to one event loop, so each loop using
+        # the profiler gets its own slots
+        self._slots = weakref.WeakKeyDictionary()
+
+    async def profile(self, df, n=1, bins=20, threshold=0.8, fmt="png", stages=STAGES, context=None):
+        """Profiles a dataframe, running the stages concurrently.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+            dataframe to examine
+        n : int
+            number of most correlated pairs, defaults to 1
+        bins : int
+            number of histogram bins, defaults to 20
+        threshold : float
+            threshold for flagging variables with high unique values,
+            defaults to 0.8
+        fmt : str
+            image format of the charts, "png" or "svg", defaults to "png"
+        stages : iterable
+            stages to run among "summary", "outliers", "correlation" and
+            "charts", defaults to all of them
+        context : AnalysisContext, optional
+            cache shared with other calls; by default each call uses its own,
+            shared by its stages
+
+        Returns
+        -------
+        result : dict
+            "summary": the list summary_suggestions returns;
+            "outliers": the OutlierReport clean_up logs and "complete_rows"
+            the boolean mask of the rows without NaN's;
+            "correlation": the correlation matrix and "top_pairs" the n most
+            correlated pairs;
+            "images": the images render_birds_eye_view returns and
+            "close_up": the Vega-Lite spec of the close_up chart (None when
+            no pair of numeric variables has a correlation coefficient)
+        """
+        stages = tuple(stages)
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise ValueError("stages must be among " + ", ".join(STAGES) + ".")
+        if type(n) != int or n < 1:
+            raise TypeError("n must be a positive integer.")
+        resolve_context(context)
+
+        slots = await self._acquire()
+        self.running += 1
+        try:
+            if not isinstance(df, pd.DataFrame):
+                df = await self._submit(threading.Event(), "load", load_frame, df)
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError("df must be input as a DataFrame.")
+            if context is None and not self.processes:
+                # the frame does not change during the call, so it is not
+                # fingerprinted on every lookup
+                context = AnalysisContext(maxsize=1, verify=False)
+            if self.processes:
+                context = None
+
+            cancelled = threading.Event()
+            arguments = {
+                "summary": (_summary_stage, df, threshold, context),
+                "outliers": (_outliers_stage, df, context),
+                "correlation": (_correlation_stage, df, n, context),
+                "charts": (_charts_stage, df, n, bins, fmt, context),
+            }
+            futures = [self._submit(cancelled, stage, *arguments[stage]) for stage in stages]
+            try:
+                parts = await asyncio.gather(*futures)
+            except BaseException:
+                cancelled.set()
+                for future in futures:
+                    future.cancel()
+                raise
+        finally:
+            self.running -= 1
+            slots.release()
+
+        result = {}
+        for part in parts:
+            result.update(part)
+        return result
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._slots:
+            self._slots[loop] = asyncio.Semaphore(self.max_concurrent)
+        slots = self._slots[loop]
+        if slots.locked() and self.max_waiting is not None and self.waiting >= self.max_waiting:
+            raise asyncio.QueueFull(
+                f"{self.waiting} profile calls are already waiting for one of "
+                f"{self.max_concurrent} slots."
+            )
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        return slots
+
+    def _submit(self, cancelled, stage, function, *args):
+        loop = asyncio.get_running_loop()
+        if self.processes:
+            call = functools.partial(function, *args)
+        else:
+            # the worker runs in a copy of the caller's context, so an active
+            # pyeasyeda.profiling.profile() records the stages
+            call = functools.partial(contextvars.copy_context().run, _run_stage,
+                                     cancelled, stage, function, *args)
+        return loop.run_in_executor(self.executor, call)
+
+    async def close(self):
+        """Shuts the workers down once the running stages have finished."""
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def profile_async(df, profiler=None, **options):
+    """Profiles a dataframe without blocking the event loop.
+
+    Shortcut for AsyncProfiler.profile, on a profiler shared by the whole
+    process unless one is given.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame, Parquet path, pyarrow.Table or pyarrow Dataset
+        dataframe to examine
+    profiler : AsyncProfiler, optional
+        profiler to run on, defaults to a shared one with a thread per CPU
+    **options
+        passed on to AsyncProfiler.profile
+
+    Returns
+    -------
+    result : dict
+        see AsyncProfiler.profile
+
+    Examples
+    --------
+    >>> result = await profile_async(df, n=2, stages=["summary", "correlation"])
+    """
+    global _default_profiler
+    if profiler is None:
+        if _default_profiler is None:
+            _default_profiler = AsyncProfiler()
+        profiler = _default_profiler
+    elif not isinstance(profiler, AsyncProfiler):
+        raise TypeError("profiler must be an AsyncProfiler object.")
+    return await profiler.profile(df, **options)
+
+
+_default_profiler = None
+
+
+def _run_stage(cancelled, stage, function, *args):
+    if cancelled.is_set():
+        return {}
+    with span("profile_async." + stage):
+        return function(*args)
+
+
+def _summary_stage(df, threshold, context):
+    return {"summary": summary_suggestions(df, threshold=threshold, context=context)}
+
+
+def _outliers_stage(df, context):
+    keep = complete_rows(df)
+    # same cached result as clean_up
+    report = resolve_context(context).view(df).get(
+        ("outliers", "zscore", 3),
+        lambda: detect_outliers(df, method="zscore", threshold=3, mask=keep),
+        columns=list(df.columns),
+    )
+    return {"outliers": report, "complete_rows": keep}
+
+
+def _correlation_stage(df, n, context):
+    corr = resolve_context(context).view(df).corr()
+    n = min(n, len(corr) * (len(corr) - 1) // 2)
+    return {"correlation": corr, "top_pairs": top_correlated_pairs(df, n, context=context) if n else []}
+
+
+def _charts_stage(df, n, bins, fmt, context):
+    images = render_birds_eye_view(df, n=bins, fmt=fmt, context=context)
+    p = len(resolve_context(context).view(df).numeric_columns())
+    n = min(n, p * (p - 1) // 2)
+    # constant or empty variables have no coefficient, and close_up raises
+    # without any pair to chart
+    pairs = top_correlated_pairs(df, n, context=context) if n else []
+    return {"images": images, "close_up": close_up(df, len(pairs), context=context).to_dict() if pairs else None}
@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """Mergeable approximate quantile sketch (KLL).
+
+    Values are kept in levels where an item at level h stands for 2**h
+    original values. When a level grows past its capacity it is sorted and
+    every other item (from a random offset) is promoted to the next level,
+    which keeps memory at roughly 3k items while the rank error shrinks as
+    k grows. Until the first compaction every value is kept, so quantiles
+    of small data are exact.
+
+    Parameters
+    ----------
+    k : int
+        capacity of the top level, controls the size/accuracy trade-off,
+        defaults to 2048
+    seed : int
+        seed for the compaction offsets so results are reproducible,
+        defaults to 0
+
+    Examples
+    --------
+    >>> sketch = QuantileSketch()
+    >>> sketch.update(df["price"].to_numpy())
+    >>> sketch.quantile([0.25, 0.5, 0.75])
+    """
+
+    def __init__(self, k=2048, seed=0):
+        if type(k) != int or k < 8:
+            raise TypeError("k must be an integer of at least 8.")
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Adds the non-NaN entries of an array to the sketch.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            values to add
+
+        Returns
+        -------
+        self : QuantileSketch
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Merges another sketch into this one.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            sketch built over a different part of the data
+
+        Returns
+        -------
+        self : QuantileSketch
+        """
+        if not isinstance(other, QuantileSketch):
+            raise TypeError("other must be a QuantileSketch object.")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _capacity(self, h):
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                items = np.sort(items)
+                # an odd item out stays at this level
+                keep = items[:len(items) % 2]
+                offset = self._rng.integers(2)
+                promoted = items[len(keep) + offset::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    @property
+    def exact(self):
+        """True while no compaction has happened and every value is kept."""
+        return len(self.levels) == 1
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2 ** h, dtype=np.int64) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="mergesort")
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """Returns the approximate q-th quantile(s), linearly interpolated.
+
+        Matches numpy.quantile (and pandas) exactly while the sketch is exact.
+
+        Parameters
+        ----------
+        q : float or array-like
+            quantile(s) between 0 and 1
+
+        Returns
+        -------
+        float or numpy.ndarray
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+        if self.exact:
+            return np.quantile(self.levels[0], q)
+        items, weights = self._weighted_items()
+        # item i covers the ranks up to last_rank[i] of the full data
+        last_rank = np.cumsum(weights) - 1
+        total = last_rank[-1]
+        pos = q * total
+        lo = items[np.searchsorted(last_rank, np.floor(pos))]
+        hi = items[np.searchsorted(last_rank, np.ceil(pos))]
+        return lo + (pos - np.floor(pos)) * (hi - lo)
+
+
+class HyperLogLog:
+    """Mergeable approximate distinct counter (HyperLogLog).
+
+    Every value is hashed to 64 bits; the first p bits pick one of 2**p
+    registers and the register keeps the longest run of leading zeros seen
+    in the remaining bits. Memory is fixed at 2**p bytes whatever the
+    number of distinct values, and the relative standard error of the
+    estimate is about 1.04 / sqrt(2**p).
+
+    Parameters
+    ----------
+    error : float
+        target relative standard error between 0 and 1, used to choose the
+        number of registers, defaults to 0.02 (4096 registers, 4 KB)
+
+    Examples
+    --------
+    >>> hll = HyperLogLog(error=0.01)
+    >>> hll.update(df["user_id"])
+    >>> hll.estimate()
+    """
+
+    def __init__(self, error=0.02):
+        if not isinstance(error, (int, float)) or isinstance(error, bool):
+            raise TypeError("error must be a float between 0 and 1.")
+        if not (0 < error < 1):
+            raise ValueError("error must be a float between 0 and 1.")
+        self.p = int(min(18, max(4, np.ceil(2 * np.log2(1.04 / error)))))
+        self.registers = np.zeros(2 ** self.p, dtype=np.uint8)
+
+    @property
+    def error(self):
+        """Relative standard error of the estimate."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def update(self, values):
+        """Adds the non-null entries of an array or series to the sketch.
+
+        Parameters
+        ----------
+        values : array-like or pandas.Series
+            values to add
+
+        Returns
+        -------
+        self : HyperLogLog
+        """
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        values = values[values.notna()]
+        if len(values) == 0:
+            return self
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+        p = np.uint64(self.p)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        rest = hashes << p
+        rank = (64 - _bit_length(rest) + 1).clip(max=64 - self.p + 1)
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other):
+        """Merges another sketch with the same error into this one.
+
+        Parameters
+        ----------
+        other : HyperLogLog
+            sketch built over a different part of the data
+
+        Returns
+        -------
+        self : HyperLogLog
+        """
+        if not isinstance(other, HyperLogLog):
+            raise TypeError("other must be a HyperLogLog object.")
+        if other.p != self.p:
+            raise ValueError("Cannot merge sketches with a different error.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """Returns the estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = np.count_nonzero(self.registers == 0)
+        # linear counting is more accurate for small cardinalities
+        if raw <= 2.5 * m and zeros > 0:
+            return m * np.log(m / zeros)
+        return raw
+
+
+def _bit_length(values):
+    """Number of significant bits of each uint64 value."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # frexp gives the exact exponent of integers below 2**53
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
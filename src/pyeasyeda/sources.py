@@ -0,0 +1,162 @@
+import os
+
+import pandas as pd
+
+
+def load_frame(data, columns=None, kinds=None):
+    """Loads the columns a pyeasyeda function needs from a Parquet or Arrow
+    source.
+
+    Only the selected columns are read, and they are converted from the
+    Arrow buffers without going through Python objects: numeric columns
+    become numpy arrays (zero-copy when they have no nulls) and string
+    columns become Arrow-backed pandas strings ("string[pyarrow]"). A
+    dataframe, or anything else that is not an Arrow source, is returned
+    unchanged so the caller can validate it as before.
+
+    Requires pyarrow for Arrow sources.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame, str, os.PathLike, pyarrow.Table or pyarrow.dataset.Dataset
+        dataframe, or path to a Parquet file or a directory of Parquet
+        files, or Arrow table or dataset
+    columns : list, optional
+        names of the columns to read; names missing from the source are
+        ignored so the caller can report them
+    kinds : tuple, optional
+        kinds of columns to read when `columns` is None, any of "numeric"
+        and "categorical", defaults to None (every column)
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        the loaded columns, or data itself if it is not an Arrow source
+
+    Examples
+    --------
+    >>> df = load_frame("sales/", kinds=("numeric",))
+    """
+    source = _as_arrow(data)
+    if source is None:
+        return data
+
+    schema = source.schema
+    if columns is not None:
+        names = [name for name in columns if name in schema.names]
+    else:
+        names = [field.name for field in schema if kinds is None or _kind(field.type) in kinds]
+
+    if hasattr(source, "to_table"):
+        table = source.to_table(columns=names)
+    else:
+        table = source.select(names)
+    return table.to_pandas(split_blocks=True, types_mapper=_types_mapper)
+
+
+def null_counts(data, columns):
+    """Returns the number of nulls of each column from metadata alone.
+
+    Parquet sources are answered from the row-group statistics and Arrow
+    tables from the null count every Arrow array keeps, so no values are
+    read. As in Arrow, NaN's of floating columns are not counted.
+
+    Parameters
+    ----------
+    data : str, os.PathLike, pyarrow.Table or pyarrow.dataset.Dataset
+        Arrow source, as accepted by load_frame
+    columns : list
+        names of the columns
+
+    Returns
+    -------
+    counts : dict
+        number of nulls of each column, None when it is not recorded (or
+        data is not an Arrow source)
+    """
+    source = _as_arrow(data)
+    counts = {name: None for name in columns}
+    if source is None:
+        return counts
+    if not hasattr(source, "get_fragments"):
+        for name in columns:
+            counts[name] = source.column(name).null_count
+        return counts
+
+    counts = {name: 0 for name in columns}
+    for fragment in source.get_fragments():
+        metadata = getattr(fragment, "metadata", None)
+        if metadata is None:
+            return {name: None for name in columns}
+        positions = {metadata.schema.column(i).name: i for i in range(metadata.num_columns)}
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            for name in columns:
+                if counts[name] is None:
+                    continue
+                if name not in positions:
+                    counts[name] = None
+                    continue
+                statistics = row_group.column(positions[name]).statistics
+                if statistics is None or not statistics.has_null_count:
+                    counts[name] = None
+                else:
+                    counts[name] += statistics.null_count
+    return counts
+
+
+def _as_arrow(data):
+    """Returns data as a pyarrow Table or Dataset, or None if it is neither
+    a path to Parquet data nor an Arrow object.
+
+    A path is Parquet data when it ends with ".parquet" or is a directory
+    holding such files; any other existing file or directory raises
+    TypeError instead of failing inside pyarrow."""
+    if isinstance(data, (str, os.PathLike)):
+        path = os.fspath(data)
+        if not (path.endswith(".parquet") or (os.path.isdir(path) and _has_parquet(path))):
+            if os.path.exists(path):
+                raise TypeError(f"{path} is not a Parquet file or a directory of Parquet files.")
+            return None
+        import pyarrow.dataset as ds
+
+        return ds.dataset(path, format="parquet")
+
+    # pyarrow is only imported for objects it created
+    if not type(data).__module__.startswith("pyarrow"):
+        return None
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if isinstance(data, (pa.Table, ds.Dataset)):
+        return data
+    if isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data])
+    return None
+
+
+def _has_parquet(directory):
+    """True if a directory or one of its subdirectories holds a Parquet file."""
+    return any(name.endswith(".parquet") for _, _, names in os.walk(directory) for name in names)
+
+
+def _kind(arrow_type):
+    """Kind of variable pyeasyeda treats an Arrow column as."""
+    import pyarrow as pa
+
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+        return "numeric"
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return "categorical"
+    if pa.types.is_dictionary(arrow_type):
+        return _kind(arrow_type.value_type)
+    return None
+
+
+def _types_mapper(arrow_type):
+    """Maps Arrow strings to Arrow-backed pandas strings instead of object."""
+    import pyarrow as pa
+
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
@@ -1,7 +1,18 @@
+from collections import Counter
+
 import pandas as pd
 import numpy as np
 
-def summary_suggestions(df, threshold = 0.8):
+from pyeasyeda.categorical import summarize_profiles
+from pyeasyeda.context import resolve_context
+from pyeasyeda.dtypes import categorical_columns, numeric_columns
+from pyeasyeda.moments import RunningMoments
+from pyeasyeda.profiling import profiled, span
+from pyeasyeda.sketches import HyperLogLog, QuantileSketch
+from pyeasyeda.sources import load_frame
+
+@profiled("summary_suggestions")
+def summary_suggestions(df, threshold = 0.8, approximate = False, error = 0.02, context = None):
     """Takes in a pandas dataframe and returns a list object comprising
     of 3 dataframes and a list. The dataframes correspond to the
     summary statistics of numeric and categorical variables each and
@@ -11,12 +22,28 @@ def summary_suggestions(df, threshold = 0.8):
 
     Parameters
     ----------
-    df : pandas dataframe
-        Dataframe to be examined
+    df : pandas dataframe, Parquet path, pyarrow.Table or pyarrow Dataset
+        Dataframe to be examined. Only the numeric and string columns of
+        an Arrow source are read, and strings stay Arrow-backed
 
     threshold : float
         threshold for considering dropping variables with high unique values
 
+    approximate : bool
+        estimate the number of unique values of categorical variables with
+        HyperLogLog sketches (a few KB per variable) instead of exact hash
+        sets. "top" and "freq" are not computed in this mode and the
+        proportion of unique values gets an "error" row with its standard
+        error. Defaults to False
+
+    error : float
+        relative standard error targeted by the sketches when approximate
+        is True, defaults to 0.02
+
+    context : AnalysisContext, optional
+        cache shared with the other pyeasyeda functions, the summary
+        statistics of df are reused from it on repeated calls
+
     Returns
     -------
     results : list
@@ -36,25 +63,310 @@ def summary_suggestions(df, threshold = 0.8):
     """
 
     # check if input is a DataFrame
+    with span("summary_suggestions.load"):
+        df = load_frame(df, kinds=("numeric", "categorical"))
     if not isinstance(df, pd.DataFrame):
         raise TypeError("Input df must be a pandas dataframe object")
 
+    _check_threshold(threshold)
+
+    if type(approximate) != bool:
+        raise TypeError("Input approximate must be True or False")
+
+    cache = resolve_context(context).view(df)
+    with span("summary_suggestions.numeric", len(df), len(cache.numeric_columns())):
+        numeric_summary_df = cache.describe("numeric").copy()
+
+    categorical = cache.categorical_columns()
+    if not approximate:
+        # one hashing pass per variable, shared with birds_eye_view
+        with span("summary_suggestions.categorical", len(df), len(categorical)):
+            categorical_summary_df = summarize_profiles(cache.categorical_profile())
+        return _suggestions(numeric_summary_df, categorical_summary_df, len(df), threshold)
+
+    with span("summary_suggestions.categorical", len(df), len(categorical)):
+        counts = {col: df[col].count() for col in categorical}
+        sketches = {col: HyperLogLog(error).update(df[col]) for col in categorical}
+        categorical_summary_df = _approximate_summary(counts, sketches)
+    return _suggestions(numeric_summary_df, categorical_summary_df, len(df), threshold,
+                        errors={col: sketches[col].error for col in categorical})
+
+
+class SummaryAccumulator:
+    """Incremental, mergeable version of summary_suggestions.
+
+    Feed it batches of rows (e.g. every hourly append) with update, or
+    combine accumulators built over different partitions with merge, and
+    call result for the same four-part list summary_suggestions returns.
+    Only the new rows are processed on each update.
+
+    Numeric variables keep a running count/mean/std/min/max and a quantile
+    sketch, so the quartiles are approximate once a variable has more than
+    about k values (and exact before that). Categorical variables keep
+    exact value counts, updated only for the values of the new rows, until
+    they have more than `max_values` distinct values; the variable then
+    switches to a HyperLogLog sketch, as with approximate=True, so memory
+    stays bounded on ID-like variables.
+
+    Parameters
+    ----------
+    k : int
+        size of the quantile sketch of each numeric variable, defaults to 2048
+    approximate : bool
+        keep a HyperLogLog sketch of fixed size per categorical variable
+        instead of exact value counts, as in summary_suggestions, defaults
+        to False
+    error : float
+        relative standard error of the HyperLogLog sketches, defaults to 0.02
+    max_values : int
+        number of distinct values of a categorical variable counted
+        exactly, defaults to 100,000
+
+    Examples
+    --------
+    >>> acc = SummaryAccumulator()
+    >>> acc.update(df_monday)
+    >>> acc.update(df_tuesday)
+    >>> acc.result(threshold=0.8)
+    """
+
+    def __init__(self, k=2048, approximate=False, error=0.02, max_values=100_000):
+        if type(k) != int or k < 8:
+            raise TypeError("k must be an integer of at least 8.")
+        if type(approximate) != bool:
+            raise TypeError("Input approximate must be True or False")
+        if type(max_values) != int or max_values < 1:
+            raise TypeError("max_values must be a positive integer.")
+        self.k = k
+        self.approximate = approximate
+        self.error = error
+        self.max_values = max_values
+        self.n_rows = 0
+        self.numeric_columns = None
+        self.categorical_columns = None
+        self.moments = None
+        self.sketches = {}
+        self.value_counts = {}
+        self.distinct = {}
+
+    def update(self, df):
+        """Adds a batch of rows to the summary.
+
+        Parameters
+        ----------
+        df : pandas dataframe
+            new rows, with the same variables as the previous batches
+
+        Returns
+        -------
+        self : SummaryAccumulator
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("Input df must be a pandas dataframe object")
+
+        numeric = numeric_columns(df)
+        categorical = categorical_columns(df)
+        if self.numeric_columns is None:
+            self._init_columns(numeric, categorical)
+        elif numeric != self.numeric_columns or categorical != self.categorical_columns:
+            raise ValueError("df must have the same variables as the previous batches")
+
+        self.moments.update(df[numeric].to_numpy(dtype=float, na_value=np.nan))
+        for col in numeric:
+            self.sketches[col].update(df[col].to_numpy(dtype=float, na_value=np.nan))
+        for col in categorical:
+            if col in self.distinct:
+                self.value_counts[col] += df[col].count()
+                self.distinct[col].update(df[col])
+            else:
+                counts = df[col].value_counts()
+                # categories absent from the batch are listed with a count of 0
+                counts = counts[counts > 0]
+                self._add_counts(col, zip(counts.index.tolist(), counts.tolist()))
+        self.n_rows += len(df)
+        return self
+
+    def merge(self, other):
+        """Merges an accumulator built over another partition into this one.
+
+        Parameters
+        ----------
+        other : SummaryAccumulator
+            accumulator over the same variables
+
+        Returns
+        -------
+        self : SummaryAccumulator
+        """
+        if not isinstance(other, SummaryAccumulator):
+            raise TypeError("other must be a SummaryAccumulator object")
+        if other.numeric_columns is None:
+            return self
+        if self.numeric_columns is None:
+            self._init_columns(other.numeric_columns, other.categorical_columns)
+        elif (other.numeric_columns != self.numeric_columns
+              or other.categorical_columns != self.categorical_columns):
+            raise ValueError("Cannot merge accumulators over different variables")
+        if other.approximate != self.approximate:
+            raise ValueError("Cannot merge exact and approximate accumulators")
+
+        self.moments.merge(other.moments)
+        for col in self.numeric_columns:
+            self.sketches[col].merge(other.sketches[col])
+        for col in self.categorical_columns:
+            if col in other.distinct and col not in self.distinct:
+                self._approximate(col)
+            if col in self.distinct:
+                if col not in other.distinct:
+                    self.value_counts[col] += sum(other.value_counts[col].values())
+                    self.distinct[col].update(pd.Series(list(other.value_counts[col]), dtype=object))
+                else:
+                    self.value_counts[col] += other.value_counts[col]
+                    self.distinct[col].merge(other.distinct[col])
+            else:
+                self._add_counts(col, other.value_counts[col].items())
+        self.n_rows += other.n_rows
+        return self
+
+    def _init_columns(self, numeric, categorical):
+        self.numeric_columns = list(numeric)
+        self.categorical_columns = list(categorical)
+        self.moments = RunningMoments(numeric)
+        self.sketches = {col: QuantileSketch(self.k) for col in numeric}
+        if self.approximate:
+            self.value_counts = {col: 0 for col in categorical}
+            self.distinct = {col: HyperLogLog(self.error) for col in categorical}
+        else:
+            self.value_counts = {col: Counter() for col in categorical}
+            self.distinct = {}
+
+    def _add_counts(self, col, items):
+        # only the keys of the new values are touched, so an update costs
+        # time in proportion to the batch rather than to the values seen
+        counts = self.value_counts[col]
+        for value, count in items:
+            counts[value] += count
+        if len(counts) > self.max_values:
+            self._approximate(col)
+
+    def _approximate(self, col):
+        """Replaces the exact value counts of a variable by a HyperLogLog
+        sketch of its values."""
+        counts = self.value_counts[col]
+        self.distinct[col] = HyperLogLog(self.error).update(pd.Series(list(counts), dtype=object))
+        self.value_counts[col] = sum(counts.values())
+
+    def top_values(self, col):
+        """Exact value counts of a categorical variable by decreasing count,
+        or None once the variable is only sketched."""
+        if col in self.distinct:
+            return None
+        counts = self.value_counts[col]
+        return pd.Series(list(counts.values()), index=list(counts), dtype=np.int64).sort_values(
+            ascending=False, kind="mergesort")
+
+    def result(self, threshold=0.8):
+        """Returns the summary in the same form as summary_suggestions.
+
+        Parameters
+        ----------
+        threshold : float
+            threshold for considering dropping variables with high unique values
+
+        Returns
+        -------
+        results : list
+            List of summary dataframes
+        """
+        _check_threshold(threshold)
+        if self.numeric_columns is None:
+            raise ValueError("No data has been added to the accumulator")
+
+        numeric_summary_df = pd.DataFrame(
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+            columns=self.numeric_columns,
+            dtype=float,
+        )
+        if self.numeric_columns:
+            numeric_summary_df.loc["count"] = self.moments.count.astype(float)
+            numeric_summary_df.loc["mean"] = np.where(
+                self.moments.count > 0, self.moments.mean, np.nan)
+            numeric_summary_df.loc["std"] = self.moments.std(ddof=1)
+            numeric_summary_df.loc["min"] = np.where(
+                self.moments.count > 0, self.moments.min, np.nan)
+            numeric_summary_df.loc[["25%", "50%", "75%"]] = np.column_stack(
+                [self.sketches[col].quantile([0.25, 0.5, 0.75]) for col in self.numeric_columns]
+            )
+            numeric_summary_df.loc["max"] = np.where(
+                self.moments.count > 0, self.moments.max, np.nan)
+
+        categorical_summary_df = pd.DataFrame(
+            index=["count", "unique", "top", "freq"],
+            columns=self.categorical_columns,
+            dtype=object,
+        )
+        for col in self.categorical_columns:
+            counts = self.top_values(col)
+            if counts is None:
+                categorical_summary_df[col] = _approximate_summary(
+                    {col: self.value_counts[col]}, {col: self.distinct[col]})[col]
+                continue
+            top, freq = (counts.index[0], counts.iloc[0]) if len(counts) else (np.nan, np.nan)
+            categorical_summary_df[col] = [counts.sum(), len(counts), top, freq]
+
+        if not self.distinct:
+            return _suggestions(numeric_summary_df, categorical_summary_df, self.n_rows, threshold)
+        # exactly counted variables have no error
+        return _suggestions(
+            numeric_summary_df, categorical_summary_df, self.n_rows, threshold,
+            errors={col: self.distinct[col].error if col in self.distinct else 0.0
+                    for col in self.categorical_columns},
+        )
+
+
+def _check_threshold(threshold):
+    """Validates the unique value threshold."""
     if not ((type(threshold) == float) | (type(threshold) == int)):
         raise TypeError("Input threshold must be a float value between 0 and 1")
 
     if not (0 < threshold < 1):
         raise TypeError("Input threshold must be a float value between 0 and 1")
 
-    numeric_summary_df = df.select_dtypes(include=np.number).describe()
-    categorical_summary_df = df.select_dtypes(include=np.object_).describe()
 
+def _approximate_summary(counts, sketches):
+    """Categorical summary with HyperLogLog estimates of the unique values."""
+    categorical_summary_df = pd.DataFrame(
+        index=["count", "unique", "top", "freq"], columns=list(sketches), dtype=object
+    )
+    for col, sketch in sketches.items():
+        # an estimate can never exceed the number of non-null values
+        unique = min(sketch.estimate(), counts[col])
+        categorical_summary_df[col] = [counts[col], unique, np.nan, np.nan]
+    return categorical_summary_df
+
+
+def _suggestions(numeric_summary_df, categorical_summary_df, n_rows, threshold, errors=None):
+    """Assembles the four-part result of summary_suggestions.
+
+    When errors (relative standard error per variable) is given, the
+    proportion of unique values gets an "error" row with its standard error.
+    """
+    with span("summary_suggestions.suggestions", n_rows, categorical_summary_df.shape[1]):
+        return _assemble(numeric_summary_df, categorical_summary_df, n_rows, threshold, errors)
+
+
+def _assemble(numeric_summary_df, categorical_summary_df, n_rows, threshold, errors):
     results = []
     results.extend([numeric_summary_df, categorical_summary_df])
 
-    unique_val_df = categorical_summary_df[categorical_summary_df.index == 'unique']/len(df)
+    unique_val_df = categorical_summary_df[categorical_summary_df.index == 'unique']/n_rows
+    if errors is not None:
+        error_row = unique_val_df.loc[['unique']].rename(index={'unique': 'error'})
+        for col in unique_val_df.columns:
+            error_row[col] = error_row[col] * errors[col]
+        unique_val_df = pd.concat([unique_val_df, error_row])
     filtered_unique_val_df = unique_val_df.loc['unique'] > threshold
     unique_val_vars = [*filter(filtered_unique_val_df.get, filtered_unique_val_df.index)]
 
     results.extend([unique_val_df, unique_val_vars])
     return results
-    
\ No newline at end of file
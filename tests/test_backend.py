@@ -0,0 +1,126 @@
+import logging
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.backend import (
+    clean_up_partitioned, correlation_matrix_partitioned, partitions,
+    summary_suggestions_partitioned, tree_reduce,
+)
+from pyeasyeda.clean_up import clean_up
+from pyeasyeda.summary_suggestions import summary_suggestions
+
+
+def _penguins():
+    penguins = pd.read_csv("tests/data/penguins_test.csv")
+    penguins.loc[0, "body_mass_g"] = 60000
+    return penguins
+
+
+def test_tree_reduce():
+    """Tests that every partial result is combined once."""
+
+    assert tree_reduce(lambda a, b: a + b, [[i] for i in range(7)]) == list(range(7))
+    with pytest.raises(ValueError):
+        tree_reduce(lambda a, b: a + b, [])
+
+
+def test_partitioned_matches_pandas(tmp_path, caplog):
+    """Tests the partitioned functions against the pandas path."""
+
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    penguins = _penguins()
+    shards = [penguins.iloc[i:i + 60] for i in range(0, len(penguins), 60)]
+    for i, shard in enumerate(shards):
+        shard.to_csv(tmp_path / f"part-{i:02d}.csv", index=False)
+
+    expected = clean_up(penguins)
+    report = caplog.messages
+    for source, backend in [(shards, "serial"), (tmp_path, "serial"), (shards, "processes")]:
+        caplog.clear()
+        result = clean_up_partitioned(source, backend=backend, n_jobs=2)
+        assert caplog.messages == report, "Outlier report differs from clean_up"
+        pd.testing.assert_frame_equal(result, expected)
+
+    corr = penguins.select_dtypes("number").corr()
+    result = correlation_matrix_partitioned(tmp_path, backend="processes", n_jobs=2)
+    pd.testing.assert_frame_equal(result, corr)
+
+    expected = summary_suggestions(penguins)
+    result = summary_suggestions_partitioned(shards, backend="serial")
+    pd.testing.assert_frame_equal(result[0], expected[0])
+    assert (result[1] == expected[1]).all().all()
+    assert result[3] == expected[3]
+
+
+def test_partitioned_integers(caplog):
+    """Tests that integer outliers are logged as integers, as clean_up does."""
+
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    df = pd.DataFrame({"a": list(range(100)) + [10 ** 9], "b": np.linspace(0, 1, 101)})
+    clean_up(df)
+    report = caplog.messages
+    caplog.clear()
+    clean_up_partitioned([df.iloc[:50], df.iloc[50:]], backend="serial")
+    assert caplog.messages == report, "Outlier report differs from clean_up"
+    assert "[1000000000]" in "\n".join(report)
+
+
+def test_partitioned_output(tmp_path, caplog):
+    """Tests that the workers write the clean partitions themselves."""
+
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    penguins = _penguins()
+    shards = [penguins.iloc[i:i + 60] for i in range(0, len(penguins), 60)]
+    expected = clean_up(penguins)
+    report = caplog.messages
+
+    caplog.clear()
+    result = clean_up_partitioned(shards, backend="processes", n_jobs=2,
+                                  output=tmp_path / "clean", fmt="csv")
+    assert caplog.messages == report, "Outlier report differs from clean_up"
+    assert result["files"] == [str(tmp_path / "clean" / f"part-{i:05d}.csv") for i in range(len(shards))]
+    assert result["rows"] == len(penguins) and result["clean_rows"] == len(expected)
+    assert result["outliers"].counts["body_mass_g"] == 1
+    written = pd.concat([pd.read_csv(path) for path in result["files"]], ignore_index=True)
+    pd.testing.assert_frame_equal(written, expected)
+
+
+def test_partitioned_dask(caplog):
+    """Tests the Dask backend on a Dask DataFrame."""
+
+    dd = pytest.importorskip("dask.dataframe")
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    penguins = _penguins()
+    ddf = dd.from_pandas(penguins, npartitions=3)
+
+    expected = clean_up(penguins)
+    report = caplog.messages
+    caplog.clear()
+    pd.testing.assert_frame_equal(clean_up_partitioned(ddf), expected)
+    assert caplog.messages == report, "Outlier report differs from clean_up"
+
+    corr = correlation_matrix_partitioned(ddf, backend="dask")
+    pd.testing.assert_frame_equal(corr, penguins.select_dtypes("number").corr())
+    result = summary_suggestions_partitioned(ddf)
+    pd.testing.assert_frame_equal(result[0], summary_suggestions(penguins)[0])
+
+    # the partitions of a Dask DataFrame are not files or frames
+    with pytest.raises(ValueError):
+        clean_up_partitioned(ddf, backend="processes")
+
+
+def test_partitioned_error(tmp_path):
+    """Tests the checks on partitions and backends."""
+
+    with pytest.raises(TypeError):
+        partitions(1)
+    with pytest.raises(TypeError):
+        partitions([1, 2])
+    with pytest.raises(FileNotFoundError):
+        partitions(tmp_path)
+    with pytest.raises(ValueError):
+        clean_up_partitioned([_penguins()], backend="threads")
+    with pytest.raises(TypeError):
+        clean_up_partitioned([_penguins()], backend="processes", n_jobs=0)
+    with pytest.raises(ValueError):
+        clean_up_partitioned([_penguins()], output=tmp_path, fmt="json")
@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 import pytest
 from pytest import raises
 from pyeasyeda import birds_eye_view as pye
+from pyeasyeda.close_up import close_up
+from pyeasyeda.context import AnalysisContext
 
 
 def test_birds_eye_view_error():
@@ -63,8 +65,8 @@ def test_birds_eye_view_outputs():
 
     # Tests that the correct amount of visualizations generated
     assert (
-        len(viz) == 3
-    ),"Number of items in the viz dictionary should be 3"
+        len(viz) == 4
+    ),"Number of items in the viz dictionary should be 4"
     assert (
         len(viz["histograms"]) == 3
     ), "Number of items in the 'histograms' key should be 3"
@@ -91,8 +93,14 @@ def test_birds_eye_view_outputs():
 
     # Tests that the correct amount of visualizations generated
     assert (
-        len(viz_custom) == 3
-    ), "Number of items in the viz dictionary should be 3"
+        len(viz_custom) == 4
+    ), "Number of items in the viz dictionary should be 4"
+    assert (
+        set(viz_custom["distributions"]) == {"price", "weight"}
+    ), "Histogram data should be returned for each plotted numeric variable"
+    assert (
+        viz_custom["distributions"]["price"]["counts"].sum() == 6
+    ), "Histogram counts should cover every row"
     assert (
         len(viz_custom["histograms"]) == 2
     ), "Number of items in the 'histograms' key should be 2"
@@ -101,4 +109,61 @@ def test_birds_eye_view_outputs():
     ), "Number of items in the 'bar_charts' key should be 1"
     assert (
         "heatmap" in viz_custom.keys()
-    ), "There should be a 'heatmap' key in the viz dictionary"
\ No newline at end of file
+    ), "There should be a 'heatmap' key in the viz dictionary"
+
+def test_render_birds_eye_view(tmp_path):
+    """tests the headless batch rendering of birds_eye_view"""
+
+    data = {
+        "product_name": ["laptop", "printer", "tablet", "laptop", "printer", "laptop"],
+        "serial": ["a1", "a2", "a3", "a4", "a5", "a6"],
+        "price": [1200, 150, 300, 450, 200, 1000],
+        "weight": [200, 500, 700, 100, 1000, 800],
+    }
+    eda = pd.DataFrame(data)
+    eda = pd.concat([eda, eda.assign(serial=list("bcdefg"))], ignore_index=True)
+
+    open_figures = plt.get_fignums()
+    images = pye.render_birds_eye_view(eda)
+
+    # Images are returned as bytes and no pyplot figure is left open
+    assert plt.get_fignums() == open_figures, "Batch rendering should not use pyplot figures"
+    assert set(images["histograms"]) == {"price", "weight"}, "One histogram per numeric variable"
+    assert set(images["bar_charts"]) == {"product_name"}, "One bar chart per categorical variable"
+    assert images["skipped"] == ["serial"], "Variables with too many unique values are skipped"
+    assert images["heatmap"].startswith(b"\x89PNG"), "Images should be PNG bytes"
+
+    # Files written by a pool of worker processes
+    files = pye.render_birds_eye_view(eda, var_list=["price", "product_name"],
+                                      output_dir=tmp_path, fmt="svg", n_jobs=2)
+    assert files["histograms"]["price"] == str(tmp_path / "histogram_price.svg")
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "bar_chart_product_name.svg", "heatmap.svg", "histogram_price.svg"
+    ], "One file per plot"
+
+    # rank correlations in the heatmap, shared with close_up through the context
+    context = AnalysisContext()
+    spearman = pye.render_birds_eye_view(eda, context=context, method="spearman")
+    assert spearman["heatmap"] != images["heatmap"], "Heatmap should show Spearman's rho"
+    close_up(eda, context=context, method="spearman")
+    assert context.hits >= 1, "The Spearman matrix should be reused"
+
+    # names that sanitize to the same file name do not overwrite each other
+    clash = pd.DataFrame({"price ($)": eda["price"], "price (€)": eda["weight"]})
+    files = pye.render_birds_eye_view(clash, output_dir=tmp_path / "clash", fmt="svg")
+    assert files["histograms"] == {
+        "price ($)": str(tmp_path / "clash" / "histogram_price_.svg"),
+        "price (€)": str(tmp_path / "clash" / "histogram_price__2.svg"),
+    }, "Clashing file names should get an index suffix"
+
+    with raises(ValueError):
+        pye.render_birds_eye_view(eda, fmt="jpg")
+
+    with raises(ValueError):
+        pye.render_birds_eye_view(eda, method="rank")
+
+    with raises(TypeError):
+        pye.render_birds_eye_view(eda, n_jobs=0)
+
+    with raises(TypeError):
+        pye.render_birds_eye_view(eda, var_list=["notreal"])
@@ -0,0 +1,71 @@
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.categorical import profile_categoricals, summarize_profiles
+from pyeasyeda.context import AnalysisContext
+
+
+def test_profile_categoricals():
+    """Tests value counts, the cardinality cap and the describe table."""
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "few": rng.choice(["b", "a", "c"], 1000),
+        "holes": np.r_[rng.choice(["x", "y"], 990), [None] * 10],
+        "ids": [f"id{i}" for i in range(1000)],
+        "empty": pd.Series([None] * 1000, dtype=object),
+        "number": rng.normal(size=1000),
+    })
+
+    profiles = profile_categoricals(df)
+    assert list(profiles) == ["few", "holes", "ids", "empty"], \
+        "Only categorical variables should be profiled"
+    for col, profile in profiles.items():
+        expected = df[col].value_counts()
+        assert not profile.truncated
+        assert profile.n_unique == len(expected)
+        assert profile.count == df[col].count()
+        assert profile.counts.sort_index().equals(expected.sort_index()), \
+            "Value counts differ from pandas"
+
+    summary = summarize_profiles(profiles)
+    expected = df.describe(include=object)
+    pd.testing.assert_frame_equal(summary, expected)
+
+    capped = profile_categoricals(df, max_unique=11, chunk_rows=100)
+    assert capped["ids"].truncated and capped["ids"].counts is None, \
+        "A high-cardinality variable should be truncated"
+    assert capped["ids"].n_unique > 11 and capped["ids"].count == 1000
+    assert capped["few"].counts.to_dict() == profiles["few"].counts.to_dict(), \
+        "Counts below the cap should be complete"
+    assert list(capped["few"].counts.index) == list(pd.unique(df["few"])), \
+        "Values should keep their order of first appearance"
+    with pytest.raises(ValueError):
+        capped["ids"].describe()
+
+
+def test_profile_shared_by_context():
+    """Tests that a full profile also serves capped requests."""
+
+    df = pd.DataFrame({"a": list("abcabc"), "b": list("uvwxyz")})
+    context = AnalysisContext()
+    cache = context.view(df)
+    full = cache.categorical_profile()
+    assert cache.categorical_profile(max_unique=3) is full, \
+        "The uncapped profile should be reused"
+    assert context.misses == 2 and context.hits == 2
+
+    cache = AnalysisContext().view(df)
+    assert cache.categorical_profile(max_unique=3)["b"].truncated
+
+
+def test_profile_categoricals_error():
+    """Tests the input checks."""
+
+    df = pd.DataFrame({"a": list("abc")})
+    with pytest.raises(TypeError):
+        profile_categoricals(df.to_numpy())
+    with pytest.raises(TypeError):
+        profile_categoricals(df, max_unique=-1)
+    with pytest.raises(TypeError):
+        profile_categoricals(df, chunk_rows=0)
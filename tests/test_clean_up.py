@@ -1,14 +1,20 @@
+import logging
 import pandas as pd
 import numpy as np
 import pytest
 from pytest import raises
 from scipy import stats
-import io
-import sys
-from pyeasyeda.clean_up import clean_up
+from pyeasyeda.clean_up import clean_up, clean_up_stream
 
 
-def test_clean_up():
+def _logged(caplog):
+    """Returns the messages logged since the last call."""
+    messages = "\n".join(caplog.messages)
+    caplog.clear()
+    return messages
+
+
+def test_clean_up(caplog):
     """tests the new dataset and output outliers of clean_up from a toy dataset."""
     
     # Load toy dataset
@@ -33,20 +39,15 @@ def test_clean_up():
         clean_up(df), clean
     ), "The returned dataframe using clean_up is not correct"
     
-    # Create StringIO object
-    capturedOutput = io.StringIO()
-    
-    # Redirect stdout
-    sys.stdout = capturedOutput
+    # Capture the logged outlier report
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    caplog.clear()
     
     # Call clean_up on toy dataset
     clean_up(df)
     
-    # Reset redirect
-    sys.stdout = sys.__stdout__
-    
-    # Store print output in statement as a string
-    statement = str(capturedOutput.getvalue())
+    # Store the log output in statement as a string
+    statement = _logged(caplog)
     
     # Check if the statement contains the correct outliers
     assert (
@@ -55,6 +56,9 @@ def test_clean_up():
     assert (
         '150000' in statement
     ), "Outlier should contain 150000"
+    assert statement.startswith(
+        "Dropped 2 of 13 rows with missing values; most missing: price (1), number_of_reviews (1)"
+    ), "Dropped rows should be reported"
 
 def test_clean_up_error():
     """Check TypeError and ValueError raised when inputs are not appropriate."""
@@ -71,3 +75,103 @@ def test_clean_up_error():
     # Tests if the input is not dataframe
     with raises (TypeError):
         clean_up("not dataframe")
+
+
+def test_clean_up_compact(caplog):
+    """Checks that compaction keeps the values and the outlier report."""
+
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    penguins = pd.read_csv("tests/data/penguins_test.csv")
+    expected = clean_up(penguins)
+    report = _logged(caplog)
+
+    compact = clean_up(penguins, compact=True)
+    output = _logged(caplog)
+    assert output.startswith(report), "Outliers should be flagged on the original values"
+    assert "Compacted the clean dataframe from" in output
+    assert compact["species"].dtype == "category"
+    assert compact.memory_usage(deep=True).sum() < expected.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(compact.astype(expected.dtypes.to_dict()), expected)
+
+    with raises(TypeError):
+        clean_up(penguins, compact="yes")
+
+
+def test_clean_up_modes(caplog):
+    """Checks that the mask and in-place modes match the copy mode."""
+
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    penguins = pd.read_csv("tests/data/penguins_test.csv")
+    penguins.index = penguins.index * 2
+    expected = clean_up(penguins)
+    report = _logged(caplog)
+
+    mask = clean_up(penguins, mode="mask")
+    assert _logged(caplog) == report, "Outlier report differs with a mask"
+    assert mask.dtype == np.bool_ and len(mask) == len(penguins)
+    assert np.array_equal(mask, penguins.notna().all(axis=1).to_numpy())
+    pd.testing.assert_frame_equal(penguins[mask].reset_index(drop=True), expected)
+
+    df = penguins.copy()
+    result = clean_up(df, mode="inplace")
+    assert _logged(caplog) == report, "Outlier report differs in place"
+    assert result is df, "The input should be modified in place"
+    pd.testing.assert_frame_equal(df, expected)
+
+    with raises(ValueError):
+        clean_up(penguins, mode="view")
+
+    with raises(ValueError):
+        clean_up(penguins, mode="mask", compact=True)
+
+
+def test_clean_up_stream(tmp_path, caplog):
+    """Checks the chunked clean_up against the in-memory version."""
+
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    penguins = pd.read_csv("tests/data/penguins_test.csv")
+    penguins.loc[0, "body_mass_g"] = 60000
+
+    clean_up(penguins)
+    expected = _logged(caplog)
+
+    # A list of chunks, a one-shot iterator and a CSV file give the same report
+    chunks = [penguins.iloc[i:i + 50] for i in range(0, len(penguins), 50)]
+    clean_up_stream(chunks)
+    assert _logged(caplog) == expected, "Outlier report differs for a list of chunks"
+
+    outliers = clean_up_stream(iter(chunks))
+    assert _logged(caplog) == expected, "Outlier report differs for an iterator of chunks"
+    assert list(outliers["body_mass_g"]) == [60000], "Outlier should contain 60000"
+
+    csv_path = tmp_path / "penguins.csv"
+    out_path = tmp_path / "penguins_clean.csv"
+    penguins.to_csv(csv_path, index=False)
+    clean_up_stream(csv_path, output=out_path, chunksize=64)
+    assert _logged(caplog) == expected, "Outlier report differs for a CSV file"
+
+    # The written rows are the rows without NaN's
+    written = pd.read_csv(out_path)
+    assert len(written) == len(penguins.dropna()), "Rows with NaN's should be dropped"
+    assert written.isna().sum().sum() == 0, "Written rows should not contain NaN's"
+
+    pytest.importorskip("pyarrow")
+    parquet_path = tmp_path / "penguins_clean.parquet"
+    clean_up_stream(csv_path, output=parquet_path, chunksize=64)
+    assert len(pd.read_parquet(parquet_path)) == len(penguins.dropna())
+
+
+def test_clean_up_stream_error():
+    """Check errors raised when inputs to clean_up_stream are not appropriate."""
+
+    with raises(TypeError):
+        clean_up_stream(1)
+
+    with raises(TypeError):
+        clean_up_stream([1, 2])
+
+    with raises(TypeError):
+        clean_up_stream([], chunksize=0)
+
+    with raises(FileNotFoundError):
+        clean_up_stream("not_a_file.csv")
@@ -0,0 +1,37 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+from pyeasyeda.cli import main
+
+
+def test_cli(tmp_path, capsys):
+    """Tests the command line report and its cache."""
+
+    pytest.importorskip("pyarrow")
+    df = pd.read_csv("tests/data/penguins_test.csv")
+    path = tmp_path / "penguins.parquet"
+    df.to_parquet(path)
+    args = [str(path), "--output-dir", str(tmp_path / "out"),
+            "--cache-dir", str(tmp_path / "cache"), "--no-images"]
+
+    assert main(args) == 0
+    assert "(cached)" not in capsys.readouterr().out
+    profile = json.loads((tmp_path / "out" / "profile.json").read_text())
+    assert profile["rows"] == len(df)
+    assert (tmp_path / "out" / "report.html").read_text().startswith("<!DOCTYPE html>")
+
+    (tmp_path / "out" / "profile.json").unlink()
+    assert main(args) == 0
+    assert "(cached)" in capsys.readouterr().out, "Unchanged input should be served from the cache"
+    assert json.loads((tmp_path / "out" / "profile.json").read_text()) == profile
+
+    df.iloc[:100].to_parquet(path)
+    os.utime(path, ns=(0, 0))
+    assert main(args) == 0
+    assert "(cached)" not in capsys.readouterr().out, "A rewritten file should be profiled again"
+    assert json.loads((tmp_path / "out" / "profile.json").read_text())["rows"] == 100
+
+    assert main([str(tmp_path / "missing.csv"), "--no-cache"]) == 1
+    assert "error" in capsys.readouterr().err
@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
 import altair as alt
-from pyeasyeda.close_up import close_up
+from pyeasyeda.close_up import close_up, prune_correlated, top_correlated_pairs, _top_pairs
+from pyeasyeda.context import AnalysisContext
 import pytest
 
 
@@ -32,8 +33,92 @@ def test_close_up():
 
     assert len(fig.vconcat) == 4, "Incorrect number of subplots!"
 
-    assert (fig.data == df).sum().sum(
-    ) == 30, "Data used in plot is different."
+    # each subplot only embeds the two variables it plots
+    for subplot in fig.vconcat:
+        for layer in subplot.layer:
+            assert layer.data.shape[1] == 2, "Data used in plot should have two columns."
+    points = fig.vconcat[0].layer[0].data
+    assert (points == df[points.columns]).all().all(), "Data used in plot is different."
+
+
+def test_close_up_large():
+    """Tests that charts of large dataframes stay small."""
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=200000)
+    big = pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(size=200000),
+        "z": rng.normal(size=200000),
+        "label": "a",
+    })
+
+    # sampled scatterplot below the density threshold
+    fig = close_up(big.iloc[:50000], 1)
+    points, line = fig.layer
+    assert len(points.data) == 5000, "Points should be sampled down to max_points"
+    assert points.data.equals(close_up(big.iloc[:50000], 1).layer[0].data), "Sample should be reproducible"
+    assert len(line.data) == 2, "Trend line should be embedded as two end points"
+    slope = np.diff(line.data["y"]) / np.diff(line.data["x"])
+    assert np.isclose(slope[0], 2, atol=0.05), "Trend line should be fit on all rows"
+
+    # binned density above it, with a bounded spec
+    fig = close_up(big, 2)
+    spec = fig.to_json()
+    assert len(spec) < 1_000_000, "Spec should stay small"
+    assert "count" in fig.vconcat[0].layer[0].data.columns, "Large pairs should be binned"
+
+
+def test_close_up_rank():
+    """Tests the rank correlations and the sampled intervals."""
+
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=20000)
+    df = pd.DataFrame({
+        # monotonic but far from linear
+        "x": x,
+        "y": np.exp(4 * x),
+        "z": x + rng.normal(scale=0.5, size=20000),
+    })
+    assert top_correlated_pairs(df, 1)[0][:2] == ("x", "z")
+    for method in ["spearman", "kendall"]:
+        pair = top_correlated_pairs(df, 1, method=method)[0]
+        assert pair[:2] == ("x", "y") and np.isclose(pair[2], 1), method + " should rank x and y first"
+
+    fig = close_up(df, 2, method="spearman", sample=2000)
+    assert fig.vconcat[0].layer[0].title.startswith("coeff: 1.000 (95% CI"), "Titles should show the interval"
+    title = fig.vconcat[1].layer[0].title
+    lower, upper = [float(bound) for bound in title.rstrip(")").split("CI ")[1].split(" to ")]
+    assert lower < df.corr(method="spearman").loc["x", "z"] < upper, "Interval should cover all rows"
+
+
+def test_prune_correlated():
+    """Tests the clusters of redundant variables against brute force."""
+
+    rng = np.random.default_rng(2)
+    base = rng.normal(size=(500, 6))
+    values = base.repeat([3, 1, 2, 1, 4, 1], axis=1) + rng.normal(scale=0.05, size=(500, 12))
+    df = pd.DataFrame(values, columns=[f"x{i}" for i in range(12)])
+    df["label"] = "a"
+    # a chain: x13 is only linked to x0 through x12
+    df["x12"] = df["x0"] + rng.normal(scale=0.4, size=500)
+    df["x13"] = df["x12"] + rng.normal(scale=0.4, size=500)
+    assert abs(df["x0"].corr(df["x13"])) < 0.9
+    df.loc[:4, "x0"] = np.nan
+
+    context = AnalysisContext()
+    columns, dropped = prune_correlated(df, threshold=0.9, context=context, block_size=4)
+    assert columns == ["x1", "x3", "x4", "x6", "x7", "x11", "label"], "One variable should be kept per cluster"
+    assert dropped == {"x0": "x1", "x2": "x1", "x12": "x1", "x13": "x1", "x5": "x4",
+                       "x8": "x7", "x9": "x7", "x10": "x7"}, "Each dropped variable maps to its cluster"
+
+    # the correlation matrix is shared with close_up
+    close_up(df, context=context)
+    assert context.hits >= 1
+
+    assert prune_correlated(df, threshold=1.0)[1] == {}
+    with pytest.raises(TypeError):
+        prune_correlated(df, threshold=0)
 
 
 def test_close_up_error():
@@ -59,3 +144,60 @@ def test_close_up_error():
     with pytest.raises(ValueError):
         big_int = 10
         close_up(df, n=big_int)
+
+    with pytest.raises(TypeError):
+        close_up(df, max_points=0)
+
+
+def test_top_correlated_pairs():
+    """Tests top_correlated_pairs against a brute-force ranking."""
+
+    toy_data = {
+        "income": [5, 8, 10, 12, 17, 19],
+        "house_size": [700, 600, 900, 1000, 1200, 1500],
+        "views": ["mountain", "river", "sea", "mountain", "urban", "forest"],
+        "price": [65, 50, 80, 98.5, 112, 133],
+        "doctor_visits": [6, 8, 4, 5, 3, 2],
+    }
+    df = pd.DataFrame(toy_data)
+    corr = df.select_dtypes(include=np.number).corr()
+
+    pairs = top_correlated_pairs(df, 6)
+    assert len(pairs) == 6, "Incorrect number of pairs"
+    expected = sorted(
+        [(a, b, corr.loc[a, b]) for i, a in enumerate(corr) for b in corr.columns[i + 1:]],
+        key=lambda pair: -abs(pair[2]),
+    )
+    assert [p[:2] for p in pairs] == [p[:2] for p in expected], "Pairs are not ranked correctly"
+    assert np.allclose([p[2] for p in pairs], [p[2] for p in expected]), "Signed coefficients differ"
+
+    # Ties are broken by variable position and small blocks give the same answer
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=50)
+    wide = pd.DataFrame({f"x{i}": base for i in range(5)})
+    wide["noise"] = rng.normal(size=50)
+    tied = _top_pairs(wide.corr(), 3, block_size=2)
+    assert [p[:2] for p in tied] == [("x0", "x1"), ("x0", "x2"), ("x0", "x3")], \
+        "Ties should be broken deterministically"
+
+    # NaN coefficients (constant variables) are left out
+    df["constant"] = 1
+    assert [p[:2] for p in top_correlated_pairs(df, 6)] == [p[:2] for p in expected]
+    assert len(top_correlated_pairs(df, 10)) == 6, "Pairs without a coefficient should be dropped"
+    constants = wide.assign(**{f"c{i}": 1.0 for i in range(20)})
+    assert [p[:2] for p in _top_pairs(constants.corr(), 3, block_size=4)] == [p[:2] for p in tied]
+
+    with pytest.raises(ValueError):
+        top_correlated_pairs(df, 0)
+
+    with pytest.raises(ValueError):
+        top_correlated_pairs(df, 100)
+
+    with pytest.raises(TypeError):
+        top_correlated_pairs(df.to_numpy(), 1)
+
+    with pytest.raises(ValueError):
+        close_up(df, method="rank")
+
+    with pytest.raises(TypeError):
+        close_up(df, sample=0)
@@ -0,0 +1,146 @@
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.context import AnalysisContext, column_fingerprints, fingerprint
+from pyeasyeda.disk_cache import DiskCache
+from pyeasyeda.clean_up import clean_up
+from pyeasyeda.close_up import close_up, top_correlated_pairs
+from pyeasyeda.summary_suggestions import summary_suggestions
+
+
+def test_analysis_context():
+    """Tests that results are shared, reused and invalidated."""
+
+    toy_data = {
+        "income": [5, 8, 10, 12, 17, 19],
+        "house_size": [700, 600, 900, 1000, 1200, 1500],
+        "views": ["mountain", "river", "sea", "mountain", "urban", "forest"],
+        "price": [65, 50, 80, 98.5, 112, 133],
+        "doctor_visits": [6, 8, 4, 5, 3, 2],
+    }
+    df = pd.DataFrame(toy_data)
+    context = AnalysisContext()
+
+    # The correlation matrix is computed once for close_up and top_correlated_pairs
+    close_up(df, 2, context=context)
+    misses = context.misses
+    pairs = top_correlated_pairs(df, 2, context=context)
+    assert context.misses == misses, "Correlation matrix should be reused"
+    assert context.hits > 0, "Cache hits should be counted"
+    assert pairs == top_correlated_pairs(df, 2), "Cached results should match uncached ones"
+
+    # Cached summaries match the uncached function
+    results = summary_suggestions(df, context=context)
+    again = summary_suggestions(df, context=context)
+    assert results[0].equals(summary_suggestions(df)[0]), "Cached summary differs"
+    assert again[3] == results[3] == ["views"]
+
+    clean_up(df, context=context)
+    hits = context.hits
+    clean_up(df, context=context)
+    assert context.hits == hits + 1, "Outlier report should be reused"
+
+    # Modifying the frame in place changes its fingerprint
+    df.loc[0, "income"] = 100
+    corr = context.view(df).corr()
+    assert np.isclose(corr.loc["income", "price"], df[["income", "price"]].corr().iloc[0, 1]), \
+        "Modified frame should not be served stale results"
+
+    # Identity-only lookups require explicit invalidation
+    trusting = AnalysisContext(verify=False)
+    trusting.view(df).corr()
+    df.loc[0, "income"] = 5
+    trusting.invalidate(df)
+    assert np.isclose(trusting.view(df).corr().loc["income", "price"],
+                      df[["income", "price"]].corr().iloc[0, 1])
+
+    # Least recently used frames are evicted
+    small = AnalysisContext(maxsize=2)
+    frames = [df.copy() for _ in range(3)]
+    for frame in frames:
+        small.view(frame).numeric_columns()
+    assert len(small._entries) == 2, "Cache should hold at most maxsize frames"
+    small.invalidate()
+    assert len(small._entries) == 0, "invalidate() should clear every frame"
+
+
+def test_fingerprints():
+    """Tests that column fingerprints only change with their column."""
+
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    before = column_fingerprints(df)
+    whole = fingerprint(df)
+    df.loc[0, "b"] = "w"
+    after = column_fingerprints(df)
+    assert before["a"] == after["a"], "Unchanged column should keep its fingerprint"
+    assert before["b"] != after["b"], "Changed column should get a new fingerprint"
+    assert fingerprint(df) != whole, "Frame fingerprint should change"
+
+
+def test_analysis_context_error():
+    """Check TypeError raised when inputs are not appropriate."""
+
+    df = pd.DataFrame({"a": [1, 2, 3], "b": [3, 1, 2]})
+
+    with pytest.raises(TypeError):
+        AnalysisContext(maxsize=-1)
+
+    with pytest.raises(TypeError):
+        AnalysisContext(verify="yes")
+
+    with pytest.raises(TypeError):
+        close_up(df, context="cache")
+
+    with pytest.raises(TypeError):
+        AnalysisContext(disk_cache=8)
+
+    with pytest.raises(ValueError):
+        AnalysisContext().view(df).describe("other")
+
+
+def test_disk_cache(tmp_path, capsys, monkeypatch):
+    """Tests results persisted across contexts and invalidated per column."""
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "a": rng.normal(size=200),
+        "b": rng.normal(size=200),
+        "c": rng.normal(size=200),
+        "label": rng.choice(["x", "y"], 200),
+    })
+    first = AnalysisContext(disk_cache=tmp_path)
+    expected = summary_suggestions(df, context=first)
+    pairs = top_correlated_pairs(df, 2, context=first)
+    clean_up(df, context=first)
+    assert first.disk_cache.stats()["entries"] == first.disk_cache.writes == 4
+
+    # a new context, as in another process, reads the results back
+    second = AnalysisContext(disk_cache=DiskCache(tmp_path))
+    results = summary_suggestions(df, context=second)
+    assert top_correlated_pairs(df, 2, context=second) == pairs
+    clean_up(df, context=second)
+    assert second.disk_cache.hits == 4 and second.disk_cache.misses == 0
+    pd.testing.assert_frame_equal(results[0], expected[0])
+    pd.testing.assert_frame_equal(results[1], expected[1])
+
+    # changing one column only invalidates the results computed from it
+    corr = second.view(df).corr(["a", "b"])
+    df.loc[0, "c"] = 10.0
+    third = AnalysisContext(disk_cache=tmp_path)
+    assert third.view(df).corr(["a", "b"]).equals(corr)
+    assert third.disk_cache.hits == 1
+    third.view(df).corr()
+    assert third.disk_cache.misses == 1
+
+    # the least recently used results are evicted beyond the size cap
+    small = DiskCache(tmp_path / "small", max_bytes=3000)
+    for i in range(3):
+        small.set(f"{i:032x}", np.zeros(200))
+    assert small.get(f"{0:032x}") is None and small.evictions == 2
+    assert small.get(f"{2:032x}") is not None
+    assert small.stats()["entries"] == 1
+
+    # without a context, PYEASYEDA_CACHE_DIR enables the disk cache
+    monkeypatch.setenv("PYEASYEDA_CACHE_DIR", str(tmp_path / "env"))
+    summary_suggestions(df)
+    assert DiskCache(tmp_path / "env").stats()["entries"] == 2
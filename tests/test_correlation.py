@@ -0,0 +1,133 @@
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.correlation import correlation_matrix, rank_correlation_matrix, sampled_correlation
+
+
+def test_correlation_matrix():
+    """Tests the blocked correlation engine against DataFrame.corr()."""
+
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(500, 1))
+    values = base + rng.normal(scale=[0.1, 0.5, 1, 2, 5, 10, 1, 1], size=(500, 8))
+    df = pd.DataFrame(values, columns=[f"x{i}" for i in range(8)])
+    df["constant"] = 3.0
+    df["label"] = "a"
+    expected = df.select_dtypes(include=np.number).corr()
+
+    # NaN-free fast path, with several blocks, chunks and threads
+    for kwargs in [{}, {"block_size": 3, "chunk_rows": 64}, {"block_size": 2, "n_jobs": 4}]:
+        result = correlation_matrix(df, **kwargs)
+        assert list(result.columns) == list(expected.columns), "Variables differ"
+        assert np.allclose(result, expected, atol=1e-12, equal_nan=True), "Correlations differ"
+
+    # Pairwise-complete path when there are NaN's
+    holes = df.copy()
+    holes = holes.mask(rng.random(holes.shape) < 0.2)
+    holes["label"] = "a"
+    holes.loc[:, "x7"] = np.nan
+    holes.loc[:2, "x7"] = [1.0, 2.0, 3.0]
+    expected = holes.select_dtypes(include=np.number).corr()
+    result = correlation_matrix(holes, block_size=3, chunk_rows=100, n_jobs=2)
+    assert np.allclose(result, expected, atol=1e-12, equal_nan=True), "Pairwise correlations differ"
+
+    # float32 and memory-mapped arrays
+    numeric = df.drop(columns="label")
+    as_float32 = numeric.astype(np.float32)
+    assert np.allclose(correlation_matrix(as_float32), as_float32.astype(float).corr(),
+                       atol=1e-12, equal_nan=True), "float32 correlations differ"
+    assert np.allclose(correlation_matrix(numeric.to_numpy()).to_numpy(), numeric.corr().to_numpy(),
+                       atol=1e-12, equal_nan=True), "Array correlations differ"
+
+    # nullable integer columns
+    nullable = numeric.round().astype("Int16")
+    nullable.iloc[:5, 0] = pd.NA
+    assert np.allclose(correlation_matrix(nullable), nullable.astype(float).corr(),
+                       atol=1e-12, equal_nan=True), "Nullable integer correlations differ"
+
+
+def test_correlation_matrix_memmap(tmp_path):
+    """Tests a memory-mapped float32 input."""
+
+    rng = np.random.default_rng(1)
+    mm = np.memmap(tmp_path / "values.dat", dtype=np.float32, mode="w+", shape=(1000, 5))
+    mm[:] = rng.normal(size=(1000, 5)).cumsum(axis=1)
+    result = correlation_matrix(mm, columns=[0, 2, 4], chunk_rows=128)
+    expected = pd.DataFrame(np.asarray(mm, dtype=float)[:, [0, 2, 4]]).corr()
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), atol=1e-12), "Memmap correlations differ"
+
+
+def test_rank_correlation_matrix():
+    """Tests the rank correlations against DataFrame.corr()."""
+
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(rng.integers(0, 10, size=(300, 4)).astype(float), columns=list("abcd"))
+    df["b"] += df["a"]
+    df["e"] = np.exp(rng.normal(size=300))
+    df = df.mask(rng.random(df.shape) < 0.1)
+    # the same NaN's, a constant and a variable with few distinct values
+    df["f"] = -df["a"]
+    df["g"] = 1.0
+    df["h"] = rng.integers(0, 3, 300).astype(float)
+    df["label"] = "a"
+
+    for method in ["spearman", "kendall"]:
+        expected = df.select_dtypes(include=np.number).corr(method=method).to_numpy()
+        for kwargs in [{}, {"block_size": 3, "chunk_rows": 100, "n_jobs": 2}]:
+            result = rank_correlation_matrix(df, method=method, **kwargs).to_numpy()
+            off = ~np.eye(len(result), dtype=bool)
+            assert np.allclose(result[off], expected[off], atol=1e-12, equal_nan=True), method + " differs"
+            assert np.isnan(result[6, 6]) and result[0, 0] == 1.0, "Constant variables have no correlation"
+
+    # arrays, ranked without NaN's
+    values = rng.normal(size=(2000, 4)).cumsum(axis=1)
+    for method in ["spearman", "kendall"]:
+        assert np.allclose(rank_correlation_matrix(values, columns=[0, 3], method=method).to_numpy(),
+                           pd.DataFrame(values[:, [0, 3]]).corr(method=method).to_numpy(), atol=1e-12)
+
+
+def test_sampled_correlation():
+    """Tests that the intervals cover the correlations of all rows."""
+
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=(20000, 6)).cumsum(axis=1)
+    # Fisher's intervals assume normal data for Pearson; the ranks are the
+    # same under any monotonic transformation
+    df = pd.DataFrame(values, columns=list("abcdef"))
+    for method in ["pearson", "spearman", "kendall"]:
+        expected = df.corr(method=method)
+        corr, lower, upper = sampled_correlation(df, method=method, sample=2000)
+        assert ((lower <= corr) & (corr <= upper)).all().all(), "Intervals should contain the estimate"
+        covered = ((lower <= expected) & (expected <= upper)).to_numpy()[np.triu_indices(6, 1)]
+        assert covered.mean() >= 0.8, method + " intervals should cover the full correlations"
+        assert (upper - lower).loc["a", "b"] < 0.1, "Intervals should narrow with 2000 rows"
+
+    # all rows are used below the sample size
+    corr, lower, upper = sampled_correlation(df, method="spearman", sample=len(df), confidence=0.99)
+    assert np.allclose(corr, df.corr(method="spearman"), atol=1e-12)
+    assert sampled_correlation(df.iloc[:3])[1].isna().all().all(), "Three rows give no interval"
+
+
+def test_correlation_matrix_error():
+    """Check errors raised when inputs are not appropriate."""
+
+    with pytest.raises(TypeError):
+        correlation_matrix([[1, 2], [3, 4]])
+
+    with pytest.raises(ValueError):
+        correlation_matrix(np.ones(3))
+
+    with pytest.raises(TypeError):
+        correlation_matrix(pd.DataFrame({"a": [1, 2]}), block_size=0)
+
+    with pytest.raises(ValueError):
+        rank_correlation_matrix(pd.DataFrame({"a": [1, 2]}), method="pearson")
+
+    with pytest.raises(ValueError):
+        sampled_correlation(pd.DataFrame({"a": [1, 2]}), method="rank")
+
+    with pytest.raises(TypeError):
+        sampled_correlation(pd.DataFrame({"a": [1, 2]}), sample=0)
+
+    with pytest.raises(TypeError):
+        sampled_correlation(pd.DataFrame({"a": [1, 2]}), confidence=95)
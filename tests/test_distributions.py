@@ -0,0 +1,46 @@
+import pandas as pd
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde
+from pyeasyeda.distributions import distributions
+
+
+def test_distributions():
+    """Tests histograms and density curves against numpy and scipy."""
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "normal": rng.normal(size=3000),
+        "skewed": rng.exponential(size=3000),
+        "holes": np.r_[rng.normal(size=2990), [np.nan] * 10],
+        "constant": 3.0,
+        "counts": rng.integers(0, 5, 3000),
+        "label": "a",
+    })
+
+    dists = distributions(df, bins=17, block_size=2)
+    assert list(dists) == ["normal", "skewed", "holes", "constant", "counts"], \
+        "Every numeric variable should be summarized"
+
+    for col, dist in dists.items():
+        values = df[col].dropna().to_numpy()
+        counts, edges = np.histogram(values, bins=17)
+        assert np.array_equal(dist["counts"], counts), "Histogram counts differ from numpy"
+        assert np.allclose(dist["edges"], edges), "Bin edges differ from numpy"
+        if col == "constant":
+            assert len(dist["kde_x"]) == 0, "Constant variables have no density curve"
+            continue
+        # exact KDE scaled to the counts, as seaborn draws it
+        exact = gaussian_kde(values)(dist["kde_x"]) * len(values) * (edges[1] - edges[0])
+        assert len(dist["kde_x"]) == 200, "Density curve should have gridsize points"
+        assert np.allclose(dist["kde_y"], exact, atol=1e-3 * exact.max()), "Binned KDE is inaccurate"
+
+
+def test_distributions_error():
+    """Check TypeError raised when inputs are not appropriate."""
+
+    with pytest.raises(TypeError):
+        distributions(np.ones((3, 3)))
+
+    with pytest.raises(TypeError):
+        distributions(pd.DataFrame({"a": [1, 2]}), bins=0)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pytest import raises
+from scipy import stats
+from pyeasyeda.drift import compare_profiles
+from pyeasyeda.report import build_profile, load_profile, write_profile
+
+
+def _snapshot(seed, shift=0.0, categories="abc", n=20_000):
+    rng = np.random.default_rng(seed)
+    price = rng.normal(100 + shift, 10, n)
+    price[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "price": price,
+        "rooms": rng.integers(1, 6, n).astype(float),
+        "type": rng.choice(list(categories), n),
+    })
+
+
+def test_compare_profiles(tmp_path):
+    """Tests the drift measures against the data the profiles come from."""
+
+    old, same, shifted = _snapshot(1), _snapshot(2), _snapshot(3, shift=5, categories="abd")
+    small = old.iloc[:1000]
+    np.testing.assert_allclose(build_profile(small)["numeric"]["price"]["quantiles"],
+                               small["price"].quantile(np.linspace(0, 1, 101)))
+    profile = build_profile(old)
+
+    # profiles round trip through JSON
+    write_profile(profile, tmp_path / "old.json")
+    assert load_profile(tmp_path / "old.json") == profile
+
+    stable = compare_profiles(tmp_path / "old.json", build_profile(same))
+    assert not stable["drift"].any(), "Samples of the same distribution should not drift"
+    assert (stable["psi"] < 0.02).all()
+    assert stable.at["type", "new_categories"] == [] and stable.at["type", "vanished_categories"] == []
+
+    drift = compare_profiles(profile, build_profile(shifted))
+    assert list(drift.index) == ["price", "rooms", "type"]
+    assert drift.loc["price", "drift"] and not drift.loc["rooms", "drift"]
+    assert drift.at["price", "psi"] > 0.2
+    expected = stats.ks_2samp(old["price"].dropna(), shifted["price"].dropna()).statistic
+    assert drift.at["price", "ks"] == pytest.approx(expected, abs=0.02), "KS should be close to the exact one"
+    assert drift.at["price", "mean_shift"] == pytest.approx(shifted["price"].mean() - old["price"].mean())
+    assert drift.at["price", "std_shift"] == pytest.approx(0.5, abs=0.05)
+    assert drift.at["type", "new_categories"] == ["d"] and drift.at["type", "vanished_categories"] == ["c"]
+    assert drift.loc["type", "drift"]
+
+    # profiles written before the percentiles fall back to the histograms
+    for stats_ in profile["numeric"].values():
+        del stats_["quantiles"]
+    older = compare_profiles(profile, build_profile(shifted))
+    assert older.at["price", "ks"] == pytest.approx(expected, abs=0.02)
+    assert older.at["rooms", "psi"] < 0.02
+
+    # added, removed and retyped variables
+    changed = shifted.drop(columns="rooms").assign(price=shifted["type"], area=shifted["rooms"])
+    status = compare_profiles(profile, build_profile(changed))["status"]
+    assert status.to_dict() == {"price": "retyped", "type": "common", "area": "added", "rooms": "removed"}
+
+    # values beyond the top values are unknown, so none are listed
+    truncated = compare_profiles(profile, build_profile(shifted, top_values=2))
+    assert truncated.at["type", "new_categories"] == ["d"] and truncated.at["type", "vanished_categories"] is None
+
+
+def test_compare_profiles_error():
+    profile = build_profile(_snapshot(1, n=100))
+
+    with raises(TypeError):
+        compare_profiles(profile, _snapshot(2, n=100))
+
+    with raises(TypeError):
+        compare_profiles(profile, profile, bins=1)
+
+    with raises(TypeError):
+        compare_profiles(profile, profile, threshold="0.2")
+
+    with raises(FileNotFoundError):
+        compare_profiles("not_a_profile.json", profile)
@@ -0,0 +1,57 @@
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.dtypes import categorical_columns, compact_dtypes, numeric_columns
+
+
+def test_column_kinds():
+    """Tests that compact dtypes are recognized."""
+
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({
+        "text": ["a", "b"],
+        "string": pd.Series(["a", "b"], dtype="string"),
+        "arrow": pd.Series(["a", "b"], dtype="string[pyarrow]"),
+        "category": pd.Series(["a", "b"], dtype="category"),
+        "small": np.array([1, 2], dtype=np.int8),
+        "single": np.array([1, 2], dtype=np.float32),
+        "nullable": pd.Series([1, None], dtype="Int64"),
+        "flag": [True, False],
+    })
+    assert categorical_columns(df) == ["text", "string", "arrow", "category"]
+    assert numeric_columns(df) == ["small", "single", "nullable"]
+
+
+def test_compact_dtypes():
+    """Tests that compaction narrows dtypes without changing values."""
+
+    pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "label": rng.choice(["red", "green", "blue"], 1000),
+        "name": [f"name {i}" for i in range(1000)],
+        "mixed": [1, "a"] * 500,
+        "halves": rng.integers(0, 100, 1000) / 2,
+        "precise": rng.normal(size=1000),
+        "holes": np.r_[rng.integers(0, 10, 999) / 4, [np.nan]],
+        "count": rng.integers(0, 1000, 1000),
+        "huge": np.r_[rng.integers(0, 10, 999), [2 ** 40]],
+    })
+    compact = compact_dtypes(df)
+
+    expected = {
+        "label": "category", "name": "string", "mixed": "object",
+        "halves": "float32", "precise": "float64", "holes": "float32",
+        "count": "int16", "huge": "int64",
+    }
+    assert compact.dtypes.astype(str).to_dict() == expected
+    assert compact["name"].dtype == pd.StringDtype("pyarrow")
+    assert df["label"].dtype == np.object_, "The input should not be modified"
+    assert compact.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum() / 2
+
+    widened = compact.astype({"label": object, "name": object, "halves": float,
+                              "holes": float, "count": np.int64})
+    pd.testing.assert_frame_equal(widened, df)
+
+    with pytest.raises(TypeError):
+        compact_dtypes(df, category_ratio=2)
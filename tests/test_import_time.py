@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+# packages that only the plotting functions need, loaded on first use
+LAZY = ("matplotlib", "seaborn", "altair", "scipy", "dask")
+
+# import time of pyeasyeda's own modules, excluding numpy, pandas and
+# pyarrow, in seconds
+BUDGET = 0.1
+
+
+def _import_times(statement):
+    """Runs statement in a fresh interpreter with -X importtime and returns
+    {module: (self seconds, cumulative seconds)}."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                               capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6)
+    return times
+
+
+def test_import_time():
+    """Tests that importing the package does not load the plotting libraries."""
+
+    times = _import_times(
+        "import pyeasyeda.clean_up, pyeasyeda.summary_suggestions, "
+        "pyeasyeda.close_up, pyeasyeda.birds_eye_view"
+    )
+    loaded = sorted({name.split(".")[0] for name in times} & set(LAZY))
+    assert loaded == [], f"{loaded} should only be imported when a plot is drawn"
+
+    own = sum(seconds for name, (seconds, _) in times.items() if name.startswith("pyeasyeda"))
+    assert own < BUDGET, f"pyeasyeda modules took {own:.3f}s to import"
+
+
+def test_plotting_imports_on_use():
+    """Tests that the plotting libraries are imported by the first plot."""
+
+    times = _import_times(
+        "import pandas as pd; from pyeasyeda.close_up import top_correlated_pairs; "
+        "top_correlated_pairs(pd.DataFrame({'a': [1, 2, 3], 'b': [1, 3, 2]}))"
+    )
+    assert "altair" not in times, "Ranking the pairs should not build charts"
+
+    times = _import_times(
+        "import pandas as pd; from pyeasyeda.close_up import close_up; "
+        "close_up(pd.DataFrame({'a': [1, 2, 3], 'b': [1, 3, 2]}))"
+    )
+    assert "altair" in times
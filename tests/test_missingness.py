@@ -0,0 +1,80 @@
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.clean_up import complete_rows
+from pyeasyeda.missingness import missingness_profile
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _frame(n=1003):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(n, 4)), columns=list("abcd"))
+    df = df.mask(rng.random(df.shape) < [0.1, 0.5, 0, 0.3])
+    df["label"] = pd.Series(rng.choice(["x", None], n), dtype=object)
+    return df
+
+
+def test_missingness_profile():
+    """Tests the bitmap answers against pandas."""
+
+    df = _frame()
+    profile = missingness_profile(df)
+    missing = df.isna()
+
+    assert (profile.null_counts() == missing.sum()).all(), "Null counts differ"
+    assert np.allclose(profile.null_rates(), missing.mean()), "Null rates differ"
+    as_int = missing.to_numpy().astype(int)
+    assert np.array_equal(profile.co_missing().to_numpy(), as_int.T @ as_int), "Co-missing counts differ"
+    assert np.array_equal(profile.co_missing(["d", "a"], block_bytes=8).to_numpy(),
+                          as_int[:, [3, 0]].T @ as_int[:, [3, 0]])
+
+    assert profile.rows_kept() == len(df.dropna())
+    assert profile.rows_kept(["a", "label"]) == len(df.dropna(subset=["a", "label"]))
+    assert profile.rows_kept([]) == len(df)
+    assert np.array_equal(profile.complete_rows(), df.notna().all(axis=1).to_numpy())
+    assert profile.rows_kept_without().tolist() == [len(df.drop(columns=col).dropna()) for col in df]
+
+    expected = missing.value_counts().head(4)
+    patterns = profile.patterns(top=4, chunk_rows=64)
+    assert [rows for _, rows in patterns] == expected.tolist(), "Pattern counts differ"
+    for (columns, _), pattern in zip(patterns, expected.index):
+        assert columns == tuple(df.columns[list(pattern)]), "Patterns differ"
+
+    with pytest.raises(KeyError):
+        profile.rows_kept(["notreal"])
+    with pytest.raises(TypeError):
+        profile.patterns(top=0)
+    with pytest.raises(TypeError):
+        missingness_profile([1, 2])
+
+
+def test_missingness_profile_arrow():
+    """Tests the bitmaps built from Arrow validity buffers."""
+
+    df = _frame()
+    expected = missingness_profile(df).bitmaps
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # chunks that do not start on a byte boundary, and a float null that is
+    # not a NaN
+    chunked = pa.concat_tables([table.slice(0, 13), table.slice(13, 500), table.slice(513)])
+    assert chunked.column("a").num_chunks == 3
+    assert np.array_equal(missingness_profile(chunked).bitmaps, expected)
+
+    nulls = pa.table({"x": pa.array([1.0, None, float("nan"), 4.0] * 3)})
+    assert missingness_profile(nulls).null_counts()["x"] == 6
+
+
+def test_complete_rows():
+    """Tests that every source type agrees on the complete rows, NaN's of an
+    Arrow floating column included."""
+
+    df = _frame()
+    expected = df.notna().all(axis=1).to_numpy()
+    assert np.array_equal(complete_rows(df), expected)
+    assert np.array_equal(complete_rows(df, ["a", "c"]), df[["a", "c"]].notna().all(axis=1).to_numpy())
+
+    values = [1.0, None, float("nan"), 4.0]
+    table = pa.table({"x": pa.array(values * 3), "y": pa.array(list("abcd") * 3)})
+    assert complete_rows(table).tolist() == [True, False, False, True] * 3
+    assert np.array_equal(complete_rows(table), complete_rows(table.to_pandas()))
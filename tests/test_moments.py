@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from pyeasyeda.moments import RunningMoments
+
+
+def test_running_moments():
+    """Checks merged moments against numpy on the whole array."""
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(loc=50, scale=10, size=(1000, 3))
+    values[::7, 1] = np.nan
+
+    moments = RunningMoments(["a", "b", "c"])
+    for start in range(0, 1000, 128):
+        moments.update(values[start:start + 128])
+
+    # Merge two accumulators built over different halves
+    left = RunningMoments(["a", "b", "c"]).update(values[:300])
+    right = RunningMoments(["a", "b", "c"]).update(values[300:])
+    merged = left.merge(right)
+
+    for acc in [moments, merged]:
+        assert np.array_equal(acc.count, (~np.isnan(values)).sum(axis=0))
+        assert np.allclose(acc.mean, np.nanmean(values, axis=0))
+        assert np.allclose(acc.std(), np.nanstd(values, axis=0))
+        assert np.allclose(acc.std(ddof=1), np.nanstd(values, axis=0, ddof=1))
+        assert np.array_equal(acc.min, np.nanmin(values, axis=0))
+        assert np.array_equal(acc.max, np.nanmax(values, axis=0))
+
+
+def test_running_moments_error():
+    """Check errors raised when inputs are not appropriate."""
+
+    moments = RunningMoments(["a", "b"])
+
+    with pytest.raises(ValueError):
+        moments.update(np.ones((3, 3)))
+
+    with pytest.raises(TypeError):
+        moments.merge("not moments")
+
+    with pytest.raises(ValueError):
+        moments.merge(RunningMoments(["c"]))
+
+    # No values gives NaN statistics instead of an error
+    assert np.isnan(moments.std()).all()
@@ -0,0 +1,73 @@
+import pandas as pd
+import numpy as np
+import pytest
+from scipy import stats
+from pyeasyeda.outliers import detect_outliers, OutlierReport
+
+
+def test_detect_outliers():
+    """Tests the outlier detectors on a toy dataset."""
+
+    # Load toy dataset
+    data = {
+        "neighbourhood": ["A", "B", "C", "D", "E", "G", "H", "I", "K", "L", "M"],
+        "price": [100, 120, 150, 90, 150000, 200, 300, 500, 300, 100, 200],
+        "number_of_reviews": [600.0, 1, 27000000, 1, 1, 1, 2, 0, 2, 100, 500],
+    }
+    df = pd.DataFrame(data)
+
+    report = detect_outliers(df)
+    assert isinstance(report, OutlierReport), "detect_outliers should return an OutlierReport"
+    assert report.columns == ["price", "number_of_reviews"], "Only numeric variables should be examined"
+    assert list(report.values["price"]) == [150000], "Outlier should contain 150000"
+    assert list(report["number_of_reviews"]) == [27000000], "Outlier should contain 2.7e+07"
+    assert list(report.rows["price"]) == [4], "Outlier row position is incorrect"
+    assert report.counts["number_of_reviews"] == 1, "Outlier count is incorrect"
+
+    # The z-score detector agrees with scipy's z-scores
+    rng = np.random.default_rng(1)
+    noisy = pd.DataFrame(rng.standard_t(2, size=(5000, 4)), columns=list("abcd"))
+    report = detect_outliers(noisy)
+    expected = np.abs(stats.zscore(noisy)) > 3
+    for col in noisy:
+        assert np.array_equal(report.rows[col], np.flatnonzero(expected[col])), "z-score outliers differ from scipy"
+
+    # Robust detectors
+    mad = detect_outliers(df, method="mad")
+    assert 150000 in mad.values["price"], "MAD should flag 150000"
+    iqr = detect_outliers(df, method="iqr")
+    assert 150000 in iqr.values["price"], "IQR should flag 150000"
+    assert iqr.threshold == 1.5, "IQR threshold should default to 1.5"
+
+    # A custom detector
+    fixed = detect_outliers(df, method=lambda values, threshold: (0, threshold), threshold=500)
+    assert list(fixed.values["price"]) == [150000], "Custom bounds should be used"
+
+    # Printed report and summary table
+    statement = str(detect_outliers(df))
+    assert "150000" in statement, "Report should list 150000"
+    assert "2.7e+07" in statement, "Report should list 2.7e+07"
+    table = detect_outliers(df).to_frame()
+    assert table.loc["price", "count"] == 1, "Summary table count is incorrect"
+
+    # NaN's are ignored
+    df.loc[0, "price"] = np.nan
+    assert list(detect_outliers(df, method="iqr").values["price"]) == [150000], "NaN's should be ignored"
+
+
+def test_detect_outliers_error():
+    """Check errors raised when inputs are not appropriate."""
+
+    df = pd.DataFrame({"price": [1, 2, 3]})
+
+    with pytest.raises(TypeError):
+        detect_outliers("not dataframe")
+
+    with pytest.raises(ValueError):
+        detect_outliers(df, method="unknown")
+
+    with pytest.raises(ValueError):
+        detect_outliers(df, method=lambda values, threshold: (0, 1))
+
+    with pytest.raises(TypeError):
+        detect_outliers(df, threshold="3")
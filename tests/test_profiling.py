@@ -0,0 +1,129 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pandas as pd
+import numpy as np
+from pyeasyeda.profiling import Recorder, profile, span
+from pyeasyeda.clean_up import clean_up
+from pyeasyeda.summary_suggestions import summary_suggestions
+from pyeasyeda.close_up import close_up
+from pyeasyeda.birds_eye_view import render_birds_eye_view
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=300)
+    df = pd.DataFrame({
+        "x": x,
+        "y": x + rng.normal(scale=0.5, size=300),
+        "label": rng.choice(["a", "b"], 300),
+    })
+    df.loc[5, "y"] = np.nan
+    return df
+
+
+def test_profile_records_stages(capsys):
+    """Tests that every function records its stages under profile()."""
+
+    df = _frame()
+    with profile() as recorder:
+        clean_up(df)
+        summary_suggestions(df)
+        close_up(df)
+        render_birds_eye_view(df)
+    names = {record["name"]: record for record in recorder.spans}
+
+    for function in ["clean_up", "summary_suggestions", "close_up", "render_birds_eye_view"]:
+        assert names[function]["parent"] is None and names[function]["depth"] == 0
+    outliers = names["clean_up.outliers"]
+    assert outliers["parent"] == "clean_up" and outliers["cols"] == 3
+    assert outliers["rows"] == 299, "The outlier scan only sees the complete rows"
+    assert {"summary_suggestions.numeric", "close_up.correlation",
+            "render_birds_eye_view.render"} <= set(names)
+    for record in recorder.spans:
+        assert record["wall"] >= 0 and record["cpu"] >= 0 and record["memory"] >= 0
+    assert names["clean_up"]["memory"] >= names["clean_up.drop"]["memory"], \
+        "A span's peak memory includes its children's"
+
+    # nothing is recorded outside the block
+    count = len(recorder.spans)
+    clean_up(df)
+    assert len(recorder.spans) == count
+
+
+def test_profile_threads():
+    """Tests that spans overlapping across threads record no memory."""
+
+    opened, allocated = threading.Event(), threading.Event()
+    recorder = Recorder()
+
+    def first():
+        with recorder.span("first"):
+            opened.set()
+            allocated.wait(5)
+
+    def second():
+        opened.wait(5)
+        with recorder.span("second"):
+            np.ones(10 ** 6)
+        allocated.set()
+
+    # threads do not inherit the context, so the recorder is used directly
+    with profile():
+        threads = [threading.Thread(target=first), threading.Thread(target=second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with recorder.span("alone"):
+            with recorder.span("inner"):
+                np.ones(10 ** 6)
+    memory = {record["name"]: record["memory"] for record in recorder.spans}
+    assert memory["first"] is None and memory["second"] is None
+    assert memory["alone"] >= memory["inner"] >= 8 * 10 ** 6
+
+
+def test_profile_exports(tmp_path, capsys):
+    """Tests the JSON and Chrome trace exports."""
+
+    with profile(memory=False) as recorder:
+        with span("outer", 10, 2):
+            with span("inner"):
+                pass
+        with span("outer"):
+            pass
+    assert [record["memory"] for record in recorder.spans] == [None, None, None]
+
+    report = json.loads(recorder.to_json(tmp_path / "profile.json"))
+    assert [record["name"] for record in report["spans"]] == ["outer", "inner", "outer"]
+    assert report["totals"]["outer"]["calls"] == 2
+    assert json.loads((tmp_path / "profile.json").read_text()) == report
+
+    trace = recorder.to_chrome_trace(tmp_path / "trace.json")
+    events = trace["traceEvents"]
+    assert [event["ph"] for event in events] == ["X"] * 3
+    assert events[0]["args"]["rows"] == 10 and events[0]["dur"] >= events[1]["dur"]
+    assert json.loads((tmp_path / "trace.json").read_text()) == trace
+
+    try:
+        Recorder(memory="yes")
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("TypeError should be raised")
+
+
+def test_profile_environment(tmp_path):
+    """Tests profiling a whole process with PYEASYEDA_PROFILE."""
+
+    path = tmp_path / "run.json"
+    script = ("import pandas as pd; from pyeasyeda.clean_up import clean_up; "
+              "clean_up(pd.DataFrame({'x': [1.0, 2.0, None]}))")
+    subprocess.run([sys.executable, "-c", script], check=True, capture_output=True,
+                   env={**os.environ, "PYEASYEDA_PROFILE": str(path)})
+    assert "clean_up.outliers" in json.loads(path.read_text())["totals"]
+    trace = json.loads((tmp_path / "run.trace.json").read_text())
+    assert any(event["name"] == "clean_up" for event in trace["traceEvents"])
@@ -0,0 +1,86 @@
+import json
+
+import pandas as pd
+import numpy as np
+from pyeasyeda.report import build_profile, input_fingerprint, render_report, write_profile
+from pyeasyeda.clean_up import complete_rows
+from pyeasyeda.close_up import top_correlated_pairs
+from pyeasyeda.distributions import distributions
+from pyeasyeda.outliers import detect_outliers
+from pyeasyeda.summary_suggestions import summary_suggestions
+
+df = pd.read_csv("tests/data/penguins_test.csv")
+
+
+def test_build_profile():
+    """Tests that the fused scan matches the in-memory functions."""
+
+    profile = build_profile(df, chunksize=50, pairs=3)
+    assert profile["rows"] == len(df)
+    assert profile["complete_rows"] == len(df.dropna())
+
+    numeric, categorical, unique_share, high_unique = summary_suggestions(df)
+    dists = distributions(df)
+    for col in numeric.columns:
+        stats = profile["numeric"][col]
+        np.testing.assert_allclose([stats[key] for key in numeric.index], numeric[col])
+        assert stats["histogram"]["counts"] == dists[col]["counts"].tolist()
+    for col in categorical.columns:
+        stats = profile["categorical"][col]
+        assert [stats[key] for key in categorical.index] == categorical[col].tolist()
+    assert profile["high_unique"] == high_unique
+
+    expected = top_correlated_pairs(df, 3)
+    assert [pair[:2] for pair in profile["top_pairs"]] == [list(pair[:2]) for pair in expected]
+    np.testing.assert_allclose([pair[2] for pair in profile["top_pairs"]], [pair[2] for pair in expected])
+
+    report = detect_outliers(df, mask=complete_rows(df))
+    for col in report.columns:
+        outliers = profile["numeric"][col]["outliers"]
+        assert outliers["count"] == report.counts[col] and outliers["exact"]
+        np.testing.assert_allclose(outliers["values"], report.values[col])
+        np.testing.assert_allclose([outliers["lower"], outliers["upper"]], report.bounds[col])
+
+
+def test_build_profile_max_values():
+    """Tests that ID-like variables stop being counted exactly."""
+
+    ids = df.assign(id=[f"penguin{i}" for i in range(len(df))])
+    profile = build_profile(ids, chunksize=50, max_values=100)
+    stats = profile["categorical"]["id"]
+    assert stats["values"] is None and stats["top"] is None, "Only a sketch should be kept"
+    assert abs(stats["unique"] - len(df)) <= 0.05 * len(df)
+    assert profile["categorical"]["species"]["values"] == df["species"].value_counts().to_dict()
+    assert "id" in profile["high_unique"]
+    assert render_report(profile, images=False).startswith("<!DOCTYPE html>")
+
+
+def test_build_profile_files(tmp_path):
+    """Tests profiling a glob of CSV files with types that vary by chunk."""
+
+    first = df.iloc[:200].copy()
+    second = df.iloc[200:].copy()
+    second["sex"] = np.nan
+    first.to_csv(tmp_path / "part-0.csv", index=False)
+    second.to_csv(tmp_path / "part-1.csv", index=False)
+
+    profile = build_profile(str(tmp_path / "part-*.csv"), chunksize=64)
+    assert profile["source"] == [str(tmp_path / "part-0.csv"), str(tmp_path / "part-1.csv")]
+    assert profile["rows"] == len(df)
+    assert profile["categorical"]["sex"]["count"] == first["sex"].count()
+    assert profile["fingerprint"] == input_fingerprint(str(tmp_path / "part-*.csv"), **profile["options"])
+
+    write_profile(profile, tmp_path / "profile.json")
+    assert json.loads((tmp_path / "profile.json").read_text()) == json.loads(json.dumps(profile))
+
+    page = render_report(profile)
+    assert page.startswith("<!DOCTYPE html>") and page.count("data:image/png;base64,") == 5 + 3 + 1
+    assert "src=\"http" not in page, "The report should not load external resources"
+    assert "data:image" not in render_report(profile, images=False)
+
+    try:
+        build_profile(str(tmp_path / "missing-*.csv"))
+    except FileNotFoundError:
+        pass
+    else:
+        raise AssertionError("FileNotFoundError should be raised")
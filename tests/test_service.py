@@ -0,0 +1,111 @@
+import asyncio
+import threading
+
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.service import AsyncProfiler, profile_async
+from pyeasyeda.clean_up import complete_rows
+from pyeasyeda.close_up import top_correlated_pairs
+from pyeasyeda.outliers import detect_outliers
+from pyeasyeda.summary_suggestions import summary_suggestions
+
+df = pd.read_csv("tests/data/penguins_test.csv")
+
+
+def test_profile_async(capsys):
+    """Tests that the concurrent stages match the synchronous functions
+    and that concurrent calls print nothing."""
+
+    async def main():
+        async with AsyncProfiler(max_workers=4) as profiler:
+            return await asyncio.gather(*[profiler.profile(df, n=2, bins=10) for _ in range(3)])
+
+    results = asyncio.run(main())
+    assert capsys.readouterr().out == ""
+    numeric, categorical, unique_share, high_unique = summary_suggestions(df)
+    for result in results:
+        pd.testing.assert_frame_equal(result["summary"][0], numeric)
+        assert result["summary"][3] == high_unique
+        assert result["outliers"].counts == detect_outliers(df, mask=complete_rows(df)).counts
+        assert result["complete_rows"].sum() == len(df.dropna())
+        pd.testing.assert_frame_equal(result["correlation"], df.corr(numeric_only=True))
+        assert result["top_pairs"] == top_correlated_pairs(df, 2)
+        assert set(result["images"]["histograms"]) == set(numeric.columns)
+        assert result["close_up"]["$schema"].startswith("https://vega.github.io")
+
+    summary = asyncio.run(profile_async(df, stages=["summary"]))
+    assert list(summary) == ["summary"]
+    # a single numeric variable has no pairs
+    single = asyncio.run(profile_async(df[["species", "bill_length_mm"]], n=3, stages=["correlation", "charts"]))
+    assert single["top_pairs"] == [] and single["close_up"] is None
+
+
+def test_profile_async_constant():
+    """Tests that variables without any correlation coefficient leave the
+    other stages' results in place."""
+
+    constant = pd.DataFrame({"a": [1.0] * 50, "b": [2.0] * 50, "c": ["x"] * 50})
+    result = asyncio.run(profile_async(constant, n=2))
+    assert result["top_pairs"] == [] and result["close_up"] is None
+    assert result["complete_rows"].all()
+    assert result["correlation"].isna().all().all()
+    assert list(result["summary"][0].columns) == ["a", "b"]
+
+
+def test_profile_async_backpressure():
+    """Tests the waiting limit and the cancellation of running calls."""
+
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(*args):
+        started.set()
+        release.wait(5)
+        return {}
+
+    async def main():
+        profiler = AsyncProfiler(max_workers=1, max_concurrent=1, max_waiting=1)
+        profiler_submit = profiler._submit
+
+        def submit(cancelled, stage, function, *args):
+            if stage == "summary":
+                function = blocking
+            return profiler_submit(cancelled, stage, function, *args)
+
+        profiler._submit = submit
+        first = asyncio.create_task(profiler.profile(df, stages=["summary", "outliers"]))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(profiler.profile(df, stages=["outliers"]))
+        await asyncio.sleep(0.05)
+        assert profiler.running == 1 and profiler.waiting == 1
+        with pytest.raises(asyncio.QueueFull):
+            await profiler.profile(df)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # the slot is given to the waiting call, which runs once the worker
+        # is free again
+        release.set()
+        result = await second
+        assert started.is_set() and list(result) == ["outliers", "complete_rows"]
+        assert profiler.running == 0 and profiler.waiting == 0
+        await profiler.close()
+
+    asyncio.run(main())
+
+
+def test_profile_async_error():
+    with pytest.raises(TypeError):
+        AsyncProfiler(max_workers=0)
+    with pytest.raises(TypeError):
+        AsyncProfiler(max_waiting=-1)
+    with pytest.raises(ValueError):
+        asyncio.run(profile_async(df, stages=["plots"]))
+    with pytest.raises(TypeError):
+        asyncio.run(profile_async(df, n=0))
+    with pytest.raises(TypeError):
+        asyncio.run(profile_async([1, 2]))
+    with pytest.raises(TypeError):
+        asyncio.run(profile_async(df, profiler="threads"))
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pyeasyeda.sketches import QuantileSketch, HyperLogLog
+
+
+def test_quantile_sketch():
+    """Tests QuantileSketch accuracy and merging."""
+
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=100000)
+    qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+    # Exact before the first compaction
+    small = QuantileSketch().update(values[:500])
+    assert small.exact, "Sketch should not compact below its capacity"
+    assert np.array_equal(small.quantile(qs), np.quantile(values[:500], qs)), \
+        "Quantiles of small data should be exact"
+
+    # Approximate in rank once compacted, whether built in batches or merged
+    sketch = QuantileSketch(k=256)
+    for start in range(0, len(values), 7000):
+        sketch.update(values[start:start + 7000])
+    parts = [QuantileSketch(k=256).update(values[i::4]) for i in range(4)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    for s in [sketch, merged]:
+        assert s.count == len(values), "Count should include every value"
+        assert not s.exact, "Sketch should have compacted"
+        assert sum(len(level) for level in s.levels) < 1500, "Sketch should stay small"
+        ranks = np.searchsorted(np.sort(values), s.quantile(qs)) / len(values)
+        assert np.allclose(ranks, qs, atol=0.02), "Rank error too large"
+
+    # NaN's are ignored and an empty sketch gives NaN
+    assert QuantileSketch().update([np.nan, 1.0]).count == 1
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_quantile_sketch_error():
+    """Check errors raised when inputs are not appropriate."""
+
+    with pytest.raises(TypeError):
+        QuantileSketch(k=2.5)
+
+    with pytest.raises(TypeError):
+        QuantileSketch().merge([1, 2])
+
+
+def test_hyperloglog():
+    """Tests HyperLogLog estimates, error bound and merging."""
+
+    values = pd.Series([f"id{i}" for i in range(200000)])
+
+    hll = HyperLogLog(error=0.01)
+    assert hll.error <= 0.01, "Error bound should not exceed the requested error"
+    assert hll.registers.nbytes <= 16384, "Sketch should stay a few KB"
+    hll.update(values)
+    hll.update(values[:1000])  # repeated values do not change the estimate
+    assert abs(hll.estimate() - 200000) <= 3 * hll.error * 200000, "Estimate outside the error bound"
+
+    left = HyperLogLog(error=0.01).update(values[:120000])
+    right = HyperLogLog(error=0.01).update(values[80000:])
+    assert np.array_equal(left.merge(right).registers, hll.registers), "Merged sketch should match"
+
+    # Small counts are close to exact and nulls are ignored
+    small = HyperLogLog().update(["a", "b", "c", None, "a"])
+    assert round(small.estimate()) == 3
+
+    with pytest.raises(ValueError):
+        HyperLogLog(error=0)
+
+    with pytest.raises(ValueError):
+        HyperLogLog(error=0.01).merge(HyperLogLog(error=0.1))
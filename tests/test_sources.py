@@ -0,0 +1,120 @@
+import logging
+import pandas as pd
+import numpy as np
+import pytest
+from pyeasyeda.sources import load_frame, null_counts
+from pyeasyeda.clean_up import clean_up
+from pyeasyeda.summary_suggestions import summary_suggestions
+from pyeasyeda.close_up import top_correlated_pairs
+from pyeasyeda.birds_eye_view import render_birds_eye_view
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=500)
+    return pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(scale=0.1, size=500),
+        "z": rng.integers(0, 100, 500),
+        "label": rng.choice(["a", "b", "c"], 500),
+        "when": pd.date_range("2020-01-01", periods=500, freq="H"),
+    })
+
+
+def test_load_frame(tmp_path):
+    """Tests column projection and Arrow-backed strings."""
+
+    df = _frame()
+    path = tmp_path / "data.parquet"
+    df.to_parquet(path, row_group_size=100)
+
+    loaded = load_frame(path, kinds=("numeric",))
+    assert list(loaded.columns) == ["x", "y", "z"], "Only numeric columns should be read"
+
+    loaded = load_frame(str(path), columns=["label", "x", "missing"])
+    assert list(loaded.columns) == ["label", "x"]
+    assert loaded["label"].dtype == pd.StringDtype("pyarrow"), \
+        "Strings should not be converted to object"
+    assert loaded["label"].astype(object).equals(df["label"])
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for source in [table, ds.dataset(path), tmp_path]:
+        assert load_frame(source).drop(columns="label").equals(df.drop(columns="label"))
+
+    assert load_frame(df) is df, "A dataframe should be returned unchanged"
+    assert load_frame("not a file") == "not a file"
+
+    # other existing files and directories are not read as Parquet
+    df.to_csv(tmp_path / "data.csv", index=False)
+    (tmp_path / "empty").mkdir()
+    for source in [tmp_path / "data.csv", tmp_path / "empty"]:
+        with pytest.raises(TypeError):
+            load_frame(source)
+        with pytest.raises(TypeError):
+            clean_up(source)
+
+
+def test_null_counts(tmp_path):
+    """Tests null counts read from row-group statistics."""
+
+    df = _frame()
+    df.loc[[3, 250, 499], "x"] = np.nan
+    path = tmp_path / "data.parquet"
+    df.to_parquet(path, row_group_size=100)
+
+    expected = {"x": 3, "y": 0, "label": 0}
+    assert null_counts(path, ["x", "y", "label"]) == expected
+    assert null_counts(pa.Table.from_pandas(df), ["x", "y", "label"]) == expected
+    assert null_counts(df, ["x"]) == {"x": None}
+
+
+def test_functions_accept_parquet(tmp_path, caplog):
+    """Tests that the public functions give the same results from Parquet."""
+
+    caplog.set_level(logging.INFO, logger="pyeasyeda")
+    df = _frame()
+    df.loc[7, "y"] = np.nan
+    df.loc[0, "x"] = 50.0
+    path = tmp_path / "data.parquet"
+    df.to_parquet(path)
+
+    expected = clean_up(df)
+    expected_output = caplog.messages
+    caplog.clear()
+    result = clean_up(path)
+    assert caplog.messages == expected_output
+    pd.testing.assert_frame_equal(result.astype({"label": object}), expected)
+
+    complete = tmp_path / "complete.parquet"
+    df.dropna().to_parquet(complete)
+    caplog.clear()
+    result = clean_up(complete)
+    # the same outliers, with no rows dropped
+    assert expected_output[0].startswith("Dropped 1 of 500 rows")
+    assert caplog.messages == expected_output[1:]
+    pd.testing.assert_frame_equal(result.astype({"label": object}), expected)
+
+    # NaN's of floating columns are missing, though Arrow does not count
+    # them as nulls
+    nan = pa.table({"x": [1.0, np.nan, 3.0, 4.0], "label": ["a", "b", "c", "d"]})
+    assert nan.column("x").null_count == 0
+    pq.write_table(nan, tmp_path / "nan.parquet")
+    for source in [nan, tmp_path / "nan.parquet"]:
+        pd.testing.assert_frame_equal(clean_up(source).astype({"label": object}),
+                                      clean_up(nan.to_pandas()))
+
+    expected = summary_suggestions(df)
+    result = summary_suggestions(path)
+    pd.testing.assert_frame_equal(result[0], expected[0])
+    assert result[1].astype(str).equals(expected[1].astype(str))
+    pd.testing.assert_frame_equal(result[2], expected[2])
+    assert result[3] == expected[3]
+
+    assert top_correlated_pairs(path, 2) == top_correlated_pairs(df, 2)
+
+    images = render_birds_eye_view(path, var_list=["x", "label"])
+    assert list(images["histograms"]) == ["x"] and list(images["bar_charts"]) == ["label"]
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from pyeasyeda.summary_suggestions import summary_suggestions
+from pyeasyeda.summary_suggestions import summary_suggestions, SummaryAccumulator
 import pytest
 
 
@@ -53,4 +53,140 @@ def test_summary_suggestions():
         len(results[3]) == 1
     ), "Number of variables with large number of unique values should be 1" 
 
-    
\ No newline at end of file
+    
+
+def test_summary_accumulator():
+    """Tests SummaryAccumulator against summary_suggestions on the same rows"""
+
+    df = pd.read_csv("tests/data/penguins_test.csv")
+    expected = summary_suggestions(df, threshold=0.5)
+
+    # Appended batches
+    acc = SummaryAccumulator()
+    for start in range(0, len(df), 100):
+        acc.update(df.iloc[start:start + 100])
+    results = acc.result(threshold=0.5)
+
+    # Partitions merged together
+    left = SummaryAccumulator().update(df.iloc[:150])
+    right = SummaryAccumulator().update(df.iloc[150:])
+    merged = left.merge(right).result(threshold=0.5)
+
+    for res in [results, merged]:
+        assert len(res) == 4, "Result should have four parts"
+        assert np.allclose(res[0], expected[0], equal_nan=True), "Numeric summary differs"
+        assert list(res[0].index) == list(expected[0].index), "Numeric summary rows differ"
+        assert (res[1].astype(str) == expected[1].astype(str)).all().all(), "Categorical summary differs"
+        assert np.allclose(res[2].astype(float), expected[2].astype(float)), "Unique ratios differ"
+        assert res[3] == expected[3], "Variables above the threshold differ"
+
+    # Quantiles become approximate once the sketch compacts
+    rng = np.random.default_rng(0)
+    big = pd.DataFrame({"x": rng.normal(size=20000)})
+    acc = SummaryAccumulator(k=64)
+    for start in range(0, len(big), 1000):
+        acc.update(big.iloc[start:start + 1000])
+    approx = acc.result()[0]["x"]
+    exact = big.describe()["x"]
+    assert np.allclose(approx[["count", "mean", "std", "min", "max"]],
+                       exact[["count", "mean", "std", "min", "max"]]), "Moments should be exact"
+    assert np.allclose(approx[["25%", "50%", "75%"]], exact[["25%", "50%", "75%"]], atol=0.1), \
+        "Quartiles should be close"
+
+
+def test_summary_accumulator_error():
+    """Checks errors raised by SummaryAccumulator"""
+
+    df = pd.DataFrame({"income": [5, 8], "views": ["sea", "river"]})
+    acc = SummaryAccumulator()
+
+    with pytest.raises(ValueError):
+        acc.result()
+
+    with pytest.raises(TypeError):
+        acc.update(1)
+
+    acc.update(df)
+    with pytest.raises(ValueError):
+        acc.update(df[["income"]])
+
+    with pytest.raises(TypeError):
+        acc.merge(df)
+
+    with pytest.raises(TypeError):
+        acc.result(threshold="a")
+
+    with pytest.raises(TypeError):
+        SummaryAccumulator(k=4)
+
+    with pytest.raises(TypeError):
+        SummaryAccumulator(max_values=0)
+
+
+def test_summary_accumulator_max_values():
+    """Checks that ID-like variables switch from exact counts to a sketch"""
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "user_id": [f"user{i}" for i in range(5000)],
+        "views": rng.choice(["mountain", "river", "sea"], size=5000),
+        "price": rng.normal(size=5000),
+    })
+    expected = summary_suggestions(df)
+
+    acc = SummaryAccumulator(max_values=1000)
+    for start in range(0, len(df), 500):
+        acc.update(df.iloc[start:start + 500])
+    assert "user_id" in acc.distinct, "Counts should be replaced by a sketch"
+    assert acc.top_values("user_id") is None
+    assert acc.top_values("views").sum() == len(df)
+
+    # an exact partition merged into a sketched one, and the reverse
+    left = SummaryAccumulator(max_values=1000).update(df.iloc[:500])
+    right = SummaryAccumulator(max_values=1000).update(df.iloc[500:])
+    merged = [acc.result(), left.merge(right).result(),
+              SummaryAccumulator(max_values=1000).update(df.iloc[500:])
+              .merge(SummaryAccumulator(max_values=1000).update(df.iloc[:500])).result()]
+    for res in merged:
+        assert list(res[2].index) == ["unique", "error"]
+        ratio, err = res[2]["user_id"]
+        assert abs(ratio - 1) <= 3 * err, "Estimate outside the error bound"
+        assert res[2]["views"]["error"] == 0, "Exact counts have no error"
+        assert res[1]["views"].tolist() == expected[1]["views"].tolist()
+        assert res[3] == ["user_id"]
+
+
+def test_summary_suggestions_approximate():
+    """Tests the HyperLogLog mode of summary_suggestions"""
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "user_id": [f"user{i}" for i in rng.integers(0, 20000, size=30000)],
+        "views": rng.choice(["mountain", "river", "sea"], size=30000),
+        "price": rng.normal(size=30000),
+    })
+    exact = summary_suggestions(df, threshold=0.3)
+    approx = summary_suggestions(df, threshold=0.3, approximate=True, error=0.01)
+
+    assert approx[0].equals(exact[0]), "Numeric summary should not change"
+    assert list(approx[2].index) == ["unique", "error"], "Ratios should come with an error row"
+    for col in ["user_id", "views"]:
+        ratio, err = approx[2][col]
+        assert abs(ratio - exact[2][col]["unique"]) <= 3 * err, "Estimate outside the error bound"
+    assert approx[2]["user_id"]["error"] < 0.01, "Error bound should follow the error argument"
+    assert approx[3] == exact[3] == ["user_id"], "Variables above the threshold differ"
+
+    # Merged approximate accumulators give the same sketches
+    acc = SummaryAccumulator(approximate=True, error=0.01).update(df.iloc[:10000])
+    acc.merge(SummaryAccumulator(approximate=True, error=0.01).update(df.iloc[10000:]))
+    merged = acc.result(threshold=0.3)
+    assert np.allclose(merged[2].astype(float), approx[2].astype(float)), "Merged estimate differs"
+
+    with pytest.raises(TypeError):
+        summary_suggestions(df, approximate="yes")
+
+    with pytest.raises(ValueError):
+        summary_suggestions(df, approximate=True, error=2)
+
+    with pytest.raises(ValueError):
+        SummaryAccumulator().update(df).merge(SummaryAccumulator(approximate=True).update(df))